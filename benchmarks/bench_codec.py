@@ -0,0 +1,70 @@
+"""
+Benchmark the JSON codec against the stdlib json module
+
+Run from the project root:
+    python -m benchmarks.bench_codec
+"""
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from models.transaction import Transaction
+from services import codec
+
+
+def _timeit(func, repeat: int = 5) -> float:
+    """Best wall time of several runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _sample_latest() -> bytes:
+    codes = [f"C{i:02d}" for i in range(170)]
+    payload = {
+        "disclaimer": "Usage subject to terms",
+        "license": "https://openexchangerates.org/license",
+        "timestamp": 1760000000,
+        "base": "USD",
+        "rates": {code: random.uniform(0.0001, 30000) for code in codes}
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def _sample_history(count: int) -> list:
+    start = datetime(2024, 1, 1)
+    return [
+        Transaction("USD", random.choice(["EUR", "IDR", "JPY", "GBP"]), random.uniform(1, 1000),
+                    random.uniform(1, 1000000), random.uniform(0.5, 16000), start + timedelta(seconds=i))
+        for i in range(count)
+    ]
+
+
+def main():
+    print(f"Codec backend: {codec.BACKEND}")
+
+    latest = _sample_latest()
+    stdlib = _timeit(lambda: [json.loads(latest) for _ in range(2000)])
+    fast = _timeit(lambda: [codec.decode_latest(latest) for _ in range(2000)])
+    print(f"latest.json decode x2000:   stdlib {stdlib * 1000:8.1f} ms   codec {fast * 1000:8.1f} ms   "
+          f"({stdlib / fast:.1f}x)")
+
+    transactions = _sample_history(100000)
+    dicts = [t.to_dict() for t in transactions]
+    stdlib = _timeit(lambda: [json.dumps(d).encode("utf-8") for d in dicts], repeat=3)
+    fast = _timeit(lambda: [codec.dumps(d) for d in dicts], repeat=3)
+    print(f"history encode x100k:       stdlib {stdlib * 1000:8.1f} ms   codec {fast * 1000:8.1f} ms   "
+          f"({stdlib / fast:.1f}x)")
+
+    lines = [codec.dumps(d) for d in dicts]
+    stdlib = _timeit(lambda: [Transaction.from_dict(json.loads(line)) for line in lines], repeat=3)
+    fast = _timeit(lambda: codec.decode_transactions(lines), repeat=3)
+    print(f"history decode x100k:       stdlib {stdlib * 1000:8.1f} ms   codec {fast * 1000:8.1f} ms   "
+          f"({stdlib / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
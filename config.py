@@ -14,6 +14,24 @@ class Config:
     API_ID = os.getenv('APP_ID')
     API_BASE_URL = "https://openexchangerates.org/api/"
     API_TIMEOUT = 10
+    API_HEDGE_DELAY = float(os.getenv('API_HEDGE_DELAY', '1.5'))
+    # Seconds a successful API answer is reused for identical requests
+    API_CACHE_TTL = float(os.getenv('API_CACHE_TTL', '5'))
+    # Requests that may ask every provider at once; sizes the provider worker pool
+    API_MAX_CONCURRENT = int(os.getenv('API_MAX_CONCURRENT', '4'))
+    # Directory with latest.json/currencies.json used when the API is unreachable
+    FALLBACK_RATES_DIR = os.getenv('FALLBACK_RATES_DIR')
+    # Binary copy of the latest rates, mmapped for offline starts and batch workers
+    RATE_SNAPSHOT_FILE = "rates.snapshot"
+    # Name of a shared memory block carrying the rates of one publishing process
+    SHARED_RATES = os.getenv('SHARED_RATES')
+    SHARED_REFRESH_INTERVAL = int(os.getenv('SHARED_REFRESH_INTERVAL', '300'))
+    # Historical backfill: connection limits and requests per second
+    BACKFILL_MAX_CONNECTIONS = int(os.getenv('BACKFILL_MAX_CONNECTIONS', '8'))
+    BACKFILL_PER_HOST = int(os.getenv('BACKFILL_PER_HOST', '4'))
+    BACKFILL_RATE = float(os.getenv('BACKFILL_RATE', '5'))
+    # Days of refreshed rates kept in the rate log (0 keeps everything)
+    RATE_LOG_RETENTION_DAYS = float(os.getenv('RATE_LOG_RETENTION_DAYS', '365'))
     
     # Application Configuration
     APP_NAME = "Currency Exchange Converter"
@@ -26,6 +44,21 @@ class Config:
     DEFAULT_TO_CURRENCY = "IDR"
     DEFAULT_AMOUNT = "1.00"
     
+    # Memory Diagnostics
+    # Start tracemalloc at launch so in-app reports include Python allocations
+    MEMORY_TRACE = os.getenv('MEMORY_TRACE') == '1'
+    MEMORY_CHECK_INTERVAL = 10 * 60  # Seconds between budget checks
+    # Per-repository budgets in bytes; a warning is logged when one is exceeded
+    MEMORY_BUDGETS = {
+        "currencies": 2 * 1024 * 1024,
+        "rates": 16 * 1024 * 1024,
+        "history": 64 * 1024 * 1024,
+        "statistics": 32 * 1024 * 1024,
+        "alerts": 8 * 1024 * 1024,
+        "historical": 32 * 1024 * 1024,
+        "rate_log": 32 * 1024 * 1024,
+    }
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate configuration"""
@@ -1,23 +1,52 @@
 """
 Business logic controller for currency conversion
 """
-from typing import Tuple, List
-from datetime import datetime
-from repositories import CurrencyRepository, ExchangeRateRepository, HistoryRepository, SettingsRepository
-from models.transaction import Transaction
+import math
+from typing import Dict, Tuple, List, Iterable, Optional, Callable, Sequence, Union
+from array import array
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from repositories import (CurrencyRepository, ExchangeRateRepository, HistoryRepository,
+                          SettingsRepository, StatisticsRepository, HistoricalRateRepository,
+                          RateLogRepository)
+from models import RateChangeSet, RateSeries, RateTable
+from models.transaction import Transaction, DailyRollup
+from models.alert import RateAlert, AlertEvent
+from models.money import format_amount, from_minor_units, to_minor_units
+from services import (HistoryExporter, ExportFilter, AlertEngine, MemoryProfiler, BatchConverter,
+                      HistoryBackfill, utc_today)
 
 
 class CurrencyController:
     """Controller handling currency conversion business logic"""
     
+    SERIES_CHUNK_DAYS = 64  # Days of historical rates loaded per step of get_rate_series
+    
     def __init__(self, currency_repo: CurrencyRepository, 
                  rate_repo: ExchangeRateRepository,
                  history_repo: HistoryRepository,
-                 settings_repo: SettingsRepository):
+                 settings_repo: SettingsRepository,
+                 statistics_repo: Optional[StatisticsRepository] = None,
+                 alert_engine: Optional[AlertEngine] = None,
+                 memory_profiler: Optional[MemoryProfiler] = None,
+                 historical_repo: Optional[HistoricalRateRepository] = None,
+                 rate_log: Optional[RateLogRepository] = None,
+                 history_backfill: Optional[HistoryBackfill] = None):
         self._currency_repo = currency_repo
         self._rate_repo = rate_repo
         self._history_repo = history_repo
         self._settings_repo = settings_repo
+        self._statistics_repo = statistics_repo
+        self._alert_engine = alert_engine
+        self._memory_profiler = memory_profiler
+        self._historical_repo = historical_repo
+        self._rate_log = rate_log
+        self._history_backfill = history_backfill
+        
+        if alert_engine is not None:
+            rate_repo.subscribe(self._evaluate_alerts)
+        if rate_log is not None:
+            rate_repo.subscribe(self._log_rates)
     
     def initialize(self) -> Tuple[bool, str]:
         """Initialize data by loading currencies and rates"""
@@ -25,18 +54,78 @@ class CurrencyController:
         if not self._currency_repo.load_all():
             return False, "Failed to load currency list"
         
-        # Then load exchange rates
+        # Then load exchange rates, falling back to the last saved snapshot when offline
         if not self._rate_repo.refresh_all():
+            if self._rate_repo.load_snapshot_file():
+                return True, "Using saved exchange rates (offline)"
             return False, "Failed to load exchange rates"
         
         return True, "Data loaded successfully"
     
     def refresh_rates(self) -> Tuple[bool, str]:
-        """Refresh exchange rates"""
-        if self._rate_repo.refresh_all():
-            return True, "Rates refreshed successfully"
+        """Refresh exchange rates from the providers, never from the API service's cache"""
+        if self._rate_repo.refresh_all(force=True):
+            changes = self._rate_repo.get_last_changes()
+            changed = len(changes) if changes else 0
+            return True, f"Rates refreshed successfully ({changed} changed)"
         return False, "Failed to refresh rates"
     
+    def subscribe_rate_changes(self, callback: Callable[[RateChangeSet], None]):
+        """Get notified with a RateChangeSet whenever a refresh moves any rate"""
+        self._rate_repo.subscribe(callback)
+    
+    def _evaluate_alerts(self, changes: RateChangeSet):
+        """Check alerts against the rates that moved in a refresh"""
+        self._alert_engine.evaluate(changes, self._rate_repo.get_table())
+    
+    def _log_rates(self, changes: RateChangeSet):
+        """Keep the rates of every refresh that changed them for point-in-time lookups"""
+        self._rate_log.record(self._rate_repo.get_table())
+    
+    def add_alert(self, from_code: str, to_code: str, kind: str, threshold: float) -> Tuple[bool, str]:
+        """
+        Register a rate alert. kind is "above", "below" or "move" (percent per day).
+        Returns: (success, message)
+        """
+        if self._alert_engine is None:
+            return False, "Alerts are not available"
+        if not from_code or not to_code or from_code == to_code:
+            return False, "Please select two different currencies"
+        if kind not in RateAlert.KINDS:
+            return False, f"Unknown alert type: {kind}"
+        if threshold <= 0:
+            return False, "Threshold must be positive"
+        
+        alert = RateAlert(from_code, to_code, kind, threshold)
+        self._alert_engine.add_alert(alert)
+        return True, f"Alert added: {alert.describe()}"
+    
+    def remove_alert(self, alert_id: str) -> bool:
+        """Delete a rate alert"""
+        return self._alert_engine is not None and self._alert_engine.remove_alert(alert_id)
+    
+    def get_alerts(self) -> List[RateAlert]:
+        """Get all registered rate alerts"""
+        return self._alert_engine.get_alerts() if self._alert_engine else []
+    
+    def subscribe_alerts(self, callback: Callable[[List[AlertEvent]], None]):
+        """Get notified with the alerts fired by each refresh"""
+        if self._alert_engine is not None:
+            self._alert_engine.subscribe(callback)
+    
+    def refresh_currency_catalogue(self, progress_callback: Optional[Callable[[int, int], None]] = None,
+                                   is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str]:
+        """Refetch the currency list if a day has passed since the last fetch"""
+        try:
+            changed = self._currency_repo.refresh_if_due()
+        except Exception as e:
+            return False, f"Currency list refresh failed: {str(e)}"
+        return True, "Currency list updated" if changed else "Currency list unchanged"
+    
+    def get_currency_version(self) -> Optional[str]:
+        """Content hash of the currency list, to skip rebuilding unchanged views"""
+        return self._currency_repo.get_version()
+    
     def get_currency_codes(self) -> List[str]:
         """Get list of all available currency codes"""
         return self._currency_repo.get_all_codes()
@@ -62,6 +151,45 @@ class CurrencyController:
         self._settings_repo.set("default_from_currency", from_code)
         self._settings_repo.set("default_to_currency", to_code)
     
+    def get_target_currencies(self) -> List[str]:
+        """Currencies shown in the one-to-many conversion panel"""
+        return list(self._settings_repo.get("target_currencies", []))
+    
+    def set_target_currencies(self, codes: Sequence[str]):
+        """Set the currencies of the one-to-many conversion panel"""
+        self._settings_repo.set("target_currencies", list(codes))
+    
+    def convert_to_many(self, from_code: str, to_codes: Sequence[str], amount: float) -> Tuple[bool, array, str]:
+        """
+        Convert one amount into many currencies without touching history.
+        Uses the rate vector of the table rebased to `from_code`, which is
+        computed once per refresh, so each call is one multiplication per target.
+        Returns: (success, results aligned with to_codes, message); unknown targets are NaN.
+        """
+        if not math.isfinite(amount) or amount <= 0:
+            return False, array('d'), "Amount must be a positive number"
+        snapshot = self._rate_repo.get_snapshot()
+        if snapshot is None:
+            return False, array('d'), "Exchange rates not loaded"
+        table = snapshot.get_table(from_code) if from_code in snapshot else None
+        if table is None:
+            return False, array('d'), f"Exchange rate not found for {from_code}"
+        
+        nan = float('nan')
+        try:
+            if self.is_exact_mode():
+                fixed_point = snapshot.get_fixed_point_rates()
+                exact_amount = Decimal(repr(amount))
+                results = array('d', [float(fixed_point.convert(from_code, code, exact_amount))
+                                      if code in snapshot else nan for code in to_codes])
+            else:
+                rates = table.get_rates()
+                indices = [table.index_of(code) for code in to_codes]
+                results = array('d', [amount * rates[i] if i is not None else nan for i in indices])
+        except (ArithmeticError, ValueError, KeyError) as e:
+            return False, array('d'), f"Conversion error: {str(e)}"
+        return True, results, f"Converted {from_code} into {len(to_codes)} currencies"
+    
     def convert(self, from_code: str, to_code: str, amount: float) -> Tuple[bool, float, str]:
         """
         Convert amount from one currency to another
@@ -74,43 +202,424 @@ class CurrencyController:
         if amount <= 0:
             return False, 0.0, "Amount must be positive"
         
-        # Check if rates exist
-        from_rate = self._rate_repo.get_by_code(from_code)
-        to_rate = self._rate_repo.get_by_code(to_code)
+        # Read the snapshot once so both rates come from the same refresh
+        snapshot = self._rate_repo.get_snapshot()
         
-        if not from_rate:
+        # Check if rates exist
+        if snapshot is None or from_code not in snapshot:
             return False, 0.0, f"Exchange rate not found for {from_code}"
         
-        if not to_rate:
+        if to_code not in snapshot:
             return False, 0.0, f"Exchange rate not found for {to_code}"
         
-        # Perform conversion through USD (base currency)
+        # Look up the pair in the table rebased to the source currency
         try:
-            amount_in_usd = amount / from_rate.get_rate()
-            result = to_rate.calculate(amount_in_usd)
+            table = snapshot.get_table(from_code)
+            rate = table.get_rate(to_code)
+            
+            if self.is_exact_mode():
+                # Keep the exact minor units in history; the float is only for display
+                fixed_point = snapshot.get_fixed_point_rates()
+                result_minor = fixed_point.convert_minor(
+                    from_code, to_code, to_minor_units(Decimal(repr(amount)), from_code))
+                result = float(from_minor_units(result_minor, to_code))
+            else:
+                result_minor = None
+                result = amount * rate
             
-            rate = result / amount if amount > 0 else 0
             rate_info = f"1 {from_code} = {rate:.4f} {to_code}"
             
             # Save to history
-            transaction = Transaction(
-                from_currency=from_code,
-                to_currency=to_code,
-                amount=amount,
-                result=result,
-                rate=rate,
-                timestamp=datetime.now()
-            )
-            self._history_repo.add(transaction)
+            self._save_transaction(from_code, to_code, amount, result, rate, result_minor)
             
             return True, result, rate_info
         except Exception as e:
             return False, 0.0, f"Conversion error: {str(e)}"
     
+    def is_exact_mode(self) -> bool:
+        """Check whether conversions use fixed-point minor-unit arithmetic"""
+        return self._settings_repo.get("conversion_mode", "float") == "exact"
+    
+    def set_exact_mode(self, enabled: bool):
+        """Switch between float and fixed-point conversion"""
+        self._settings_repo.set("conversion_mode", "exact" if enabled else "float")
+    
+    def convert_exact(self, from_code: str, to_code: str, amount,
+                      save_history: bool = False) -> Tuple[bool, Decimal, str]:
+        """
+        Convert a decimal amount exactly, rounded to the target's minor units.
+        With save_history the conversion is recorded with its exact result.
+        Returns: (success, result, message)
+        """
+        try:
+            amount = Decimal(str(amount))
+        except InvalidOperation:
+            return False, Decimal(0), "Invalid amount format"
+        if not amount.is_finite() or amount <= 0:
+            return False, Decimal(0), "Amount must be positive"
+        
+        snapshot = self._rate_repo.get_snapshot()
+        if snapshot is None:
+            return False, Decimal(0), "Exchange rates not loaded"
+        
+        try:
+            result_minor = snapshot.get_fixed_point_rates().convert_minor(
+                from_code, to_code, to_minor_units(amount, from_code))
+        except KeyError as e:
+            return False, Decimal(0), str(e.args[0])
+        result = from_minor_units(result_minor, to_code)
+        
+        if save_history:
+            rate = snapshot.get_table(from_code).get_rate(to_code)
+            self._save_transaction(from_code, to_code, float(amount), float(result), rate, result_minor)
+        message = (f"{format_amount(amount, from_code)} {from_code} = "
+                   f"{format_amount(result, to_code)} {to_code}")
+        return True, result, message
+    
+    def _save_transaction(self, from_code: str, to_code: str, amount: float, result: float,
+                          rate: float, result_minor: Optional[int] = None):
+        """Record a conversion in history"""
+        transaction = Transaction(
+            from_currency=from_code,
+            to_currency=to_code,
+            amount=amount,
+            result=result,
+            rate=rate,
+            timestamp=datetime.now(),
+            result_minor=result_minor
+        )
+        self._history_repo.add(transaction)
+    
+    def convert_exact_batch(self, from_code: str, to_code: str,
+                            amounts_minor: Iterable[int], rounding: str = None) -> array:
+        """
+        Convert many amounts given in minor units (int64) without touching history.
+        Raises KeyError for unknown currencies.
+        """
+        fixed_point = self._rate_repo.get_fixed_point_rates()
+        if fixed_point is None:
+            raise KeyError("Exchange rates not loaded")
+        return fixed_point.convert_minor_batch(from_code, to_code, amounts_minor, rounding)
+    
+    def convert_at(self, amounts: Sequence[float], pairs: Sequence[Tuple[str, str]],
+                   dates: Sequence[Union[date, datetime, str]]) -> Tuple[bool, array, str]:
+        """
+        Convert many amounts at the end-of-day rates of their own dates, without touching history.
+        Rows are grouped by date so each day's rates are loaded once, then by
+        pair so each cross rate is computed once.
+        Returns: (success, results aligned with the input, message); rows
+        without a known rate are NaN.
+        """
+        if not len(amounts) == len(pairs) == len(dates):
+            return False, array('d'), "amounts, pairs and dates must have the same length"
+        if self._historical_repo is None:
+            return False, array('d'), "Historical rates are not available"
+        
+        try:
+            days = [_to_date(d) for d in dates]
+        except ValueError as e:
+            return False, array('d'), f"Invalid date: {e}"
+        
+        groups: Dict[date, Dict[Tuple[str, str], List[int]]] = {}
+        for i, (day, pair) in enumerate(zip(days, pairs)):
+            groups.setdefault(day, {}).setdefault(tuple(pair), []).append(i)
+        
+        tables = self._historical_repo.get_tables(groups.keys())
+        results = array('d', [float('nan')]) * len(amounts)
+        missing = 0
+        for day, by_pair in groups.items():
+            table = tables.get(day)
+            for (from_code, to_code), rows in by_pair.items():
+                rate = table.cross_rate(from_code, to_code) if table else None
+                if rate is None:
+                    missing += len(rows)
+                    continue
+                for i in rows:
+                    results[i] = amounts[i] * rate
+        
+        if missing:
+            return True, results, f"Converted {len(amounts) - missing:,} rows, {missing:,} without a rate"
+        return True, results, f"Converted {len(amounts):,} rows over {len(groups):,} days"
+    
+    def backfill_history(self, start: Union[date, datetime, str], end: Union[date, datetime, str],
+                         progress_callback: Optional[Callable[[int, int], None]] = None,
+                         is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str]:
+        """
+        Download the end-of-day rates of every day from start to end into the
+        historical rate cache. Days already cached are skipped, so an
+        interrupted backfill resumes where it stopped.
+        Returns: (success, message)
+        """
+        if self._history_backfill is None:
+            return False, "Historical backfill is not available"
+        try:
+            start_day, end_day = _to_date(start), _to_date(end)
+        except ValueError as e:
+            return False, f"Invalid date: {e}"
+        if start_day > end_day:
+            return False, "Start date is after end date"
+        
+        try:
+            fetched, failed = self._history_backfill.run(start_day, end_day, progress_callback, is_cancelled)
+        except Exception as e:
+            return False, f"Backfill failed: {str(e)}"
+        
+        if is_cancelled and is_cancelled():
+            return False, f"Backfill cancelled after {fetched:,} days"
+        if failed:
+            return False, f"Fetched {fetched:,} days, {failed:,} failed; run again to retry them"
+        return True, f"Fetched {fetched:,} days"
+    
+    def get_rate_series(self, from_code: str, to_code: str, start: Union[date, datetime, str],
+                        end: Union[date, datetime, str],
+                        progress_callback: Optional[Callable[[int, int], None]] = None,
+                        is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, RateSeries, str]:
+        """
+        Daily rates of a pair from the historical cache, plus any logged
+        intraday snapshots, between two dates. Nothing is downloaded: days
+        not cached yet are left out and counted in the message, and
+        backfill_history fetches them. Days are read in chunks so the call
+        can report progress and be cancelled.
+        Returns: (success, series, message)
+        """
+        series = RateSeries(from_code, to_code)
+        if self._historical_repo is None:
+            return False, series, "Historical rates are not available"
+        try:
+            start_day, end_day = _to_date(start), min(_to_date(end), utc_today())
+        except ValueError as e:
+            return False, series, f"Invalid date: {e}"
+        
+        days = [start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)]
+        points: Dict[float, float] = {}
+        for first in range(0, len(days), self.SERIES_CHUNK_DAYS):
+            if is_cancelled and is_cancelled():
+                return False, series, "Loading cancelled"
+            chunk = days[first:first + self.SERIES_CHUNK_DAYS]
+            tables = self._historical_repo.get_tables(chunk, fetch=False)
+            for day in chunk:
+                table = tables.get(day)
+                rate = table.cross_rate(from_code, to_code) if table else None
+                if rate is not None:
+                    timestamp = table.get_timestamp()
+                    if not isinstance(timestamp, (int, float)):
+                        timestamp = datetime.combine(day, datetime.max.time()).timestamp()
+                    points[float(timestamp)] = rate
+            if progress_callback:
+                progress_callback(min(first + len(chunk), len(days)), len(days))
+        
+        if self._rate_log is not None:
+            range_start = datetime.combine(start_day, datetime.min.time()).timestamp()
+            range_end = datetime.combine(end_day, datetime.max.time()).timestamp()
+            points.update(self._rate_log.get_series(from_code, to_code, range_start, range_end))
+        
+        missing = self.count_missing_history(start_day, end_day)
+        missing_info = f", {missing:,} days not downloaded" if missing else ""
+        if not points:
+            return False, series, f"No {from_code}/{to_code} rates between {start_day} and {end_day}{missing_info}"
+        times = sorted(points)
+        series = RateSeries(from_code, to_code, times, [points[t] for t in times])
+        return True, series, f"{len(series):,} points from {start_day} to {end_day}{missing_info}"
+    
+    def get_history_today(self) -> date:
+        """Today in the UTC calendar of historical rates"""
+        return utc_today()
+    
+    def count_missing_history(self, start: Union[date, datetime, str], end: Union[date, datetime, str]) -> int:
+        """Number of past days from start to end that are not in the historical cache yet"""
+        if self._historical_repo is None:
+            return 0
+        start_day, end_day = _to_date(start), min(_to_date(end), utc_today() - timedelta(days=1))
+        return sum(1 for i in range((end_day - start_day).days + 1)
+                   if not self._historical_repo.has_day(start_day + timedelta(days=i)))
+    
+    def get_rate_at(self, from_code: str, to_code: str, when: datetime,
+                    interpolate: bool = False) -> Tuple[bool, float, str]:
+        """
+        Get the rate that was live at `when`, optionally interpolated between refreshes
+        Returns: (success, rate, message)
+        """
+        if self._rate_log is None:
+            return False, 0.0, "Rate log is not available"
+        rate = self._rate_log.get_rate_at(from_code, to_code, when, interpolate)
+        if rate is None:
+            return False, 0.0, f"No {from_code}/{to_code} rate logged at {when}"
+        return True, rate, f"1 {from_code} = {rate:.4f} {to_code}"
+    
+    def reprice_transactions(self, transactions: Iterable[Transaction], interpolate: bool = False
+                             ) -> List[Tuple[Transaction, Optional[float], Optional[float]]]:
+        """
+        Audit transactions against the rates live when they were recorded.
+        Returns (transaction, logged rate, repriced result) tuples; the rate and
+        result are None when no snapshot covers the transaction.
+        """
+        audited = []
+        for transaction in transactions:
+            rate = None
+            if self._rate_log is not None:
+                rate = self._rate_log.get_rate_at(transaction.from_currency, transaction.to_currency,
+                                                  transaction.timestamp, interpolate)
+            audited.append((transaction, rate, transaction.amount * rate if rate is not None else None))
+        return audited
+    
+    def convert_file(self, input_path: str, output_path: str, workers: Optional[int] = None,
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     is_cancelled: Optional[Callable[[], bool]] = None,
+                     shared_rates: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Convert a CSV of amount/from_currency/to_currency rows with a process pool,
+        using the current rates (or those in the `shared_rates` memory block)
+        and conversion mode. History is not touched.
+        Returns: (success, message)
+        """
+        snapshot = self._rate_repo.get_snapshot()
+        if snapshot is None:
+            return False, "Exchange rates not loaded"
+        
+        try:
+            rows, failed = BatchConverter(workers).convert(
+                snapshot.get_table(), input_path, output_path, self.is_exact_mode(),
+                progress_callback, is_cancelled, self._rate_repo.get_snapshot_file(), shared_rates)
+        except Exception as e:
+            return False, f"Batch conversion failed: {str(e)}"
+        
+        if is_cancelled and is_cancelled():
+            return False, "Batch conversion cancelled"
+        if failed:
+            return True, f"Converted {rows - failed:,} rows, {failed:,} failed"
+        return True, f"Converted {rows:,} rows"
+    
+    def get_rate_table(self, base: Optional[str] = None) -> Optional[RateTable]:
+        """The current rate table, optionally rebased; None before rates are loaded"""
+        return self._rate_repo.get_table(base)
+    
+    def get_rates(self, base: str) -> List[Tuple[str, float]]:
+        """Get (code, rate) pairs for all currencies relative to `base`"""
+        table = self._rate_repo.get_table(base)
+        return table.items() if table else []
+    
     def get_history(self) -> List[Transaction]:
         """Get transaction history"""
         return self._history_repo.get_all()
     
+    def get_history_page(self, page: int, page_size: int = HistoryRepository.PAGE_SIZE) -> List[Transaction]:
+        """Get one page of transaction history, newest first"""
+        return self._history_repo.get_page(page, page_size)
+    
+    def get_history_page_size(self) -> int:
+        """Number of transactions in one page of get_history_page"""
+        return HistoryRepository.PAGE_SIZE
+    
+    def get_history_count(self) -> int:
+        """Get the number of stored transactions"""
+        return self._history_repo.count()
+    
+    def export_history(self, path: str, fmt: Optional[str] = None,
+                       start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       from_currency: Optional[str] = None, to_currency: Optional[str] = None,
+                       progress_callback: Optional[Callable[[int, int], None]] = None,
+                       is_cancelled: Optional[Callable[[], bool]] = None,
+                       chunk_size: int = 10000) -> Tuple[bool, str]:
+        """
+        Stream transaction history to a CSV, JSONL, Parquet or Arrow file.
+        Only individual transactions are exported; the message counts the
+        days in range that were compacted into daily rollups and left out.
+        Safe to call from a worker thread. Returns: (success, message)
+        """
+        exporter = HistoryExporter(chunk_size)
+        fmt = fmt or exporter.format_for_path(path)
+        if not fmt:
+            return False, "Unknown export format"
+        
+        export_filter = ExportFilter(start, end, from_currency, to_currency)
+        try:
+            written = exporter.export(self._history_repo.iter_chunks(chunk_size), path, fmt,
+                                      export_filter, self._history_repo.count(),
+                                      progress_callback, is_cancelled)
+        except Exception as e:
+            return False, f"Export failed: {str(e)}"
+        if written is None:
+            return False, "Export cancelled"
+        
+        compacted_days = {r.date for r in self._history_repo.get_rollups()
+                          if (not start or r.date >= start.date()) and (not end or r.date <= end.date())
+                          and (not from_currency or r.from_currency == from_currency)
+                          and (not to_currency or r.to_currency == to_currency)}
+        if compacted_days:
+            return True, (f"Exported {written:,} transactions; {len(compacted_days):,} compacted days "
+                          f"are only kept as daily totals and were not exported")
+        return True, f"Exported {written:,} transactions"
+    
+    def get_history_rollups(self) -> List[DailyRollup]:
+        """Get daily rollups of compacted history, newest first"""
+        return self._history_repo.get_rollups()
+    
+    def get_retention_days(self) -> int:
+        """Days of detailed history to keep (0 keeps everything)"""
+        return int(self._settings_repo.get("history_retention_days", 0))
+    
+    def set_retention_days(self, days: int):
+        """Set how many days of detailed history to keep"""
+        self._settings_repo.set("history_retention_days", max(int(days), 0))
+    
+    def compact_history(self, progress_callback: Optional[Callable[[int, int], None]] = None,
+                        is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[bool, str]:
+        """
+        Roll transactions older than the retention period up into daily aggregates.
+        Works in small batches so it can run in the background. Returns: (success, message)
+        """
+        days = self.get_retention_days()
+        if days <= 0:
+            return True, "History retention is disabled"
+        
+        cutoff = datetime.now() - timedelta(days=days)
+        compacted = 0
+        while not (is_cancelled and is_cancelled()):
+            batch = self._history_repo.compact(cutoff)
+            if not batch:
+                break
+            compacted += batch
+            if progress_callback:
+                progress_callback(compacted, 0)
+        return True, f"Compacted {compacted:,} transactions"
+    
+    def get_pair_statistics(self, window: Optional[str] = None) -> List[Tuple[str, int, float, float]]:
+        """Get (pair, count, amount, result) usage, all-time or for a window like "24h"."""
+        if self._statistics_repo is None:
+            return []
+        return self._statistics_repo.get_pairs(window)
+    
+    def get_currency_statistics(self) -> List[Tuple[str, int, float]]:
+        """Get (code, count, volume) usage per currency"""
+        if self._statistics_repo is None:
+            return []
+        return self._statistics_repo.get_currencies()
+    
+    def get_conversion_counts(self) -> dict:
+        """Get the all-time and rolling-window conversion counts"""
+        if self._statistics_repo is None:
+            return {}
+        counts = {"all": self._statistics_repo.get_total_count()}
+        counts.update(self._statistics_repo.get_window_counts())
+        return counts
+    
+    def get_memory_report(self) -> str:
+        """Get a readable breakdown of memory use by subsystem"""
+        if self._memory_profiler is None:
+            return "Memory profiling is not enabled"
+        return self._memory_profiler.report().format()
+    
+    def check_memory_budgets(self) -> List[str]:
+        """Warn about repositories over their memory budget"""
+        if self._memory_profiler is None:
+            return []
+        return self._memory_profiler.check_budgets()
+    
+    def register_memory_counts(self, name: str, counter: Callable[[], Dict[str, int]]):
+        """Include widget item counts (held by Qt, not Python) in memory reports"""
+        if self._memory_profiler is not None:
+            self._memory_profiler.register_counts(name, counter)
+    
     def clear_history(self):
         """Clear transaction history"""
         self._history_repo.clear()
@@ -122,7 +631,15 @@ class CurrencyController:
         to_name = self.get_currency_name(to_code)
         
         return (
-            f"{amount:,.2f} {from_code} ({from_name})\n"
+            f"{format_amount(amount, from_code)} {from_code} ({from_name})\n"
             f"=\n"
-            f"{result:,.2f} {to_code} ({to_name})"
+            f"{format_amount(result, to_code)} {to_code} ({to_name})"
         )
+
+
+def _to_date(value: Union[date, datetime, str]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
@@ -1,41 +1,151 @@
+import argparse
 import sys
+import time
 from PyQt6.QtWidgets import QApplication
 
 from config import Config
-from services import APIService
-from repositories import CurrencyRepository, ExchangeRateRepository, HistoryRepository, SettingsRepository
+from services import (APIService, AlertEngine, OpenExchangeRatesProvider, FileRateProvider,
+                      MemoryProfiler, SharedRatePublisher, SharedMemoryRateProvider, AsyncRateClient,
+                      HistoryBackfill)
+from services.memory_profiler import start_tracing
+from repositories import (CurrencyRepository, ExchangeRateRepository, HistoryRepository,
+                          SettingsRepository, StatisticsRepository, AlertRepository,
+                          HistoricalRateRepository, RateLogRepository)
 from controllers import CurrencyController
 from views import MainWindow
 
 
+def parse_args():
+    """Split command line options from the arguments left for Qt"""
+    parser = argparse.ArgumentParser(description=Config.APP_NAME)
+    parser.add_argument("--memory-report", action="store_true",
+                        help="load the data headless, print a memory breakdown and exit")
+    parser.add_argument("--convert-file", nargs=2, metavar=("INPUT", "OUTPUT"),
+                        help="convert a CSV with amount,from_currency,to_currency columns and exit")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --convert-file (default: CPU count)")
+    parser.add_argument("--backfill", nargs=2, metavar=("START", "END"),
+                        help="download daily historical rates for START..END (YYYY-MM-DD) and exit")
+    parser.add_argument("--publish-rates", action="store_true",
+                        help="refresh rates periodically into the SHARED_RATES memory block for other instances")
+    args, qt_args = parser.parse_known_args()
+    return args, sys.argv[:1] + qt_args
+
+
 def main():
     """Main application entry point"""
+    args, qt_args = parse_args()
+    memory_report = args.memory_report
+    if memory_report or Config.MEMORY_TRACE:
+        start_tracing()
+    
     # Validate configuration
     if not Config.validate():
         sys.exit(1)
     
-    # Create QApplication
-    app = QApplication(sys.argv)
-    app.setApplicationName(Config.APP_NAME)
-    
     # Initialize services (Dependency Injection)
-    api_service = APIService(Config.API_ID)
+    providers = [OpenExchangeRatesProvider(Config.API_ID, Config.API_BASE_URL, Config.API_TIMEOUT)]
+    if Config.SHARED_RATES and not args.publish_rates:
+        # Read the rates another process publishes; the API is only asked when it is not running
+        providers.insert(0, SharedMemoryRateProvider(Config.SHARED_RATES, 2 * Config.SHARED_REFRESH_INTERVAL))
+    if Config.FALLBACK_RATES_DIR:
+        providers.append(FileRateProvider(Config.FALLBACK_RATES_DIR))
+    api_service = APIService(Config.API_ID, providers, Config.API_HEDGE_DELAY, Config.API_TIMEOUT,
+                             Config.API_CACHE_TTL, Config.API_MAX_CONCURRENT)
     
     # Initialize repositories
     currency_repo = CurrencyRepository(api_service)
-    rate_repo = ExchangeRateRepository(api_service, currency_repo)
-    history_repo = HistoryRepository()
+    rate_repo = ExchangeRateRepository(api_service, currency_repo, Config.RATE_SNAPSHOT_FILE)
+    statistics_repo = StatisticsRepository()
+    history_repo = HistoryRepository(statistics_repo=statistics_repo)
     settings_repo = SettingsRepository()
+    alert_engine = AlertEngine(AlertRepository())
+    historical_repo = HistoricalRateRepository(api_service)
+    rate_log = RateLogRepository(retention_days=Config.RATE_LOG_RETENTION_DAYS)
+    history_backfill = HistoryBackfill(
+        AsyncRateClient(Config.API_ID, Config.API_BASE_URL, Config.API_TIMEOUT,
+                        Config.BACKFILL_MAX_CONNECTIONS, Config.BACKFILL_PER_HOST, Config.BACKFILL_RATE),
+        historical_repo)
+    
+    memory_profiler = MemoryProfiler(Config.MEMORY_BUDGETS)
+    memory_profiler.register("currencies", currency_repo.memory_usage)
+    memory_profiler.register("rates", rate_repo.memory_usage)
+    memory_profiler.register("history", history_repo.memory_usage)
+    memory_profiler.register("statistics", statistics_repo.memory_usage)
+    memory_profiler.register("alerts", alert_engine.memory_usage)
+    memory_profiler.register("historical", historical_repo.memory_usage)
+    memory_profiler.register("rate_log", rate_log.memory_usage)
     
     # Initialize controller
-    controller = CurrencyController(currency_repo, rate_repo, history_repo, settings_repo)
+    controller = CurrencyController(currency_repo, rate_repo, history_repo, settings_repo,
+                                    statistics_repo, alert_engine, memory_profiler, historical_repo,
+                                    rate_log, history_backfill)
+    
+    if memory_report:
+        success, message = controller.initialize()
+        if not success:
+            print(f"Error: {message}")
+        controller.get_history_page(0)
+        print(controller.get_memory_report())
+        statistics_repo.flush()
+        return
+    
+    if args.convert_file:
+        success, message = controller.initialize()
+        if success:
+            success, message = controller.convert_file(*args.convert_file, workers=args.workers,
+                                                       shared_rates=Config.SHARED_RATES)
+        print(message if success else f"Error: {message}")
+        sys.exit(0 if success else 1)
+    
+    if args.backfill:
+        def report(done, total):
+            print(f"\r{done:,}/{total:,} days", end="", flush=True)
+        success, message = controller.backfill_history(*args.backfill, progress_callback=report)
+        print()
+        print(message if success else f"Error: {message}")
+        sys.exit(0 if success else 1)
+    
+    if args.publish_rates:
+        publish_rates(controller, rate_repo)
+        return
+    
+    # Create QApplication
+    app = QApplication(qt_args)
+    app.setApplicationName(Config.APP_NAME)
     
     # Create and show main window
     window = MainWindow(controller, settings_repo)
     window.show()
     
     # Run application
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    statistics_repo.flush()
+    sys.exit(exit_code)
+
+
+def publish_rates(controller: CurrencyController, rate_repo: ExchangeRateRepository):
+    """Refresh rates forever and publish each change into shared memory"""
+    if not Config.SHARED_RATES:
+        print("Error: SHARED_RATES not found in environment variables")
+        sys.exit(1)
+    
+    publisher = SharedRatePublisher(Config.SHARED_RATES)
+    rate_repo.subscribe(lambda changes: publisher.publish(rate_repo.get_table()))
+    try:
+        success, message = controller.initialize()
+        print(message)
+        if rate_repo.get_table() is not None:
+            publisher.publish(rate_repo.get_table())
+        while True:
+            time.sleep(Config.SHARED_REFRESH_INTERVAL)
+            success, message = controller.refresh_rates()
+            print(message)
+            publisher.heartbeat()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
 
 
 if __name__ == "__main__":
@@ -2,5 +2,12 @@
 Models package
 """
 from .currency import Currency, ExchangeRate
+from .rate_table import RateTable
+from .money import FixedPointRates
+from .rate_delta import RateDelta, RateChangeSet
+from .rate_snapshot import RateSnapshot
+from .binary_snapshot import MappedRateTable, write_rate_snapshot, open_rate_snapshot
+from .rate_series import RateSeries
 
-__all__ = ['Currency', 'ExchangeRate']
+__all__ = ['Currency', 'ExchangeRate', 'RateTable', 'FixedPointRates', 'RateDelta', 'RateChangeSet',
+           'RateSnapshot', 'MappedRateTable', 'write_rate_snapshot', 'open_rate_snapshot', 'RateSeries']
@@ -0,0 +1,68 @@
+"""
+Rate alert models
+"""
+import uuid
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RateAlert:
+    """
+    A condition on the rate of a currency pair.
+
+    kind "above" / "below" fires when the rate crosses `threshold`;
+    kind "move" fires when the rate moves more than `threshold` percent
+    away from the first rate seen that day.
+    """
+    from_currency: str
+    to_currency: str
+    kind: str
+    threshold: float
+    alert_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    KINDS = ("above", "below", "move")
+
+    @property
+    def pair(self):
+        return (self.from_currency, self.to_currency)
+
+    def describe(self) -> str:
+        if self.kind == "move":
+            return f"{self.from_currency}→{self.to_currency} moves more than {self.threshold:g}% in a day"
+        return f"{self.from_currency}→{self.to_currency} {self.kind} {self.threshold:,.6g}"
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for storage"""
+        return {
+            "alert_id": self.alert_id,
+            "from_currency": self.from_currency,
+            "to_currency": self.to_currency,
+            "kind": self.kind,
+            "threshold": self.threshold
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RateAlert':
+        """Create from dictionary"""
+        return cls(
+            from_currency=data["from_currency"],
+            to_currency=data["to_currency"],
+            kind=data["kind"],
+            threshold=data["threshold"],
+            alert_id=data["alert_id"]
+        )
+
+
+@dataclass(frozen=True)
+class AlertEvent:
+    """A triggered alert with the rates that triggered it"""
+    alert: RateAlert
+    old_rate: float
+    new_rate: float
+    reference_rate: float
+
+    def describe(self) -> str:
+        if self.alert.kind == "move":
+            move = (self.new_rate / self.reference_rate - 1) * 100
+            return f"{self.alert.describe()}: now {self.new_rate:,.6g} ({move:+.2f}%)"
+        return f"{self.alert.describe()}: now {self.new_rate:,.6g}"
@@ -0,0 +1,141 @@
+"""
+Compact binary file format for rate tables, readable through mmap
+"""
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Optional
+from .rate_table import RateTable
+
+# Layout (little endian):
+#   header   magic, version, code width, count, timestamp, base code (32 bytes)
+#   codes    `count` ASCII codes, NUL padded to CODE_WIDTH, sorted
+#   rates    `count` float64 rates, aligned with the codes
+MAGIC = b"FXRT"
+VERSION = 1
+CODE_WIDTH = 8
+HEADER = struct.Struct("<4sHHIq8s4x")
+NO_TIMESTAMP = -1
+
+
+def write_rate_snapshot(path: str, table: RateTable):
+    """Write a table atomically: readers see either the old or the new file"""
+    entries = sorted((_pad(code), rate) for code, rate in table.items())
+    timestamp = table.get_timestamp()
+    header = HEADER.pack(MAGIC, VERSION, CODE_WIDTH, len(entries),
+                         int(timestamp) if isinstance(timestamp, (int, float)) else NO_TIMESTAMP,
+                         _pad(table.get_base()))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(b"".join(code for code, _ in entries))
+        array('d', (rate for _, rate in entries)).tofile(f)
+    os.replace(tmp_path, path)
+
+
+def open_rate_snapshot(path: str) -> 'MappedRateTable':
+    """Map a snapshot file. Raises ValueError for files in another format."""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return MappedRateTable(mapped)
+
+
+class _CodeTable(Sequence):
+    """The sorted code table of a mapped file, decoded on access"""
+
+    def __init__(self, view: memoryview, count: int):
+        self._view = view
+        self._count = count
+
+    def raw(self, i: int) -> bytes:
+        return self._view[i * CODE_WIDTH:(i + 1) * CODE_WIDTH].tobytes()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return self.raw(i).rstrip(b"\0").decode('ascii')
+
+    def __len__(self):
+        return self._count
+
+
+class _CodeIndex:
+    """Code -> position lookups by binary search over the mapped code table"""
+
+    def __init__(self, codes: _CodeTable):
+        self._codes = codes
+        self._keys = _RawKeys(codes)
+
+    def get(self, code: str, default=None) -> Optional[int]:
+        try:
+            key = _pad(code)
+        except (UnicodeEncodeError, ValueError):
+            return default
+        i = bisect_left(self._keys, key)
+        if i < len(self._codes) and self._codes.raw(i) == key:
+            return i
+        return default
+
+    def __contains__(self, code) -> bool:
+        return isinstance(code, str) and self.get(code) is not None
+
+
+class _RawKeys(Sequence):
+    def __init__(self, codes: _CodeTable):
+        self._codes = codes
+
+    def __getitem__(self, i):
+        return self._codes.raw(i)
+
+    def __len__(self):
+        return len(self._codes)
+
+
+class MappedRateTable(RateTable):
+    """
+    RateTable backed by a memory-mapped snapshot file.
+
+    Opening costs a header read, whatever the number of currencies: the rate
+    vector is a zero-copy float64 view of the mapping and codes are found by
+    binary search in the sorted code table. The pages are shared by every
+    process mapping the same file.
+    """
+
+    def __init__(self, mapped: mmap.mmap):
+        if len(mapped) < HEADER.size:
+            raise ValueError("Not a rate snapshot file")
+        magic, version, width, count, timestamp, base = HEADER.unpack_from(mapped)
+        if magic != MAGIC or version != VERSION or width != CODE_WIDTH:
+            raise ValueError("Not a rate snapshot file")
+        rates_start = HEADER.size + count * CODE_WIDTH
+        if len(mapped) < rates_start + 8 * count:
+            raise ValueError("Truncated rate snapshot file")
+
+        view = memoryview(mapped)
+        self._mapped = mapped
+        self._base = base.rstrip(b"\0").decode('ascii')
+        self._codes = _CodeTable(view[HEADER.size:rates_start], count)
+        self._rates = view[rates_start:rates_start + 8 * count].cast('d')
+        self._timestamp = None if timestamp == NO_TIMESTAMP else timestamp
+        self._index = _CodeIndex(self._codes)
+        self._rebased = {self._base: self}
+
+    def get_codes(self) -> Sequence[str]:
+        return self._codes
+
+    def __repr__(self):
+        return f"MappedRateTable(base='{self._base}', currencies={len(self._codes)})"
+
+
+def _pad(code: str) -> bytes:
+    raw = code.encode('ascii')
+    if len(raw) > CODE_WIDTH:
+        raise ValueError(f"Currency code too long: {code}")
+    return raw.ljust(CODE_WIDTH, b"\0")
@@ -0,0 +1,170 @@
+"""
+Fixed-point money arithmetic for exact minor-unit conversion
+"""
+from array import array
+from decimal import (Decimal, ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_HALF_DOWN,
+                     ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING)
+from typing import Dict, Iterable, Optional, Union
+from .rate_table import RateTable
+
+# Rates are stored as integers scaled by 10**RATE_DIGITS
+RATE_DIGITS = 12
+RATE_SCALE = 10 ** RATE_DIGITS
+
+# ISO 4217 minor unit exponents that differ from the default of 2
+DEFAULT_MINOR_UNITS = 2
+MINOR_UNITS: Dict[str, int] = {
+    'BIF': 0, 'CLP': 0, 'DJF': 0, 'GNF': 0, 'ISK': 0, 'JPY': 0, 'KMF': 0,
+    'KRW': 0, 'PYG': 0, 'RWF': 0, 'UGX': 0, 'UYI': 0, 'VND': 0, 'VUV': 0,
+    'XAF': 0, 'XOF': 0, 'XPF': 0,
+    'BHD': 3, 'IQD': 3, 'JOD': 3, 'KWD': 3, 'LYD': 3, 'OMR': 3, 'TND': 3,
+    'CLF': 4,
+    'BTC': 8,
+}
+
+# Per-currency rounding rules; anything not listed uses banker's rounding
+DEFAULT_ROUNDING = ROUND_HALF_EVEN
+ROUNDING_RULES: Dict[str, str] = {}
+
+SUPPORTED_ROUNDING = (ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_HALF_DOWN,
+                      ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING)
+
+
+def minor_units(code: str) -> int:
+    """Number of decimal places used by a currency"""
+    return MINOR_UNITS.get(code, DEFAULT_MINOR_UNITS)
+
+
+def rounding_for(code: str) -> str:
+    """Rounding mode applied when producing amounts in a currency"""
+    return ROUNDING_RULES.get(code, DEFAULT_ROUNDING)
+
+
+def to_minor_units(amount: Union[Decimal, str, int], code: str,
+                   rounding: Optional[str] = None) -> int:
+    """Convert a decimal amount into an integer count of minor units"""
+    value = Decimal(amount).scaleb(minor_units(code))
+    return int(value.to_integral_value(rounding or rounding_for(code)))
+
+
+def from_minor_units(amount: int, code: str) -> Decimal:
+    """Convert an integer count of minor units back into a Decimal"""
+    return Decimal(amount).scaleb(-minor_units(code))
+
+
+def format_amount(amount: float, code: str) -> str:
+    """Format an amount with thousands separators and the currency's decimals"""
+    return f"{amount:,.{minor_units(code)}f}"
+
+
+def scale_rate(rate: float) -> int:
+    """Convert a published rate into a scaled integer without binary float error"""
+    return int(Decimal(repr(rate)).scaleb(RATE_DIGITS).to_integral_value(ROUND_HALF_EVEN))
+
+
+def _divide(numerator: int, denominator: int, rounding: str) -> int:
+    """Integer division of numerator by a positive denominator with a decimal rounding mode"""
+    quotient, remainder = divmod(numerator, denominator)
+    if not remainder:
+        return quotient
+
+    # divmod floors, so quotient + 1 is the ceiling
+    if rounding == ROUND_FLOOR:
+        return quotient
+    if rounding == ROUND_CEILING:
+        return quotient + 1
+    if rounding == ROUND_DOWN:
+        return quotient + 1 if numerator < 0 else quotient
+    if rounding == ROUND_UP:
+        return quotient if numerator < 0 else quotient + 1
+
+    twice = 2 * remainder
+    if twice < denominator:
+        return quotient
+    if twice > denominator:
+        return quotient + 1
+    # Exactly half way
+    if rounding == ROUND_HALF_UP:
+        return quotient if numerator < 0 else quotient + 1
+    if rounding == ROUND_HALF_DOWN:
+        return quotient + 1 if numerator < 0 else quotient
+    return quotient + (quotient & 1)
+
+
+class FixedPointRates:
+    """
+    Exchange rates stored as scaled int64 values for exact conversion.
+
+    Amounts are handled in minor units (cents, yen, fils...). A conversion
+    multiplies by one integer factor and divides by another, both fixed per
+    currency pair, so a batch of amounts costs one integer multiply and one
+    rounded division per row.
+    """
+
+    def __init__(self, table: RateTable):
+        self._base = table.get_base()
+        self._timestamp = table.get_timestamp()
+        self._index = {code: i for i, code in enumerate(table.get_codes())}
+        self._rates = array('q', (scale_rate(rate) for rate in table.get_rates()))
+
+    def get_base(self) -> str:
+        return self._base
+
+    def get_timestamp(self):
+        return self._timestamp
+
+    def get_scaled_rate(self, code: str) -> Optional[int]:
+        """Rate of `code` against the base, scaled by RATE_SCALE"""
+        i = self._index.get(code)
+        return self._rates[i] if i is not None else None
+
+    def _pair_factors(self, from_code: str, to_code: str):
+        """Return (multiplier, divisor) converting minor units of from_code into to_code"""
+        from_rate = self.get_scaled_rate(from_code)
+        to_rate = self.get_scaled_rate(to_code)
+        if not from_rate or to_rate is None:
+            raise KeyError(f"Exchange rate not found for {from_code if not from_rate else to_code}")
+
+        shift = minor_units(to_code) - minor_units(from_code)
+        multiplier = to_rate * 10 ** max(shift, 0)
+        divisor = from_rate * 10 ** max(-shift, 0)
+        return multiplier, divisor
+
+    def convert_minor(self, from_code: str, to_code: str, amount: int,
+                      rounding: Optional[str] = None) -> int:
+        """Convert a single amount in minor units"""
+        multiplier, divisor = self._pair_factors(from_code, to_code)
+        return _divide(amount * multiplier, divisor, rounding or rounding_for(to_code))
+
+    def convert_minor_batch(self, from_code: str, to_code: str, amounts: Iterable[int],
+                            rounding: Optional[str] = None) -> array:
+        """Convert many minor-unit amounts of one pair into an int64 array"""
+        rounding = rounding or rounding_for(to_code)
+        if rounding not in SUPPORTED_ROUNDING:
+            raise ValueError(f"Unsupported rounding mode: {rounding}")
+        multiplier, divisor = self._pair_factors(from_code, to_code)
+
+        if rounding == ROUND_HALF_EVEN:
+            # Inlined _divide: round up past the midpoint, or on it when the quotient is odd
+            return array('q', [q + (2 * r > divisor or (2 * r == divisor and q & 1))
+                               for a in amounts for q, r in (divmod(a * multiplier, divisor),)])
+        if rounding == ROUND_FLOOR:
+            return array('q', [a * multiplier // divisor for a in amounts])
+        if rounding == ROUND_CEILING:
+            return array('q', [-(-a * multiplier // divisor) for a in amounts])
+        if rounding == ROUND_HALF_UP:
+            # Half away from zero, mirrored for negative amounts
+            twice = 2 * divisor
+            return array('q', [(2 * a * multiplier + divisor) // twice if a >= 0
+                               else -((-2 * a * multiplier + divisor) // twice)
+                               for a in amounts])
+        return array('q', [_divide(a * multiplier, divisor, rounding) for a in amounts])
+
+    def convert(self, from_code: str, to_code: str, amount: Union[Decimal, str, int],
+                rounding: Optional[str] = None) -> Decimal:
+        """Convert a decimal amount exactly, rounded to the target's minor units"""
+        minor = to_minor_units(amount, from_code)
+        return from_minor_units(self.convert_minor(from_code, to_code, minor, rounding), to_code)
+
+    def __repr__(self):
+        return f"FixedPointRates(base='{self._base}', currencies={len(self._rates)})"
@@ -0,0 +1,51 @@
+"""
+Rate change models published after each refresh
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class RateDelta:
+    """Change of a single currency's rate between two snapshots"""
+    code: str
+    old_rate: Optional[float]
+    new_rate: Optional[float]
+
+    @property
+    def percent_change(self) -> Optional[float]:
+        """Relative move in percent, or None for added/removed currencies"""
+        if not self.old_rate or self.new_rate is None:
+            return None
+        return (self.new_rate - self.old_rate) / self.old_rate * 100
+
+    def is_added(self) -> bool:
+        return self.old_rate is None
+
+    def is_removed(self) -> bool:
+        return self.new_rate is None
+
+
+@dataclass
+class RateChangeSet:
+    """All rate changes produced by one refresh"""
+    base: str
+    timestamp: object
+    previous_timestamp: object
+    deltas: List[RateDelta] = field(default_factory=list)
+
+    @property
+    def changed_codes(self) -> List[str]:
+        return [delta.code for delta in self.deltas]
+
+    def get(self, code: str) -> Optional[RateDelta]:
+        for delta in self.deltas:
+            if delta.code == code:
+                return delta
+        return None
+
+    def is_empty(self) -> bool:
+        return not self.deltas
+
+    def __len__(self):
+        return len(self.deltas)
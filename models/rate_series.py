@@ -0,0 +1,130 @@
+"""
+Time series of one currency pair with a min/max level-of-detail pyramid
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Tuple
+
+
+class _Level:
+    """One pyramid level: per bucket, the start time and the min and max points"""
+
+    __slots__ = ("starts", "min_t", "min_v", "max_t", "max_v")
+
+    def __init__(self):
+        self.starts = array('d')
+        self.min_t = array('d')
+        self.min_v = array('d')
+        self.max_t = array('d')
+        self.max_v = array('d')
+
+    def __len__(self):
+        return len(self.starts)
+
+
+class RateSeries:
+    """
+    Rates of one pair over time, ready to be drawn at any zoom level.
+
+    Points are kept in two flat arrays sorted by time. Level k of the
+    pyramid holds the minimum and maximum of every 2**k consecutive points,
+    each level built from the one below, so the whole pyramid costs about
+    as much as the series itself. A view of any time range then reads at
+    most two points per pixel column from the coarsest level that is still
+    fine enough: spikes survive, and panning or zooming costs a binary
+    search and a slice instead of a pass over every point.
+    """
+
+    def __init__(self, from_code: str, to_code: str, times=(), values=()):
+        self.from_code = from_code
+        self.to_code = to_code
+        self.times = times if isinstance(times, array) else array('d', times)
+        self.values = values if isinstance(values, array) else array('d', values)
+        if len(self.times) != len(self.values):
+            raise ValueError("times and values must have the same length")
+        self._levels: List[_Level] = []
+        self._build_levels()
+
+    def __len__(self):
+        return len(self.times)
+
+    def get_range(self) -> Optional[Tuple[float, float]]:
+        """First and last timestamps"""
+        return (self.times[0], self.times[-1]) if self.times else None
+
+    def value_range(self, start: float, end: float) -> Optional[Tuple[float, float]]:
+        """Lowest and highest value between two timestamps, from the pyramid"""
+        points = self.visible_points(start, end, 512)
+        if not points:
+            return None
+        values = [v for _, v in points]
+        return min(values), max(values)
+
+    def level_for(self, start: float, end: float, width: int) -> int:
+        """Coarsest level that still gives width / 2 or more buckets (two points each) over [start, end]"""
+        count = bisect_right(self.times, end) - bisect_left(self.times, start)
+        level = 0
+        while level + 1 < len(self._levels) and count >> (level + 1) >= max(width // 2, 1):
+            level += 1
+        return level
+
+    def visible_points(self, start: float, end: float, width: int) -> List[Tuple[float, float]]:
+        """
+        (time, value) points to draw [start, end] on `width` pixels, in time
+        order, including the nearest point outside each edge so lines reach
+        the border of the plot.
+        """
+        if not self.times or width <= 0:
+            return []
+
+        level = self.level_for(start, end, width)
+        if level == 0:
+            first = max(bisect_left(self.times, start) - 1, 0)
+            last = min(bisect_right(self.times, end) + 1, len(self.times))
+            return list(zip(self.times[first:last], self.values[first:last]))
+
+        buckets = self._levels[level]
+        first = max(bisect_right(buckets.starts, start) - 1, 0)
+        last = min(bisect_right(buckets.starts, end) + 1, len(buckets))
+        points = []
+        for i in range(first, last):
+            low = (buckets.min_t[i], buckets.min_v[i])
+            high = (buckets.max_t[i], buckets.max_v[i])
+            if low == high:
+                points.append(low)
+            elif low[0] <= high[0]:
+                points.extend((low, high))
+            else:
+                points.extend((high, low))
+        return points
+
+    def _build_levels(self):
+        """Level 1 pairs up the points, every further level pairs up the buckets below"""
+        if len(self.times) < 4:
+            return
+
+        self._levels = [None]  # Level 0 is the series itself
+        level = _Level()
+        times, values = self.times, self.values
+        for i in range(0, len(times), 2):
+            j = min(i + 1, len(times) - 1)
+            low, high = (i, j) if values[i] <= values[j] else (j, i)
+            level.starts.append(times[i])
+            level.min_t.append(times[low])
+            level.min_v.append(values[low])
+            level.max_t.append(times[high])
+            level.max_v.append(values[high])
+        self._levels.append(level)
+
+        while len(level) > 2:
+            below, level = level, _Level()
+            for i in range(0, len(below), 2):
+                j = min(i + 1, len(below) - 1)
+                low = i if below.min_v[i] <= below.min_v[j] else j
+                high = i if below.max_v[i] >= below.max_v[j] else j
+                level.starts.append(below.starts[i])
+                level.min_t.append(below.min_t[low])
+                level.min_v.append(below.min_v[low])
+                level.max_t.append(below.max_t[high])
+                level.max_v.append(below.max_v[high])
+            self._levels.append(level)
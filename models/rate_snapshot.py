@@ -0,0 +1,83 @@
+"""
+Immutable snapshot of the rates produced by one refresh
+"""
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, Mapping, Optional
+from .currency import ExchangeRate
+from .rate_table import RateTable
+from .money import FixedPointRates
+from .rate_delta import RateChangeSet
+
+
+class RateSnapshot:
+    """
+    The ExchangeRate objects, rate table and change set of one refresh.
+
+    A snapshot is fully built before it is published and never modified
+    afterwards, so a reader that grabs one reference gets rates that all
+    belong to the same refresh, without taking a lock. The only lazily
+    filled parts (rebased tables, fixed-point rates) are derived
+    deterministically, so racing readers at worst compute them twice.
+
+    Without `rates` (e.g. a table mapped from a snapshot file) the
+    ExchangeRate objects are only created if someone asks for them, with
+    names from `name_lookup`.
+    """
+
+    __slots__ = ("_rates", "_table", "_changes", "_fixed_point", "_name_lookup")
+
+    def __init__(self, rates: Optional[Dict[str, ExchangeRate]], table: RateTable,
+                 changes: Optional[RateChangeSet] = None,
+                 name_lookup: Optional[Callable[[str], str]] = None):
+        self._rates: Optional[Mapping[str, ExchangeRate]] = (
+            MappingProxyType(dict(rates)) if rates is not None else None)
+        self._table = table
+        self._changes = changes
+        self._fixed_point: Optional[FixedPointRates] = None
+        self._name_lookup = name_lookup
+
+    @property
+    def rates(self) -> Mapping[str, ExchangeRate]:
+        """Read-only mapping of code to ExchangeRate"""
+        rates = self._rates
+        if rates is None:
+            timestamp = self._table.get_timestamp()
+            name = self._name_lookup or (lambda code: code)
+            rates = MappingProxyType({code: ExchangeRate(code, name(code), rate, timestamp)
+                                      for code, rate in self._table.items()})
+            self._rates = rates
+        return rates
+
+    @property
+    def changes(self) -> Optional[RateChangeSet]:
+        """Changes relative to the previous snapshot"""
+        return self._changes
+
+    def get_timestamp(self):
+        return self._table.get_timestamp()
+
+    def get_by_code(self, code: str) -> Optional[ExchangeRate]:
+        return self.rates.get(code)
+
+    def get_table(self, base: Optional[str] = None) -> RateTable:
+        """The rate table, optionally rebased to another currency"""
+        if base is None:
+            return self._table
+        return self._table.rebase(base)
+
+    def get_fixed_point_rates(self) -> FixedPointRates:
+        """The rates as scaled integers, built on first use"""
+        fixed_point = self._fixed_point
+        if fixed_point is None:
+            fixed_point = FixedPointRates(self._table)
+            self._fixed_point = fixed_point
+        return fixed_point
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._table
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.get_codes())
+
+    def __len__(self) -> int:
+        return len(self._table)
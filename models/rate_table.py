@@ -0,0 +1,96 @@
+"""
+Rate table model holding a whole set of exchange rates against one base
+"""
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class RateTable:
+    """
+    Column-oriented view of exchange rates relative to a single base currency.
+
+    Rates are kept in a contiguous float64 array indexed by currency code, so
+    rebasing the whole table is a single pass over that array. Rebased tables
+    are cached per base, which makes repeated lookups in EUR or IDR terms free.
+    """
+
+    def __init__(self, base: str, codes: Iterable[str], rates: Iterable[float], timestamp=None):
+        self._base = base
+        self._codes: Tuple[str, ...] = tuple(codes)
+        self._rates = rates if isinstance(rates, array) else array('d', rates)
+        self._timestamp = timestamp
+        self._index: Dict[str, int] = {code: i for i, code in enumerate(self._codes)}
+        self._rebased: Dict[str, 'RateTable'] = {base: self}
+
+        if len(self._codes) != len(self._rates):
+            raise ValueError("codes and rates must have the same length")
+
+    @classmethod
+    def from_mapping(cls, base: str, rates: Dict[str, float], timestamp=None) -> 'RateTable':
+        """Create a table from a {code: rate} mapping"""
+        return cls(base, rates.keys(), (float(r) for r in rates.values()), timestamp)
+
+    def get_base(self) -> str:
+        return self._base
+
+    def get_timestamp(self):
+        return self._timestamp
+
+    def get_codes(self) -> Tuple[str, ...]:
+        return self._codes
+
+    def get_rates(self) -> array:
+        """Raw rate vector, aligned with get_codes()"""
+        return self._rates
+
+    def index_of(self, code: str) -> Optional[int]:
+        """Position of a currency in the rate vector"""
+        return self._index.get(code)
+
+    def get_rate(self, code: str) -> Optional[float]:
+        """Units of `code` per one unit of the base currency"""
+        i = self._index.get(code)
+        return self._rates[i] if i is not None else None
+
+    def cross_rate(self, from_code: str, to_code: str) -> Optional[float]:
+        """Units of `to_code` per one unit of `from_code`"""
+        i = self._index.get(from_code)
+        j = self._index.get(to_code)
+        if i is None or j is None or not self._rates[i]:
+            return None
+        return self._rates[j] / self._rates[i]
+
+    def rebase(self, base: str) -> Optional['RateTable']:
+        """
+        Return this table expressed relative to `base`.
+        Computed once per base and cached for the lifetime of the table.
+        """
+        cached = self._rebased.get(base)
+        if cached is not None:
+            return cached
+
+        i = self._index.get(base)
+        if i is None or not self._rates[i]:
+            return None
+
+        # Divide rather than multiply by the inverse: rate / rate is exactly 1.0
+        divisor = self._rates[i]
+        rebased = RateTable(base, self._codes, array('d', [r / divisor for r in self._rates]),
+                            self._timestamp)
+        # Share one cache between all views of the same snapshot
+        rebased._rebased = self._rebased
+        self._rebased[base] = rebased
+        return rebased
+
+    def items(self) -> List[Tuple[str, float]]:
+        """List of (code, rate) pairs"""
+        return list(zip(self._codes, self._rates))
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __contains__(self, code):
+        return code in self._index
+
+    def __repr__(self):
+        return f"RateTable(base='{self._base}', currencies={len(self._codes)})"
@@ -2,7 +2,10 @@
 Transaction model
 """
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional, Union
+from .money import from_minor_units
 
 @dataclass
 class Transaction:
@@ -13,10 +16,18 @@ class Transaction:
     result: float
     rate: float
     timestamp: datetime
+    result_minor: Optional[int] = None  # Exact result in minor units, set by exact conversions
+
+    @property
+    def exact_result(self) -> Union[Decimal, float]:
+        """The result as recorded: exact Decimal for exact conversions, else the float"""
+        if self.result_minor is None:
+            return self.result
+        return from_minor_units(self.result_minor, self.to_currency)
 
     def to_dict(self) -> dict:
         """Convert to dictionary for storage"""
-        return {
+        data = {
             "from_currency": self.from_currency,
             "to_currency": self.to_currency,
             "amount": self.amount,
@@ -24,6 +35,9 @@ class Transaction:
             "rate": self.rate,
             "timestamp": self.timestamp.isoformat()
         }
+        if self.result_minor is not None:
+            data["result_minor"] = self.result_minor
+        return data
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Transaction':
@@ -34,5 +48,62 @@ class Transaction:
             amount=data["amount"],
             result=data["result"],
             rate=data["rate"],
-            timestamp=datetime.fromisoformat(data["timestamp"])
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            result_minor=data.get("result_minor")
+        )
+
+
+@dataclass
+class DailyRollup:
+    """Aggregate of all transactions of one currency pair on one day"""
+    date: date
+    from_currency: str
+    to_currency: str
+    count: int = 0
+    total_amount: float = 0.0
+    total_result: float = 0.0
+    min_rate: float = 0.0
+    max_rate: float = 0.0
+
+    @property
+    def avg_rate(self) -> float:
+        """Volume-weighted average rate"""
+        return self.total_result / self.total_amount if self.total_amount else 0.0
+
+    def add(self, transaction: Transaction):
+        """Fold one transaction into the aggregate"""
+        if self.count:
+            self.min_rate = min(self.min_rate, transaction.rate)
+            self.max_rate = max(self.max_rate, transaction.rate)
+        else:
+            self.min_rate = self.max_rate = transaction.rate
+        self.count += 1
+        self.total_amount += transaction.amount
+        self.total_result += transaction.result
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for storage"""
+        return {
+            "date": self.date.isoformat(),
+            "from_currency": self.from_currency,
+            "to_currency": self.to_currency,
+            "count": self.count,
+            "total_amount": self.total_amount,
+            "total_result": self.total_result,
+            "min_rate": self.min_rate,
+            "max_rate": self.max_rate
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DailyRollup':
+        """Create from dictionary"""
+        return cls(
+            date=date.fromisoformat(data["date"]),
+            from_currency=data["from_currency"],
+            to_currency=data["to_currency"],
+            count=data["count"],
+            total_amount=data["total_amount"],
+            total_result=data["total_result"],
+            min_rate=data["min_rate"],
+            max_rate=data["max_rate"]
         )
@@ -4,5 +4,10 @@ Repositories package
 from .currency_repository import CurrencyRepository, ExchangeRateRepository
 from .history_repository import HistoryRepository
 from .settings_repository import SettingsRepository
+from .statistics_repository import StatisticsRepository
+from .alert_repository import AlertRepository
+from .historical_rate_repository import HistoricalRateRepository
+from .rate_log_repository import RateLogRepository
 
-__all__ = ['CurrencyRepository', 'ExchangeRateRepository', 'HistoryRepository', 'SettingsRepository']
\ No newline at end of file
+__all__ = ['CurrencyRepository', 'ExchangeRateRepository', 'HistoryRepository', 'SettingsRepository', 'StatisticsRepository',
+           'AlertRepository', 'HistoricalRateRepository', 'RateLogRepository']
\ No newline at end of file
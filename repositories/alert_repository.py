@@ -0,0 +1,67 @@
+"""
+Repository for persisting rate alerts
+"""
+import os
+from typing import Dict, List, Optional
+from models.alert import RateAlert
+from services import codec
+from services.memory_profiler import deep_sizeof
+
+class AlertRepository:
+    """Handles storage and retrieval of rate alerts"""
+
+    def __init__(self, storage_file: str = "alerts.json"):
+        self._storage_file = storage_file
+        self._alerts: Dict[str, RateAlert] = {}
+        self._load()
+
+    def add(self, alert: RateAlert):
+        """Add an alert and save"""
+        self._alerts[alert.alert_id] = alert
+        self._save()
+
+    def add_many(self, alerts: List[RateAlert]):
+        """Add several alerts with a single save"""
+        for alert in alerts:
+            self._alerts[alert.alert_id] = alert
+        self._save()
+
+    def remove(self, alert_id: str) -> Optional[RateAlert]:
+        """Remove an alert by id and save"""
+        alert = self._alerts.pop(alert_id, None)
+        if alert:
+            self._save()
+        return alert
+
+    def get_by_id(self, alert_id: str) -> Optional[RateAlert]:
+        return self._alerts.get(alert_id)
+
+    def get_all(self) -> List[RateAlert]:
+        """Get all alerts"""
+        return list(self._alerts.values())
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held, by component"""
+        return {"alerts": deep_sizeof(self._alerts)}
+
+    def _save(self):
+        """Save alerts to file"""
+        try:
+            with open(self._storage_file, 'wb') as f:
+                f.write(codec.dumps([a.to_dict() for a in self._alerts.values()], indent=True))
+        except Exception as e:
+            print(f"Error saving alerts: {e}")
+
+    def _load(self):
+        """Load alerts from file"""
+        if not os.path.exists(self._storage_file):
+            return
+
+        try:
+            with open(self._storage_file, 'rb') as f:
+                for item in codec.loads(f.read()):
+                    alert = RateAlert.from_dict(item)
+                    self._alerts[alert.alert_id] = alert
+        except Exception as e:
+            print(f"Error loading alerts: {e}")
+            self._alerts = {}
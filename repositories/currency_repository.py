@@ -1,29 +1,113 @@
 """
 Repository pattern for currency and exchange rate data management
 """
-from typing import Dict, List, Optional
-from models import Currency, ExchangeRate
-from services import APIService
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from models import (Currency, ExchangeRate, RateTable, FixedPointRates, RateDelta, RateChangeSet,
+                    RateSnapshot, write_rate_snapshot, open_rate_snapshot)
+from services import APIService, codec
+from services.memory_profiler import deep_sizeof
 
 
 class CurrencyRepository:
-    """Repository for managing Currency entities"""
+    """
+    Repository for managing Currency entities
     
-    def __init__(self, api_service: APIService):
+    The catalogue changes a few times a year, so it is cached on disk with
+    the time it was fetched and a hash of its content. Within CACHE_TTL the
+    cache is used as is; a background refresh asks the API at most once per
+    REFRESH_INTERVAL and only rebuilds Currency objects when the hash moved.
+    """
+    
+    CACHE_TTL = 30 * 24 * 3600      # Seconds before the cache must be refetched at startup
+    REFRESH_INTERVAL = 24 * 3600    # Minimum seconds between background refreshes
+    
+    def __init__(self, api_service: APIService, cache_file: str = "currencies_cache.json"):
         self._api_service = api_service
+        self._cache_file = cache_file
         self._currencies: Dict[str, Currency] = {}
+        self._version: Optional[str] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
     
     def load_all(self) -> bool:
-        """Load all currencies from API"""
-        data = self._api_service.fetch_currency_list()
-        if data:
-            self._currencies.clear()
-            for code, name in data.items():
-                currency = Currency(code, name)
-                self._currencies[code] = currency
+        """Load all currencies from the cache, or from the API when the cache is missing or expired"""
+        cached = self._load_cache()
+        if cached and time.time() - cached["fetched_at"] < self.CACHE_TTL:
+            self._apply(cached["currencies"], cached["hash"], cached["fetched_at"])
+            return True
+        
+        if self._fetch():
+            return True
+        if cached:
+            # The API is unreachable: an expired catalogue beats none
+            self._apply(cached["currencies"], cached["hash"], cached["fetched_at"])
             return True
         return False
     
+    def refresh_if_due(self) -> bool:
+        """
+        Refetch the catalogue if the last fetch is older than REFRESH_INTERVAL.
+        Returns True when the content changed.
+        """
+        if time.time() - self._fetched_at < self.REFRESH_INTERVAL:
+            return False
+        previous = self._version
+        return self._fetch() and self._version != previous
+    
+    def get_version(self) -> Optional[str]:
+        """Content hash of the current catalogue"""
+        return self._version
+    
+    def _fetch(self) -> bool:
+        """Fetch the catalogue, rebuilding it only if its content changed"""
+        data = self._api_service.fetch_currency_list()
+        if not data:
+            return False
+        digest = _content_hash(data)
+        now = time.time()
+        if digest == self._version:
+            self._fetched_at = now
+        else:
+            self._apply(data, digest, now)
+        self._save_cache(data, digest, now)
+        return True
+    
+    def _apply(self, data: Dict[str, str], digest: str, fetched_at: float):
+        """Build the Currency objects off to the side and swap them in"""
+        with self._lock:
+            if digest != self._version:
+                self._currencies = {code: Currency(code, name) for code, name in data.items()}
+                self._version = digest
+            self._fetched_at = fetched_at
+    
+    def _load_cache(self) -> Optional[Dict]:
+        """Read the cached catalogue, or None if missing or corrupt"""
+        if not os.path.exists(self._cache_file):
+            return None
+        try:
+            with open(self._cache_file, 'rb') as f:
+                cached = codec.loads(f.read())
+            if cached["hash"] != _content_hash(cached["currencies"]):
+                return None
+            return cached
+        except Exception as e:
+            print(f"Error loading currency cache: {e}")
+            return None
+    
+    def _save_cache(self, data: Dict[str, str], digest: str, fetched_at: float):
+        """Write the catalogue cache atomically"""
+        try:
+            tmp_path = self._cache_file + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(codec.dumps({"fetched_at": fetched_at, "hash": digest, "currencies": data}))
+            os.replace(tmp_path, self._cache_file)
+        except Exception as e:
+            print(f"Error saving currency cache: {e}")
+    
     def get_by_code(self, code: str) -> Optional[Currency]:
         """Get currency by code"""
         return self._currencies.get(code)
@@ -39,40 +123,182 @@ class CurrencyRepository:
     def exists(self, code: str) -> bool:
         """Check if currency exists"""
         return code in self._currencies
+    
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held, by component"""
+        return {"currencies": deep_sizeof(self._currencies)}
 
 
 class ExchangeRateRepository:
-    """Repository for managing ExchangeRate entities"""
+    """
+    Repository for managing ExchangeRate entities
+    
+    Each refresh is diffed against the previous rates. ExchangeRate objects
+    whose rate did not move are reused (so their last update is the time the
+    rate last changed), and the resulting RateChangeSet is published to
+    subscribers.
+    
+    All rates live in an immutable RateSnapshot that is built off to the
+    side and published with a single reference assignment. Readers never
+    lock; refreshes are serialized so subscribers see the snapshot their
+    change set belongs to.
     
-    def __init__(self, api_service: APIService, currency_repo: CurrencyRepository):
+    With a `snapshot_file`, every refresh is also written in the binary
+    snapshot format, which later starts (or other processes) can mmap
+    without parsing anything.
+    """
+    
+    def __init__(self, api_service: APIService, currency_repo: CurrencyRepository,
+                 snapshot_file: Optional[str] = None):
         self._api_service = api_service
         self._currency_repo = currency_repo
-        self._exchange_rates: Dict[str, ExchangeRate] = {}
+        self._snapshot_file = snapshot_file
+        self._file_table: Optional[RateTable] = None  # Table the snapshot file holds
+        self._snapshot: Optional[RateSnapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._subscribers: List[Callable[[RateChangeSet], None]] = []
+    
+    def subscribe(self, callback: Callable[[RateChangeSet], None]):
+        """Register a callback invoked with the RateChangeSet of every refresh that changed rates"""
+        self._subscribers.append(callback)
     
-    def refresh_all(self) -> bool:
-        """Refresh all exchange rates from API"""
+    def unsubscribe(self, callback: Callable[[RateChangeSet], None]):
+        """Remove a previously registered callback"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+    
+    def refresh_all(self, force: bool = False) -> bool:
+        """Refresh all exchange rates from API; `force` skips answers cached by the API service"""
+        if force:
+            self._api_service.clear_cache()
         data = self._api_service.fetch_latest()
-        if data and 'rates' in data:
-            self._exchange_rates.clear()
+        if not data or 'rates' not in data:
+            return False
+        
+        with self._refresh_lock:
             timestamp = data.get('timestamp', 'Unknown')
+            current = self._snapshot
+            previous = current.rates if current else {}
+            previous_timestamp = current.get_timestamp() if current else None
+            exchange_rates: Dict[str, ExchangeRate] = {}
+            deltas: List[RateDelta] = []
             
             for code, rate in data['rates'].items():
+                old = previous.get(code)
+                if old is not None and old.get_rate() == rate:
+                    exchange_rates[code] = old
+                    continue
+                
                 currency = self._currency_repo.get_by_code(code)
                 name = currency.get_name() if currency else code
-                
-                exchange_rate = ExchangeRate(code, name, rate, timestamp)
-                self._exchange_rates[code] = exchange_rate
-            return True
-        return False
+                exchange_rates[code] = ExchangeRate(code, name, rate, timestamp)
+                deltas.append(RateDelta(code, old.get_rate() if old else None, rate))
+            
+            for code, old in previous.items():
+                if code not in exchange_rates:
+                    deltas.append(RateDelta(code, old.get_rate(), None))
+            
+            table = RateTable.from_mapping(data.get('base', 'USD'), data['rates'], timestamp)
+            changes = RateChangeSet(table.get_base(), timestamp, previous_timestamp, deltas)
+            
+            # Publish: one reference swap, readers see either the old or the new snapshot
+            self._snapshot = RateSnapshot(exchange_rates, table, changes)
+            if deltas:
+                self._write_snapshot_file(table)
+                self._publish(changes)
+            elif current is not None and current.get_table() is self._file_table:
+                self._file_table = table
+        return True
+    
+    def load_snapshot_file(self) -> bool:
+        """
+        Use the rates of the snapshot file until the first refresh.
+        Mapping the file is O(1); ExchangeRate objects are only built on demand.
+        """
+        if not self._snapshot_file or not os.path.exists(self._snapshot_file):
+            return False
+        try:
+            table = open_rate_snapshot(self._snapshot_file)
+        except Exception as e:
+            print(f"Error loading rate snapshot: {e}")
+            return False
+        
+        with self._refresh_lock:
+            if self._snapshot is None:
+                self._snapshot = RateSnapshot(None, table, None, self._currency_name)
+                self._file_table = table
+        return True
+    
+    def get_snapshot_file(self) -> Optional[str]:
+        """Path of a snapshot file holding exactly the current rates, if any"""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.get_table() is self._file_table:
+            return self._snapshot_file
+        return None
+    
+    def _write_snapshot_file(self, table: RateTable):
+        if not self._snapshot_file:
+            return
+        try:
+            write_rate_snapshot(self._snapshot_file, table)
+            self._file_table = table
+        except Exception as e:
+            print(f"Error saving rate snapshot: {e}")
+    
+    def _currency_name(self, code: str) -> str:
+        currency = self._currency_repo.get_by_code(code)
+        return currency.get_name() if currency else code
+    
+    def get_snapshot(self) -> Optional[RateSnapshot]:
+        """Get the current rates; read it once and use it for a whole operation"""
+        return self._snapshot
+    
+    def get_last_changes(self) -> Optional[RateChangeSet]:
+        """Get the changes produced by the most recent refresh"""
+        snapshot = self._snapshot
+        return snapshot.changes if snapshot else None
+    
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held, by component"""
+        return {"snapshot": deep_sizeof(self._snapshot)}
+    
+    def _publish(self, changes: RateChangeSet):
+        """Notify subscribers; a failing subscriber does not stop the others"""
+        for callback in list(self._subscribers):
+            try:
+                callback(changes)
+            except Exception as e:
+                print(f"Error in rate change subscriber: {e}")
     
     def get_by_code(self, code: str) -> Optional[ExchangeRate]:
         """Get exchange rate by code"""
-        return self._exchange_rates.get(code)
+        snapshot = self._snapshot
+        return snapshot.get_by_code(code) if snapshot else None
     
     def get_all(self) -> Dict[str, ExchangeRate]:
         """Get all exchange rates"""
-        return self._exchange_rates.copy()
+        snapshot = self._snapshot
+        return dict(snapshot.rates) if snapshot else {}
     
     def exists(self, code: str) -> bool:
         """Check if exchange rate exists"""
-        return code in self._exchange_rates
+        snapshot = self._snapshot
+        return snapshot is not None and code in snapshot
+    
+    def get_table(self, base: Optional[str] = None) -> Optional[RateTable]:
+        """
+        Get the whole rate table, optionally rebased to another currency.
+        Rebased tables are cached until the next refresh.
+        """
+        snapshot = self._snapshot
+        return snapshot.get_table(base) if snapshot else None
+    
+    def get_fixed_point_rates(self) -> Optional[FixedPointRates]:
+        """Get the current rates as scaled integers, built once per refresh"""
+        snapshot = self._snapshot
+        return snapshot.get_fixed_point_rates() if snapshot else None
+
+
+def _content_hash(currencies: Dict[str, str]) -> str:
+    """Order-independent hash of a {code: name} catalogue"""
+    return hashlib.sha256(codec.dumps(sorted(currencies.items()))).hexdigest()
@@ -0,0 +1,125 @@
+"""
+Repository for end-of-day historical exchange rates
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, Iterable, Optional
+from models import RateTable
+from services import APIService, codec, utc_today
+from services.memory_profiler import deep_sizeof
+
+
+class HistoricalRateRepository:
+    """
+    Rate tables for past dates, fetched through APIService.fetch_history.
+
+    Each day is fetched at most once: tables are kept in a small in-memory
+    LRU and, for days that are over, written to a cache directory since
+    their rates no longer change. Missing days are fetched with as many
+    threads as the APIService has room for concurrent requests, so none of
+    them waits on its worker pool.
+    """
+
+    def __init__(self, api_service: APIService, cache_dir: str = "historical_rates",
+                 max_cached: int = 64):
+        self._api_service = api_service
+        self._cache_dir = cache_dir
+        self._max_cached = max_cached
+        self._tables: "OrderedDict[date, RateTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_table(self, day: date) -> Optional[RateTable]:
+        """Rates at the end of `day`, or None when no provider has them"""
+        return self.get_tables([day]).get(day)
+
+    def get_tables(self, days: Iterable[date], fetch: bool = True) -> Dict[date, RateTable]:
+        """
+        Rate tables for several days. Days missing from both caches are
+        fetched concurrently, unless `fetch` is False; days that could not
+        be found are left out.
+        """
+        tables: Dict[date, RateTable] = {}
+        missing = []
+        with self._lock:
+            for day in set(days):
+                table = self._tables.get(day)
+                if table is not None:
+                    self._tables.move_to_end(day)
+                    tables[day] = table
+                else:
+                    missing.append(day)
+
+        if missing:
+            workers = min(self._api_service.max_concurrent, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for day, table in zip(missing, executor.map(lambda day: self._load(day, fetch), missing)):
+                    if table is not None:
+                        tables[day] = table
+
+            with self._lock:
+                for day in missing:
+                    if day in tables:
+                        self._tables[day] = tables[day]
+                while len(self._tables) > self._max_cached:
+                    self._tables.popitem(last=False)
+        return tables
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held, by component"""
+        with self._lock:
+            return {"tables": deep_sizeof(self._tables)}
+
+    def has_day(self, day: date) -> bool:
+        """Whether `day` is in the disk cache"""
+        return os.path.exists(self._path(day))
+
+    def store(self, day: date, data: Dict) -> bool:
+        """
+        Add a fetched day in the OpenExchangeRates layout to the disk cache.
+        Returns whether the day is now cached; the UTC day still in progress is never cached.
+        """
+        if day >= utc_today():
+            return False
+        return self._save(self._path(day), data)
+
+    def _path(self, day: date) -> str:
+        return os.path.join(self._cache_dir, f"{day.isoformat()}.json")
+
+    def _load(self, day: date, fetch: bool = True) -> Optional[RateTable]:
+        """Read a day from the disk cache, or fetch it and cache it"""
+        path = self._path(day)
+        data = None
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    data = codec.loads(f.read())
+            except Exception as e:
+                print(f"Error loading historical rates for {day}: {e}")
+
+        if data is None:
+            if not fetch:
+                return None
+            data = self._api_service.fetch_history(day.isoformat())
+            if not data or 'rates' not in data:
+                return None
+            self.store(day, data)
+
+        return RateTable.from_mapping(data.get('base', 'USD'), data['rates'], data.get('timestamp'))
+
+    def _save(self, path: str, data: Dict) -> bool:
+        """Write a finished day to the disk cache; returns whether it was written"""
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(codec.dumps({"base": data.get('base', 'USD'),
+                                     "timestamp": data.get('timestamp'),
+                                     "rates": data['rates']}))
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            print(f"Error saving historical rates: {e}")
+            return False
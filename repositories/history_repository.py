@@ -1,51 +1,373 @@
 """
 Repository for managing transaction history
 """
-import json
 import os
-from typing import List
-from models.transaction import Transaction
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from models.transaction import Transaction, DailyRollup
+from services import codec
+from services.memory_profiler import deep_sizeof
+from .statistics_repository import StatisticsRepository
 
 class HistoryRepository:
-    """Handles storage and retrieval of transaction history"""
-    
-    def __init__(self, storage_file: str = "history.json"):
+    """
+    Handles storage and retrieval of transaction history.
+
+    Transactions are appended to a JSON Lines file, oldest first. A sidecar
+    index holds the byte offset of every line, so opening the history does
+    not parse anything and any page can be read with a single seek. Parsed
+    pages are kept in a small LRU cache.
+
+    Old transactions can be compacted into per-day, per-pair rollups. The
+    compacted lines are skipped by moving a head pointer, and the dead prefix
+    of the file is only rewritten once it makes up most of the file. The
+    head is saved with the rollups as a line count, so a restart resumes at
+    the same line whatever the timestamps of the transactions.
+    """
+
+    PAGE_SIZE = 200
+    CACHED_PAGES = 8
+
+    def __init__(self, storage_file: str = "history.jsonl", legacy_file: Optional[str] = "history.json",
+                 rollup_file: str = "history_rollups.json",
+                 statistics_repo: Optional[StatisticsRepository] = None):
         self._storage_file = storage_file
-        self._transactions: List[Transaction] = []
+        self._index_file = storage_file + ".idx"
+        self._rollup_file = rollup_file
+        self._statistics_repo = statistics_repo
+        self._lock = threading.RLock()
+        self._offsets = array('q')  # Start offset of every line
+        self._size = 0              # Bytes of storage_file covered by the index
+        self._pages: "OrderedDict[int, List[Transaction]]" = OrderedDict()
+        self._head = 0              # First line not yet compacted into rollups
+        self._line_base = 0         # Lines removed from the front of the file so far
+        self._rollups: Dict[Tuple, DailyRollup] = {}
+
+        if legacy_file and os.path.exists(legacy_file) and not os.path.exists(storage_file):
+            self._migrate(legacy_file)
         self._load()
-    
+        self._load_rollups()
+        if statistics_repo is not None and statistics_repo.is_empty():
+            self._rebuild_statistics()
+
     def add(self, transaction: Transaction):
-        """Add a new transaction and save"""
-        self._transactions.insert(0, transaction) # Add to beginning (newest first)
-        self._save()
-    
+        """Append a new transaction"""
+        line = codec.dumps(transaction.to_dict()) + b"\n"
+        with self._lock:
+            try:
+                with open(self._storage_file, 'ab') as f:
+                    f.write(line)
+            except Exception as e:
+                print(f"Error saving history: {e}")
+                return
+
+            number = len(self._offsets)
+            self._offsets.append(self._size)
+            self._size += len(line)
+            self._save_index(number)
+
+            page = self._pages.get(number // self.PAGE_SIZE)
+            if page is not None and len(page) == number % self.PAGE_SIZE:
+                page.append(transaction)
+
+        if self._statistics_repo is not None:
+            self._statistics_repo.record(transaction)
+
+    def count(self) -> int:
+        """Number of stored (not rolled up) transactions"""
+        return len(self._offsets) - self._head
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held, by component. Transactions on disk are not counted."""
+        with self._lock:
+            return {
+                "line_index": deep_sizeof(self._offsets),
+                "page_cache": deep_sizeof(self._pages),
+                "rollups": deep_sizeof(self._rollups)
+            }
+
+    def get_page(self, page: int, page_size: int = PAGE_SIZE) -> List[Transaction]:
+        """Get one page of transactions, newest first. Page 0 holds the latest ones."""
+        return self.get_range(page * page_size, (page + 1) * page_size)
+
+    def get_range(self, start: int, stop: int) -> List[Transaction]:
+        """Get transactions by position, newest first (position 0 is the latest)"""
+        with self._lock:
+            total = len(self._offsets)
+            first = max(total - stop, self._head)
+            last = max(total - start, self._head)
+            transactions = self._read_lines(first, last)
+        transactions.reverse()
+        return transactions
+
     def get_all(self) -> List[Transaction]:
-        """Get all transactions"""
-        return self._transactions
-    
+        """Get all transactions, newest first. Parses the whole history."""
+        return self.get_range(0, self.count())
+
+    def iter_chunks(self, chunk_size: int = 10000) -> Iterator[List[Transaction]]:
+        """
+        Iterate over transactions oldest first, in lists of at most chunk_size.
+        Transactions added while iterating are not included.
+        """
+        with self._lock:
+            # Track positions as absolute line numbers, which survive reclaiming
+            position = self._head + self._line_base
+            total = len(self._offsets) + self._line_base
+        while position < total:
+            with self._lock:
+                first = max(position - self._line_base, self._head)
+                last = min(position + chunk_size, total) - self._line_base
+                chunk = self._parse(first, last)
+            position += chunk_size
+            yield chunk
+
+    def get_rollups(self) -> List[DailyRollup]:
+        """Get daily rollups of compacted transactions, newest first"""
+        with self._lock:
+            rollups = list(self._rollups.values())
+        rollups.sort(key=lambda r: (r.date, r.from_currency, r.to_currency), reverse=True)
+        return rollups
+
+    def compact(self, cutoff: datetime, batch_size: int = 10000) -> int:
+        """
+        Fold up to batch_size of the oldest transactions recorded before
+        `cutoff` into daily rollups. Returns the number compacted; call
+        repeatedly until it returns 0.
+        """
+        with self._lock:
+            batch = self._parse(self._head, min(self._head + batch_size, len(self._offsets)))
+            compacted = 0
+            for transaction in batch:
+                if transaction.timestamp >= cutoff:
+                    break
+                compacted += 1
+                key = (transaction.timestamp.date(), transaction.from_currency, transaction.to_currency)
+                rollup = self._rollups.get(key)
+                if rollup is None:
+                    rollup = self._rollups[key] = DailyRollup(*key)
+                rollup.add(transaction)
+
+            if not compacted:
+                return 0
+            self._head += compacted
+            # The rollups and the head they account for are saved together
+            self._save_rollups()
+
+            # Reclaim the dead prefix once it dominates the file
+            if self._head >= len(self._offsets) // 2:
+                self._reclaim()
+            return compacted
+
     def clear(self):
-        """Clear all history"""
-        self._transactions = []
-        self._save()
-    
-    def _save(self):
-        """Save transactions to file"""
-        try:
-            data = [t.to_dict() for t in self._transactions]
-            with open(self._storage_file, 'w') as f:
-                json.dump(data, f, indent=2)
+        """Clear all history, including rollups"""
+        with self._lock:
+            self._line_base += len(self._offsets)
+            self._offsets = array('q')
+            self._size = 0
+            self._head = 0
+            self._pages.clear()
+            self._rollups = {}
+            try:
+                open(self._storage_file, 'wb').close()
+                self._save_index()
+                self._save_rollups()
+            except Exception as e:
+                print(f"Error saving history: {e}")
+
+        if self._statistics_repo is not None:
+            self._statistics_repo.clear()
+
+    def _rebuild_statistics(self):
+        """Fill an empty statistics repository from existing history (one-off scan)"""
+        if not self.count() and not self._rollups:
+            return
+        for rollup in self._rollups.values():
+            self._statistics_repo.record_rollup(rollup)
+        for chunk in self.iter_chunks():
+            for transaction in chunk:
+                self._statistics_repo.record(transaction)
+        self._statistics_repo.flush()
+
+    def _reclaim(self):
+        """Rewrite the storage file without the compacted prefix"""
+        begin = self._offsets[self._head] if self._head < len(self._offsets) else self._size
+        temp_file = self._storage_file + ".tmp"
+        try:
+            with open(self._storage_file, 'rb') as src, open(temp_file, 'wb') as dst:
+                src.seek(begin)
+                for block in iter(lambda: src.read(1 << 20), b''):
+                    dst.write(block)
+            # If we stop between here and the next save, the file size tells which file is on disk
+            self._save_rollups(reclaiming={"lines": self._head, "size": self._size - begin})
+            os.replace(temp_file, self._storage_file)
         except Exception as e:
-            print(f"Error saving history: {e}")
-    
+            print(f"Error compacting history: {e}")
+            self._save_rollups()
+            return
+
+        self._offsets = array('q', (offset - begin for offset in self._offsets[self._head:]))
+        self._size -= begin
+        self._line_base += self._head
+        self._head = 0
+        self._pages.clear()
+        self._save_rollups()
+        self._save_index()
+
+    def _read_lines(self, first: int, last: int) -> List[Transaction]:
+        """Read lines [first, last) through the page cache"""
+        result: List[Transaction] = []
+        line = first
+        while line < last:
+            number = line // self.PAGE_SIZE
+            page_start = number * self.PAGE_SIZE
+            page = self._pages.get(number)
+            if page is None:
+                page = self._parse(page_start, min(page_start + self.PAGE_SIZE, len(self._offsets)))
+                self._pages[number] = page
+                if len(self._pages) > self.CACHED_PAGES:
+                    self._pages.popitem(last=False)
+            else:
+                self._pages.move_to_end(number)
+            end = min(last, page_start + len(page))
+            result.extend(page[line - page_start:end - page_start])
+            if end <= line:
+                break
+            line = end
+        return result
+
+    def _parse(self, first: int, last: int) -> List[Transaction]:
+        """Parse lines [first, last) straight from the storage file"""
+        if first >= last:
+            return []
+        begin = self._offsets[first]
+        end = self._offsets[last] if last < len(self._offsets) else self._size
+        try:
+            with open(self._storage_file, 'rb') as f:
+                f.seek(begin)
+                data = f.read(end - begin)
+            return codec.decode_transactions(data.splitlines())
+        except Exception as e:
+            print(f"Error loading history: {e}")
+            return []
+
+    def _save_index(self, from_line: Optional[int] = None):
+        """
+        Persist the offset index. The first 8 bytes hold the covered file size,
+        followed by one int64 offset per line. With from_line only the new tail
+        is written.
+        """
+        try:
+            if from_line is None or not os.path.exists(self._index_file):
+                with open(self._index_file, 'wb') as f:
+                    array('q', [self._size]).tofile(f)
+                    self._offsets.tofile(f)
+                return
+            with open(self._index_file, 'r+b') as f:
+                array('q', [self._size]).tofile(f)
+                f.seek(8 * (from_line + 1))
+                self._offsets[from_line:].tofile(f)
+        except Exception as e:
+            print(f"Error saving history index: {e}")
+
     def _load(self):
-        """Load transactions from file"""
+        """Open the offset index, rebuilding or extending it from the storage file if stale"""
         if not os.path.exists(self._storage_file):
             return
-            
+
+        file_size = os.path.getsize(self._storage_file)
         try:
-            with open(self._storage_file, 'r') as f:
-                data = json.load(f)
-                self._transactions = [Transaction.from_dict(item) for item in data]
+            index = array('q')
+            with open(self._index_file, 'rb') as f:
+                index.frombytes(f.read())
+            covered = index[0]
+            offsets = index[1:]
+        except Exception:
+            covered, offsets = 0, array('q')
+
+        if covered > file_size:
+            covered, offsets = 0, array('q')
+
+        self._offsets = offsets
+        self._size = covered
+        if covered < file_size:
+            self._scan(covered)
+            if self._size < file_size:
+                # Drop a trailing partial line left by an interrupted write
+                with open(self._storage_file, 'r+b') as f:
+                    f.truncate(self._size)
+            self._save_index()
+
+    def _scan(self, position: int):
+        """Index lines from `position` to the end of the storage file"""
+        try:
+            with open(self._storage_file, 'rb') as f:
+                f.seek(position)
+                start = position
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    i = block.find(b'\n')
+                    while i != -1:
+                        self._offsets.append(start)
+                        start = position + i + 1
+                        i = block.find(b'\n', i + 1)
+                    position += len(block)
+            self._size = start
         except Exception as e:
-            print(f"Error loading history: {e}")
-            self._transactions = []
+            print(f"Error indexing history: {e}")
+
+    def _save_rollups(self, reclaiming: Optional[Dict] = None):
+        """
+        Save rollups atomically, together with the number of lines at the
+        start of the storage file they account for. `reclaiming` describes a
+        rewrite of the file about to replace it: the lines it drops and its size.
+        """
+        data = {
+            "compacted_lines": self._head,
+            "reclaiming": reclaiming,
+            "rollups": [r.to_dict() for r in self._rollups.values()]
+        }
+        temp_file = self._rollup_file + ".tmp"
+        try:
+            with open(temp_file, 'wb') as f:
+                f.write(codec.dumps(data))
+            os.replace(temp_file, self._rollup_file)
+        except Exception as e:
+            print(f"Error saving history rollups: {e}")
+
+    def _load_rollups(self):
+        """Load rollups and skip raw lines that were already compacted"""
+        if not os.path.exists(self._rollup_file):
+            return
+
+        try:
+            with open(self._rollup_file, 'rb') as f:
+                data = codec.loads(f.read())
+            for item in data["rollups"]:
+                rollup = DailyRollup.from_dict(item)
+                self._rollups[(rollup.date, rollup.from_currency, rollup.to_currency)] = rollup
+        except Exception as e:
+            print(f"Error loading history rollups: {e}")
+            return
+
+        head = data.get("compacted_lines", 0)
+        reclaiming = data.get("reclaiming")
+        if reclaiming and os.path.exists(self._storage_file) \
+                and os.path.getsize(self._storage_file) == reclaiming["size"]:
+            # Stopped after the rewritten file replaced the old one
+            head -= reclaiming["lines"]
+        self._head = min(max(head, 0), len(self._offsets))
+        if reclaiming:
+            self._save_rollups()
+
+    def _migrate(self, legacy_file: str):
+        """Convert a legacy JSON array history (newest first) into JSON Lines"""
+        try:
+            with open(legacy_file, 'rb') as f:
+                data = codec.loads(f.read())
+            with open(self._storage_file, 'wb') as f:
+                for item in reversed(data):
+                    f.write(codec.dumps(item) + b"\n")
+        except Exception as e:
+            print(f"Error migrating history: {e}")
@@ -0,0 +1,294 @@
+"""
+Repository keeping every refreshed rate snapshot for point-in-time lookups
+"""
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+from models import RateTable
+from services import codec
+from services.memory_profiler import deep_sizeof
+
+# One index record per snapshot: provider timestamp and line offset
+_INDEX_RECORD = struct.Struct("<dq")
+
+
+class RateLogRepository:
+    """
+    Log of rate snapshots, ordered by provider timestamp.
+
+    Every snapshot is appended to a JSON Lines file. Only the timestamp and
+    file offset of each one are held for the whole log (two flat arrays,
+    16 bytes per snapshot), so the snapshot live at any time is a binary
+    search away. Parsed tables for the most recently used snapshots are kept
+    in a bounded ring; older ones are read back from disk on demand.
+
+    The timeline is persisted in a sidecar index next to the log, so a start
+    reads 16 bytes per snapshot instead of scanning the log. Snapshots older
+    than `retention_days` (0 keeps everything) before the newest one are
+    dropped by rewriting the log, once they exceed the retention by
+    PRUNE_SLACK, so the rewrite happens rarely rather than on every refresh.
+    """
+
+    PRUNE_SLACK = 0.1
+
+    def __init__(self, storage_file: str = "rate_log.jsonl", capacity: int = 96,
+                 retention_days: float = 0):
+        self._storage_file = storage_file
+        self._index_file = storage_file + ".idx"
+        self._capacity = capacity
+        self._retention = retention_days * 86400
+        self._lock = threading.RLock()
+        self._times = array('d')    # Provider timestamp of every snapshot, ascending
+        self._offsets = array('q')  # Start offset of every snapshot line
+        self._size = 0
+        self._tables: "OrderedDict[int, RateTable]" = OrderedDict()
+        self._load()
+        self._prune()
+
+    def record(self, table: RateTable) -> bool:
+        """
+        Log a snapshot. Snapshots without a numeric timestamp, or not newer
+        than the last one logged, are ignored.
+        """
+        timestamp = table.get_timestamp()
+        if not isinstance(timestamp, (int, float)):
+            return False
+
+        with self._lock:
+            if self._times and timestamp <= self._times[-1]:
+                return False
+            line = codec.dumps({"timestamp": timestamp, "base": table.get_base(),
+                                "rates": dict(table.items())}) + b"\n"
+            try:
+                with open(self._storage_file, 'ab') as f:
+                    f.write(line)
+            except Exception as e:
+                print(f"Error saving rate log: {e}")
+                return False
+
+            position = len(self._times)
+            self._times.append(timestamp)
+            self._offsets.append(self._size)
+            self._size += len(line)
+            self._save_index(position)
+            self._remember(position, table)
+            if self._retention and self._times[0] < timestamp - self._retention * (1 + self.PRUNE_SLACK):
+                self._prune()
+            return True
+
+    def count(self) -> int:
+        return len(self._times)
+
+    def get_table_at(self, when: Union[datetime, float]) -> Optional[RateTable]:
+        """The snapshot that was live at `when`, or None before the first one"""
+        with self._lock:
+            position = bisect_right(self._times, _to_timestamp(when)) - 1
+            return self._table(position) if position >= 0 else None
+
+    def get_rate_at(self, from_code: str, to_code: str, when: Union[datetime, float],
+                    interpolate: bool = False) -> Optional[float]:
+        """
+        Units of `to_code` per `from_code` at `when`.
+        By default the rate of the snapshot live at that moment; with
+        `interpolate`, linear in time between it and the next snapshot.
+        """
+        timestamp = _to_timestamp(when)
+        with self._lock:
+            position = bisect_right(self._times, timestamp) - 1
+            if position < 0:
+                return None
+            table = self._table(position)
+            rate = table.cross_rate(from_code, to_code) if table else None
+            if not interpolate or rate is None or position + 1 >= len(self._times):
+                return rate
+
+            next_table = self._table(position + 1)
+            next_rate = next_table.cross_rate(from_code, to_code) if next_table else None
+            if next_rate is None:
+                return rate
+            start, end = self._times[position], self._times[position + 1]
+            return rate + (next_rate - rate) * (timestamp - start) / (end - start)
+
+    def get_series(self, from_code: str, to_code: str, start: float, end: float) -> List[Tuple[float, float]]:
+        """(timestamp, rate) of every logged snapshot between start and end"""
+        with self._lock:
+            first = bisect_left(self._times, start)
+            last = bisect_right(self._times, end)
+            points = []
+            for position in range(first, last):
+                table = self._table(position)
+                rate = table.cross_rate(from_code, to_code) if table else None
+                if rate is not None:
+                    points.append((self._times[position], rate))
+            return points
+
+    def get_range(self) -> Optional[Tuple[float, float]]:
+        """Timestamps of the first and last logged snapshots"""
+        with self._lock:
+            return (self._times[0], self._times[-1]) if self._times else None
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held, by component"""
+        with self._lock:
+            return {
+                "timeline": deep_sizeof(self._times) + deep_sizeof(self._offsets),
+                "table_ring": deep_sizeof(self._tables)
+            }
+
+    def _remember(self, position: int, table: RateTable):
+        self._tables[position] = table
+        self._tables.move_to_end(position)
+        while len(self._tables) > self._capacity:
+            self._tables.popitem(last=False)
+
+    def _table(self, position: int) -> Optional[RateTable]:
+        """Parsed snapshot at `position`, from the ring or the log file"""
+        table = self._tables.get(position)
+        if table is not None:
+            self._tables.move_to_end(position)
+            return table
+
+        try:
+            with open(self._storage_file, 'rb') as f:
+                f.seek(self._offsets[position])
+                data = codec.loads(f.readline())
+        except Exception as e:
+            print(f"Error reading rate log: {e}")
+            return None
+        table = RateTable.from_mapping(data["base"], data["rates"], data["timestamp"])
+        self._remember(position, table)
+        return table
+
+    def _prune(self):
+        """Rewrite the log without the snapshots older than the retention period"""
+        if not self._retention or not self._times:
+            return
+        first = bisect_left(self._times, self._times[-1] - self._retention)
+        if first == 0:
+            return
+
+        begin = self._offsets[first]
+        temp_file = self._storage_file + ".tmp"
+        try:
+            with open(self._storage_file, 'rb') as src, open(temp_file, 'wb') as dst:
+                src.seek(begin)
+                for block in iter(lambda: src.read(1 << 20), b''):
+                    dst.write(block)
+            os.replace(temp_file, self._storage_file)
+        except Exception as e:
+            print(f"Error pruning rate log: {e}")
+            return
+
+        self._times = self._times[first:]
+        self._offsets = array('q', (offset - begin for offset in self._offsets[first:]))
+        self._size -= begin
+        self._tables = OrderedDict((position - first, table) for position, table in self._tables.items()
+                                   if position >= first)
+        self._save_index()
+
+    def _save_index(self, from_position: Optional[int] = None):
+        """
+        Persist the timeline. The first 8 bytes hold the covered log size,
+        followed by one (timestamp, offset) record per snapshot. With
+        from_position only the new tail is written.
+        """
+        if from_position is not None and not os.path.exists(self._index_file):
+            from_position = None
+        first = from_position or 0
+        records = b"".join(_INDEX_RECORD.pack(self._times[i], self._offsets[i])
+                           for i in range(first, len(self._times)))
+        try:
+            with open(self._index_file, 'wb' if from_position is None else 'r+b') as f:
+                array('q', [self._size]).tofile(f)
+                f.seek(8 + _INDEX_RECORD.size * first)
+                f.write(records)
+        except Exception as e:
+            print(f"Error saving rate log index: {e}")
+
+    def _load(self):
+        """Open the timeline index, rebuilding or extending it from the log if stale"""
+        if not os.path.exists(self._storage_file):
+            return
+
+        file_size = os.path.getsize(self._storage_file)
+        covered = 0
+        try:
+            with open(self._index_file, 'rb') as f:
+                data = f.read()
+            count = (len(data) - 8) // _INDEX_RECORD.size
+            covered = array('q', data[:8])[0]
+            for timestamp, offset in _INDEX_RECORD.iter_unpack(data[8:8 + count * _INDEX_RECORD.size]):
+                self._times.append(timestamp)
+                self._offsets.append(offset)
+        except Exception:
+            covered = 0
+
+        if covered > file_size or not self._index_matches(covered):
+            covered = 0
+            self._times, self._offsets = array('d'), array('q')
+
+        self._size = covered
+        if covered < file_size:
+            self._scan(covered)
+            if self._size < file_size:
+                # Drop a trailing partial line left by an interrupted write
+                try:
+                    with open(self._storage_file, 'r+b') as f:
+                        f.truncate(self._size)
+                except Exception as e:
+                    print(f"Error loading rate log: {e}")
+            self._save_index()
+
+    def _index_matches(self, covered: int) -> bool:
+        """Whether the last indexed snapshot is where the index says, e.g. after a rewrite"""
+        if not self._times:
+            return covered == 0
+        try:
+            with open(self._storage_file, 'rb') as f:
+                f.seek(self._offsets[-1])
+                line = f.readline()
+        except Exception:
+            return False
+        return (self._offsets[-1] + len(line) == covered
+                and _line_timestamp(line) == self._times[-1])
+
+    def _scan(self, position: int):
+        """Index the snapshots from `position` to the end of the log"""
+        try:
+            with open(self._storage_file, 'rb') as f:
+                f.seek(position)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    timestamp = _line_timestamp(line)
+                    if timestamp is not None and (not self._times or timestamp > self._times[-1]):
+                        self._times.append(timestamp)
+                        self._offsets.append(position)
+                    position += len(line)
+            self._size = position
+        except Exception as e:
+            print(f"Error loading rate log: {e}")
+
+
+def _to_timestamp(when: Union[datetime, float]) -> float:
+    return when.timestamp() if isinstance(when, datetime) else float(when)
+
+
+def _line_timestamp(line: bytes) -> Optional[float]:
+    """Read the leading timestamp field without decoding the whole rates table"""
+    prefix = b'{"timestamp":'
+    if line.startswith(prefix):
+        end = line.find(b',', len(prefix))
+        try:
+            return float(line[len(prefix):end])
+        except ValueError:
+            pass
+    try:
+        return float(codec.loads(line)["timestamp"])
+    except Exception:
+        return None
@@ -1,9 +1,9 @@
 """
 Repository for managing application settings
 """
-import json
 import os
 from typing import Dict, Any
+from services import codec
 
 class SettingsRepository:
     """Handles storage and retrieval of application settings"""
@@ -11,7 +11,11 @@ class SettingsRepository:
     DEFAULT_SETTINGS = {
         "default_from_currency": "USD",
         "default_to_currency": "EUR",
-        "theme": "light"
+        "theme": "light",
+        "conversion_mode": "float",
+        "history_retention_days": 0,
+        "target_currencies": ["EUR", "GBP", "JPY", "CNY", "IDR", "SGD", "AUD", "CAD", "CHF", "HKD",
+                              "KRW", "INR", "MYR", "THB", "PHP", "NZD", "SEK", "NOK", "AED", "BRL"]
     }
     
     def __init__(self, storage_file: str = "settings.json"):
@@ -35,8 +39,8 @@ class SettingsRepository:
     def _save(self):
         """Save settings to file"""
         try:
-            with open(self._storage_file, 'w') as f:
-                json.dump(self._settings, f, indent=2)
+            with open(self._storage_file, 'wb') as f:
+                f.write(codec.dumps(self._settings, indent=True))
         except Exception as e:
             print(f"Error saving settings: {e}")
     
@@ -47,8 +51,8 @@ class SettingsRepository:
             return
             
         try:
-            with open(self._storage_file, 'r') as f:
-                data = json.load(f)
+            with open(self._storage_file, 'rb') as f:
+                data = codec.loads(f.read())
                 self._settings.update(data)
         except Exception as e:
             print(f"Error loading settings: {e}")
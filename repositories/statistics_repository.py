@@ -0,0 +1,219 @@
+"""
+Repository for incrementally maintained usage statistics
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from models.transaction import Transaction, DailyRollup
+from services import codec
+from services.memory_profiler import deep_sizeof
+
+
+class StatisticsRepository:
+    """
+    Keeps per-pair and per-currency conversion counts and volumes.
+
+    Every recorded transaction updates the all-time totals and one hourly
+    bucket in O(1). Rolling windows keep running totals and subtract whole
+    buckets as they fall out of the window, so reading any window never
+    touches history.
+    """
+
+    WINDOWS = {"24h": 24, "7d": 7 * 24, "30d": 30 * 24}
+    SAVE_INTERVAL = 5.0  # Seconds between writes while recording
+
+    def __init__(self, storage_file: str = "statistics.json"):
+        self._storage_file = storage_file
+        self._lock = threading.RLock()
+        self._last_save = 0.0
+        self._dirty = False
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        # pair key "FROM/TO" -> [count, amount, result]
+        self._pairs: Dict[str, List[float]] = {}
+        # currency code -> [count, volume in that currency]
+        self._currencies: Dict[str, List[float]] = {}
+        # hour number -> {pair key: [count, amount, result]}
+        self._buckets: "OrderedDict[int, Dict[str, List[float]]]" = OrderedDict()
+        self._windows: Dict[str, Dict[str, List[float]]] = {name: {} for name in self.WINDOWS}
+        self._window_start: Dict[str, int] = {name: 0 for name in self.WINDOWS}
+
+    def record(self, transaction: Transaction):
+        """Account for one new transaction"""
+        pair = f"{transaction.from_currency}/{transaction.to_currency}"
+        hour = int(transaction.timestamp.timestamp() // 3600)
+        with self._lock:
+            self._add_totals(pair, transaction.from_currency, transaction.to_currency,
+                             1, transaction.amount, transaction.result)
+
+            self._advance(max(hour, self._current_hour()))
+            if hour >= min(self._window_start.values()):
+                _accumulate(self._buckets.setdefault(hour, {}), pair, 1,
+                            transaction.amount, transaction.result)
+                for name, start in self._window_start.items():
+                    if hour >= start:
+                        _accumulate(self._windows[name], pair, 1, transaction.amount, transaction.result)
+            self._save_throttled()
+
+    def record_rollup(self, rollup: DailyRollup):
+        """Account for a daily rollup in the all-time totals"""
+        pair = f"{rollup.from_currency}/{rollup.to_currency}"
+        with self._lock:
+            self._add_totals(pair, rollup.from_currency, rollup.to_currency,
+                             rollup.count, rollup.total_amount, rollup.total_result)
+            self._dirty = True
+
+    def get_pairs(self, window: Optional[str] = None) -> List[Tuple[str, int, float, float]]:
+        """
+        (pair, count, amount, result) tuples sorted by count, descending.
+        With a window name ("24h", "7d", "30d") only recent conversions count.
+        """
+        with self._lock:
+            if window:
+                self._advance(self._current_hour())
+                source = self._windows[window]
+            else:
+                source = self._pairs
+            rows = [(pair, int(v[0]), v[1], v[2]) for pair, v in source.items() if v[0] > 0]
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
+
+    def get_currencies(self) -> List[Tuple[str, int, float]]:
+        """(code, count, volume) tuples sorted by count, descending"""
+        with self._lock:
+            rows = [(code, int(v[0]), v[1]) for code, v in self._currencies.items()]
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
+
+    def get_window_counts(self) -> Dict[str, int]:
+        """Total number of conversions in each rolling window"""
+        with self._lock:
+            self._advance(self._current_hour())
+            return {name: int(sum(v[0] for v in totals.values()))
+                    for name, totals in self._windows.items()}
+
+    def get_total_count(self) -> int:
+        """All-time number of conversions"""
+        with self._lock:
+            return int(sum(v[0] for v in self._pairs.values()))
+
+    def is_empty(self) -> bool:
+        return not self._pairs
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held, by component"""
+        with self._lock:
+            return {
+                "totals": deep_sizeof((self._pairs, self._currencies)),
+                "hourly_buckets": deep_sizeof(self._buckets),
+                "windows": deep_sizeof(self._windows)
+            }
+
+    def clear(self):
+        """Reset all statistics"""
+        with self._lock:
+            self._reset()
+            self._save()
+
+    def flush(self):
+        """Write pending changes to disk"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _add_totals(self, pair: str, from_code: str, to_code: str,
+                    count: int, amount: float, result: float):
+        _accumulate(self._pairs, pair, count, amount, result)
+        source = self._currencies.setdefault(from_code, [0, 0.0])
+        source[0] += count
+        source[1] += amount
+        target = self._currencies.setdefault(to_code, [0, 0.0])
+        target[0] += count
+        target[1] += result
+
+    @staticmethod
+    def _current_hour() -> int:
+        return int(time.time() // 3600)
+
+    def _advance(self, hour: int):
+        """Move every window forward so it ends at `hour`, dropping expired buckets"""
+        for name, length in self.WINDOWS.items():
+            start = hour - length + 1
+            old_start = self._window_start[name]
+            if start <= old_start:
+                continue
+            if start - old_start > length:
+                self._windows[name] = {}
+                for bucket_hour, bucket in self._buckets.items():
+                    if bucket_hour >= start:
+                        for pair, (c, a, r) in bucket.items():
+                            _accumulate(self._windows[name], pair, c, a, r)
+            else:
+                totals = self._windows[name]
+                for expired in range(old_start, start):
+                    for pair, (c, a, r) in self._buckets.get(expired, {}).items():
+                        _accumulate(totals, pair, -c, -a, -r)
+            self._window_start[name] = start
+
+        oldest = min(self._window_start.values())
+        while self._buckets:
+            first = next(iter(self._buckets))
+            if first >= oldest:
+                break
+            del self._buckets[first]
+
+    def _save_throttled(self):
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.SAVE_INTERVAL:
+            self._save()
+
+    def _save(self):
+        """Save statistics to file atomically"""
+        data = {
+            "pairs": self._pairs,
+            "currencies": self._currencies,
+            "buckets": {str(hour): bucket for hour, bucket in self._buckets.items()},
+            "windows": self._windows,
+            "window_start": self._window_start
+        }
+        temp_file = self._storage_file + ".tmp"
+        try:
+            with open(temp_file, 'wb') as f:
+                f.write(codec.dumps(data))
+            os.replace(temp_file, self._storage_file)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        except Exception as e:
+            print(f"Error saving statistics: {e}")
+
+    def _load(self):
+        """Load statistics from file"""
+        if not os.path.exists(self._storage_file):
+            return
+
+        try:
+            with open(self._storage_file, 'rb') as f:
+                data = codec.loads(f.read())
+            self._pairs = data["pairs"]
+            self._currencies = data["currencies"]
+            self._buckets = OrderedDict(sorted((int(hour), bucket) for hour, bucket in data["buckets"].items()))
+            for name in self.WINDOWS:
+                self._windows[name] = data["windows"].get(name, {})
+                self._window_start[name] = data["window_start"].get(name, 0)
+        except Exception as e:
+            print(f"Error loading statistics: {e}")
+            self._reset()
+
+
+def _accumulate(totals: Dict[str, List[float]], key: str, count: int, amount: float, result: float):
+    entry = totals.get(key)
+    if entry is None:
+        totals[key] = [count, amount, result]
+    else:
+        entry[0] += count
+        entry[1] += amount
+        entry[2] += result
@@ -2,5 +2,16 @@
 Services package
 """
 from .api_service import APIService
+from .providers import RateProvider, OpenExchangeRatesProvider, FileRateProvider, ProviderError, utc_today
+from .export_service import HistoryExporter, ExportFilter, EXPORT_FORMATS
+from .alert_engine import AlertEngine
+from .memory_profiler import MemoryProfiler, MemoryReport
+from .batch_converter import BatchConverter
+from .shared_rates import SharedRatePublisher, SharedRateReader, SharedMemoryRateProvider
+from .async_client import AsyncRateClient, AsyncRateLimiter
+from .backfill import HistoryBackfill
 
-__all__ = ['APIService']
+__all__ = ['APIService', 'RateProvider', 'OpenExchangeRatesProvider', 'FileRateProvider', 'ProviderError',
+           'HistoryExporter', 'ExportFilter', 'EXPORT_FORMATS', 'AlertEngine', 'MemoryProfiler', 'MemoryReport',
+           'BatchConverter', 'SharedRatePublisher', 'SharedRateReader', 'SharedMemoryRateProvider',
+           'AsyncRateClient', 'AsyncRateLimiter', 'HistoryBackfill']
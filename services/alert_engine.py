@@ -0,0 +1,169 @@
+"""
+Alert engine evaluating rate alerts against each refresh
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Callable, Dict, List, Set, Tuple
+from models import RateTable, RateChangeSet
+from models.alert import RateAlert, AlertEvent
+from .memory_profiler import deep_sizeof
+
+
+class _SortedThresholds:
+    """Thresholds kept sorted next to their alert ids, for range queries by bisection"""
+
+    def __init__(self):
+        self.keys: List[float] = []
+        self.ids: List[str] = []
+
+    def insert(self, threshold: float, alert_id: str):
+        i = bisect_right(self.keys, threshold)
+        self.keys.insert(i, threshold)
+        self.ids.insert(i, alert_id)
+
+    def remove(self, alert_id: str):
+        i = self.ids.index(alert_id)
+        del self.keys[i]
+        del self.ids[i]
+
+    def between(self, low: float, high: float, inclusive_low: bool) -> List[str]:
+        """Ids with low < threshold <= high, or low <= threshold < high when inclusive_low"""
+        if inclusive_low:
+            return self.ids[bisect_left(self.keys, low):bisect_left(self.keys, high)]
+        return self.ids[bisect_right(self.keys, low):bisect_right(self.keys, high)]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class _PairIndex:
+    def __init__(self):
+        self.above = _SortedThresholds()
+        self.below = _SortedThresholds()
+        self.move = _SortedThresholds()
+
+    def by_kind(self, kind: str) -> _SortedThresholds:
+        return getattr(self, kind)
+
+    def __len__(self):
+        return len(self.above) + len(self.below) + len(self.move)
+
+
+class AlertEngine:
+    """
+    Evaluates rate alerts on every rate refresh.
+
+    Alerts are indexed per currency pair, and each pair is indexed under both
+    of its currencies. A refresh only visits pairs touching a changed currency,
+    and within a pair the crossed thresholds are found by binary search
+    between the old and the new rate, so the cost does not depend on how
+    many alerts exist for untouched pairs.
+    """
+
+    def __init__(self, alert_repo):
+        self._alert_repo = alert_repo
+        self._alerts: Dict[str, RateAlert] = {}
+        self._pairs: Dict[Tuple[str, str], _PairIndex] = {}
+        self._by_currency: Dict[str, Set[Tuple[str, str]]] = {}
+        self._references: Dict[Tuple[str, str], Tuple[date, float]] = {}
+        self._subscribers: List[Callable[[List[AlertEvent]], None]] = []
+
+        for alert in alert_repo.get_all():
+            self._index(alert)
+
+    def subscribe(self, callback: Callable[[List[AlertEvent]], None]):
+        """Register a callback invoked with the alerts fired by a refresh"""
+        self._subscribers.append(callback)
+
+    def add_alert(self, alert: RateAlert):
+        """Store and index a new alert"""
+        if alert.kind not in RateAlert.KINDS:
+            raise ValueError(f"Unknown alert kind: {alert.kind}")
+        self._alert_repo.add(alert)
+        self._index(alert)
+
+    def remove_alert(self, alert_id: str) -> bool:
+        """Delete an alert"""
+        alert = self._alert_repo.remove(alert_id)
+        if alert is None:
+            return False
+        self._alerts.pop(alert_id, None)
+        index = self._pairs.get(alert.pair)
+        if index is not None:
+            index.by_kind(alert.kind).remove(alert_id)
+            if not len(index):
+                del self._pairs[alert.pair]
+                for code in alert.pair:
+                    pairs = self._by_currency.get(code)
+                    if pairs is not None:
+                        pairs.discard(alert.pair)
+        return True
+
+    def get_alerts(self) -> List[RateAlert]:
+        return list(self._alerts.values())
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held by stored alerts and the evaluation indexes"""
+        usage = self._alert_repo.memory_usage()
+        usage["indexes"] = deep_sizeof((self._pairs, self._by_currency, self._references))
+        return usage
+
+    def evaluate(self, changes: RateChangeSet, table: RateTable) -> List[AlertEvent]:
+        """
+        Fire the alerts crossed by a refresh. `table` holds the new rates
+        against the same base as `changes`.
+        """
+        old_rates = {delta.code: delta.old_rate for delta in changes.deltas}
+        candidates: Set[Tuple[str, str]] = set()
+        for code in old_rates:
+            candidates.update(self._by_currency.get(code, ()))
+
+        today = date.today()
+        events: List[AlertEvent] = []
+        for pair in candidates:
+            from_code, to_code = pair
+            new_from, new_to = table.get_rate(from_code), table.get_rate(to_code)
+            old_from = old_rates.get(from_code, new_from)
+            old_to = old_rates.get(to_code, new_to)
+            if not new_from or not old_from or new_to is None or old_to is None:
+                continue
+
+            new_rate = new_to / new_from
+            old_rate = old_to / old_from
+            index = self._pairs[pair]
+
+            fired: List[str] = []
+            if new_rate > old_rate:
+                fired += index.above.between(old_rate, new_rate, inclusive_low=False)
+            elif new_rate < old_rate:
+                fired += index.below.between(new_rate, old_rate, inclusive_low=True)
+            for alert_id in fired:
+                events.append(AlertEvent(self._alerts[alert_id], old_rate, new_rate, old_rate))
+
+            if len(index.move):
+                reference_day, reference = self._references.get(pair, (None, None))
+                if reference_day != today:
+                    reference = old_rate
+                    self._references[pair] = (today, reference)
+                old_move = abs(old_rate / reference - 1) * 100
+                new_move = abs(new_rate / reference - 1) * 100
+                if new_move > old_move:
+                    for alert_id in index.move.between(old_move, new_move, inclusive_low=True):
+                        events.append(AlertEvent(self._alerts[alert_id], old_rate, new_rate, reference))
+
+        if events:
+            for callback in list(self._subscribers):
+                try:
+                    callback(events)
+                except Exception as e:
+                    print(f"Error in alert subscriber: {e}")
+        return events
+
+    def _index(self, alert: RateAlert):
+        self._alerts[alert.alert_id] = alert
+        index = self._pairs.get(alert.pair)
+        if index is None:
+            index = self._pairs[alert.pair] = _PairIndex()
+            for code in alert.pair:
+                self._by_currency.setdefault(code, set()).add(alert.pair)
+        index.by_kind(alert.kind).insert(alert.threshold, alert.alert_id)
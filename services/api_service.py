@@ -1,51 +1,154 @@
 """
 API Service for external data fetching
 """
-import requests
-from typing import Optional, Dict
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, Dict, List, Tuple
+from .providers import RateProvider, OpenExchangeRatesProvider, ProviderStats, describe_error
 
 
 class APIService:
-    """Service for interacting with OpenExchangeRates API"""
-    
-    def __init__(self, app_id: str):
+    """
+    Service for fetching exchange rate data from one or more providers
+
+    Providers are ranked by their observed latency and error rate. A request
+    goes to the best provider first; if it has not answered within
+    `hedge_delay` seconds (or fails), the next provider is asked as well and
+    the first successful answer wins. Fallback-only providers are asked last.
+
+    Identical requests are coalesced: callers arriving while one is in
+    flight wait for it and share its answer instead of starting another.
+    Successful answers are reused for `cache_ttl` seconds. Answers are
+    shared between callers and must not be modified.
+
+    The worker pool has room for `max_concurrent` requests asking every
+    provider at once. The timeout runs from the moment a provider call
+    starts, so time spent waiting for a free worker is not counted.
+    """
+
+    def __init__(self, app_id: str, providers: Optional[List[RateProvider]] = None,
+                 hedge_delay: float = 1.5, timeout: float = 10, cache_ttl: float = 5,
+                 max_concurrent: int = 4):
         self.app_id = app_id
         self.base_url = "https://openexchangerates.org/api/"
-        self.timeout = 10
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self._providers = providers or [OpenExchangeRatesProvider(app_id, self.base_url, timeout)]
+        self._stats = {id(p): ProviderStats(hedge_delay) for p in self._providers}
+        self.max_concurrent = max_concurrent
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent * len(self._providers),
+                                            thread_name_prefix="rate-provider")
+        self.cache_ttl = cache_ttl
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple, Future] = {}
+        self._cache: Dict[Tuple, Tuple[float, Dict]] = {}
 
     def fetch_latest(self) -> Optional[Dict]:
         """Fetch latest exchange rates"""
-        url = f"{self.base_url}latest.json?app_id={self.app_id}"
-        try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            self._handle_error(e)
-            return None
+        return self._request("fetch_latest")
 
     def fetch_currency_list(self) -> Optional[Dict]:
         """Fetch list of available currencies"""
-        url = f"{self.base_url}currencies.json"
-        try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            self._handle_error(e)
-            return None
+        return self._request("fetch_currency_list")
 
     def fetch_history(self, date: str) -> Optional[Dict]:
         """Fetch historical exchange rates for a specific date"""
-        url = f"{self.base_url}historical/{date}.json?app_id={self.app_id}"
+        return self._request("fetch_history", date)
+
+    def get_provider_stats(self) -> Dict[str, Dict]:
+        """Latency and error statistics per provider"""
+        return {p.name: self._stats[id(p)].to_dict() for p in self._providers}
+
+    def clear_cache(self):
+        """Forget cached answers, so the next request goes to the providers"""
+        with self._lock:
+            self._cache.clear()
+
+    def _ranked_providers(self) -> List[RateProvider]:
+        """Providers in the order they should be asked"""
+        def key(provider):
+            stats = self._stats[id(provider)]
+            return (provider.fallback_only, stats.is_cooling_down(), stats.score())
+        return sorted(self._providers, key=key)
+
+    def _timed_call(self, provider: RateProvider, method: str, args, started: List[float]):
+        """Call a provider method, appending its start time to `started`, and record its latency and outcome"""
+        start = time.monotonic()
+        started.append(start)
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            self._handle_error(e)
-            return None
+            result = getattr(provider, method)(*args)
+        except Exception:
+            self._stats[id(provider)].record(time.monotonic() - start, False)
+            raise
+        self._stats[id(provider)].record(time.monotonic() - start, True)
+        return result
+
+    def _request(self, method: str, *args) -> Optional[Dict]:
+        """Answer from the cache, join an identical request in flight, or start one"""
+        key = (method,) + args
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not leader:
+            return future.result()
+
+        result = None
+        try:
+            result = self._hedged_request(method, *args)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if result is not None and self.cache_ttl > 0:
+                    now = time.monotonic()
+                    # Drop expired answers so per-date history requests do not pile up
+                    for stale in [k for k, (expires, _) in self._cache.items() if expires <= now]:
+                        del self._cache[stale]
+                    self._cache[key] = (now + self.cache_ttl, result)
+            future.set_result(result)
+        return result
+
+    def _hedged_request(self, method: str, *args) -> Optional[Dict]:
+        """Run a hedged request across the ranked providers"""
+        queue = [p for p in self._ranked_providers() if p.supports(method)]
+        started: List[float] = []
+        pending = set()
+        last_error = None
+
+        try:
+            while queue or pending:
+                if queue:
+                    pending.add(self._executor.submit(self._timed_call, queue.pop(0), method, args, started))
+
+                # The deadline starts with the first provider call, not with the submit
+                remaining = started[0] + self.timeout - time.monotonic() if started else self.timeout
+                if remaining <= 0:
+                    last_error = last_error or TimeoutError(f"No answer within {self.timeout}s")
+                    break
+                # Give the providers in flight until the hedge delay before asking another one
+                budget = min(self.hedge_delay, remaining) if queue else remaining
+                done, pending = wait(pending, timeout=budget, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    try:
+                        return future.result()
+                    except Exception as e:
+                        last_error = e
+        finally:
+            # Calls still queued for a worker are dropped; running ones finish on their own
+            for future in pending:
+                future.cancel()
+
+        self._handle_error(last_error)
+        return None
 
     def _handle_error(self, error: Exception):
         """Handle API errors"""
-        print(f"API Error: {error}")
+        print(f"API Error: {describe_error(error)}")
@@ -0,0 +1,162 @@
+"""
+Asyncio client for the openexchangerates.org API, for bulk downloads
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from . import codec
+from .providers import ProviderError
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+TRANSIENT_ERRORS = (asyncio.TimeoutError, OSError, requests.RequestException) + (
+    (aiohttp.ClientError,) if aiohttp is not None else ())
+
+
+class AsyncRateLimiter:
+    """Token bucket: at most `rate` acquisitions per second, in bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def reset(self):
+        """Forget the lock, which belongs to the event loop that created it"""
+        self._lock = None
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncRateClient:
+    """
+    Async variant of OpenExchangeRatesProvider for many concurrent requests.
+
+    At most `max_connections` requests are open at once, no more than
+    `per_host` of them to the same host, and requests start at no more than
+    `rate` per second. Rate limited (429) and server errors are retried with
+    exponential backoff. Uses aiohttp when installed, otherwise runs
+    requests calls on a thread pool under the same limits.
+
+    Use as an async context manager:
+
+        async with AsyncRateClient(app_id) as client:
+            data = await client.fetch_history("2020-01-01")
+    """
+
+    def __init__(self, app_id: str, base_url: str = "https://openexchangerates.org/api/",
+                 timeout: float = 10, max_connections: int = 8, per_host: int = 4,
+                 rate: float = 5.0, retries: int = 3):
+        self.app_id = app_id
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.retries = retries
+        self._limiter = AsyncRateLimiter(rate, burst=per_host)
+        self._session = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connections: Optional[asyncio.Semaphore] = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> 'AsyncRateClient':
+        # Created here so they belong to the running event loop; each asyncio.run has its own
+        self._connections = asyncio.Semaphore(self.max_connections)
+        self._hosts = {}
+        self._limiter.reset()
+        if aiohttp is not None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+        else:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_connections, pool_maxsize=self.per_host)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_connections,
+                                                thread_name_prefix="async-rate-client")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if aiohttp is not None:
+            await self._session.close()
+        else:
+            self._session.close()
+            self._executor.shutdown(wait=False)
+        self._session = None
+
+    async def fetch_latest(self) -> Dict:
+        return codec.decode_latest(await self._get(f"{self.base_url}latest.json?app_id={self.app_id}"))
+
+    async def fetch_currency_list(self) -> Dict:
+        return codec.loads(await self._get(f"{self.base_url}currencies.json"))
+
+    async def fetch_history(self, date: str) -> Dict:
+        return codec.decode_latest(
+            await self._get(f"{self.base_url}historical/{date}.json?app_id={self.app_id}"))
+
+    async def _get(self, url: str) -> bytes:
+        """GET `url` within the limits, retrying transient failures. Raises ProviderError."""
+        if self._session is None:
+            raise RuntimeError("AsyncRateClient must be used as an async context manager")
+
+        host = urlsplit(url).netloc
+        host_slots = self._hosts.get(host)
+        if host_slots is None:
+            host_slots = self._hosts[host] = asyncio.Semaphore(self.per_host)
+        delay = 1.0
+        for attempt in range(self.retries + 1):
+            await self._limiter.acquire()
+            async with self._connections, host_slots:
+                try:
+                    status, body, retry_after = await self._send(url)
+                except TRANSIENT_ERRORS:
+                    status, body, retry_after = None, None, None
+
+            if status == 200:
+                return body
+            if status is not None and status not in RETRY_STATUSES:
+                raise ProviderError(f"HTTP {status} for {url.split('?')[0]}")
+            if attempt < self.retries:
+                await asyncio.sleep(retry_after if retry_after is not None else delay)
+                delay *= 2
+        raise ProviderError(f"Giving up on {url.split('?')[0]} after {self.retries + 1} attempts")
+
+    async def _send(self, url: str):
+        """One GET; returns (status, body, Retry-After seconds)"""
+        if aiohttp is not None:
+            async with self._session.get(url) as response:
+                return response.status, await response.read(), _retry_after(response.headers)
+
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self._executor, lambda: self._session.get(url, timeout=self.timeout))
+        return response.status_code, response.content, _retry_after(response.headers)
+
+
+def _retry_after(headers) -> Optional[float]:
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
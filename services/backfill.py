@@ -0,0 +1,75 @@
+"""
+Resumable download of daily historical rates
+"""
+import asyncio
+from datetime import date, timedelta
+from typing import Callable, List, Optional, Tuple
+from .async_client import AsyncRateClient
+from .providers import ProviderError, utc_today
+
+
+def date_range(start: date, end: date) -> List[date]:
+    """Every day from `start` to `end`, both included"""
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+class HistoryBackfill:
+    """
+    Fetches the end-of-day rates of many days into a historical rate cache.
+
+    `repository` is a HistoricalRateRepository (anything with has_day and
+    store). Days are fetched concurrently through an AsyncRateClient. The
+    cache itself records progress: a day counts as done only once store()
+    has written it, so an interrupted run resumes with the days still
+    missing, and days that fail are left for the next run.
+    """
+
+    def __init__(self, client: AsyncRateClient, repository):
+        self._client = client
+        self._repository = repository
+
+    def run(self, start: date, end: date,
+            progress_callback: Optional[Callable[[int, int], None]] = None,
+            is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[int, int]:
+        """Blocking wrapper around fetch() for worker threads and the command line"""
+        return asyncio.run(self.fetch(start, end, progress_callback, is_cancelled))
+
+    async def fetch(self, start: date, end: date,
+                    progress_callback: Optional[Callable[[int, int], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[int, int]:
+        """
+        Fetch every day in [start, end] not cached yet, excluding today.
+        Returns (days fetched, days failed).
+        """
+        end = min(end, utc_today() - timedelta(days=1))
+        days = [day for day in date_range(start, end) if not self._repository.has_day(day)]
+        if not days:
+            return 0, 0
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for day in days:
+            queue.put_nowait(day)
+        counts = {"fetched": 0, "failed": 0}
+
+        async def worker():
+            while not queue.empty():
+                if is_cancelled and is_cancelled():
+                    return
+                day = queue.get_nowait()
+                try:
+                    data = await self._client.fetch_history(day.isoformat())
+                    if 'rates' not in data:
+                        raise ProviderError("No rates in response")
+                    if not self._repository.store(day, data):
+                        raise OSError("Could not write to the rate cache")
+                    counts["fetched"] += 1
+                except Exception as e:
+                    print(f"Error fetching historical rates for {day}: {e}")
+                    counts["failed"] += 1
+                if progress_callback:
+                    progress_callback(counts["fetched"] + counts["failed"], len(days))
+
+        async with self._client:
+            workers = min(self._client.max_connections, len(days))
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        return counts["fetched"], counts["failed"]
@@ -0,0 +1,232 @@
+"""
+Multi-process conversion of large CSV files
+"""
+import csv
+import io
+import math
+import os
+import shutil
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+from models import RateTable, FixedPointRates, open_rate_snapshot
+from .shared_rates import SharedRateReader
+
+REQUIRED_COLUMNS = ("amount", "from_currency", "to_currency")
+MIN_CHUNK_SIZE = 1 << 20
+CHUNKS_PER_WORKER = 4
+
+# Per-process state set by _init_worker, so the snapshot is sent once per worker, not per chunk
+_table: Optional[RateTable] = None
+_fixed_point: Optional[FixedPointRates] = None
+
+
+def split_ranges(path: str, chunk_count: int, start: int = 0) -> List[Tuple[int, int]]:
+    """
+    Split a file into byte ranges that each start and end on a line boundary.
+    Assumes no quoted field contains a newline.
+    """
+    size = os.path.getsize(path)
+    chunk_size = max(MIN_CHUNK_SIZE, (size - start) // max(chunk_count, 1) + 1)
+    ranges = []
+    with open(path, 'rb') as f:
+        while start < size:
+            end = start + chunk_size
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            end = min(end, size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _init_worker(base: str, codes: Tuple[str, ...], rates, timestamp, exact: bool):
+    global _table, _fixed_point
+    _table = RateTable(base, codes, rates, timestamp)
+    _fixed_point = FixedPointRates(_table) if exact else None
+
+
+def _init_mapped_worker(snapshot_path: str, exact: bool):
+    """Map the rate snapshot file, so all workers share its pages"""
+    global _table, _fixed_point
+    _table = open_rate_snapshot(snapshot_path)
+    _fixed_point = FixedPointRates(_table) if exact else None
+
+
+def _init_shared_worker(block_name: str, sequence: int, exact: bool, fallback: tuple):
+    """
+    Read the rates published in shared memory, if the block still holds
+    publication `sequence`. Otherwise use `fallback`, the parent's copy of
+    that publication, so every chunk is converted with the same rates.
+    """
+    global _table, _fixed_point
+    _table = None
+    try:
+        reader = SharedRateReader(block_name)
+    except FileNotFoundError:
+        reader = None
+    if reader is not None:
+        try:
+            table = reader.read()
+            if table is not None and reader.table_sequence() == sequence:
+                _table = table
+        finally:
+            reader.close()
+    if _table is None:
+        _table = RateTable(*fallback)
+    _fixed_point = FixedPointRates(_table) if exact else None
+
+
+def _read_shared(block_name: str) -> Tuple[Optional[RateTable], int]:
+    """The table published in shared memory and its publication number; (None, 0) when no block can be read"""
+    try:
+        reader = SharedRateReader(block_name)
+    except FileNotFoundError:
+        return None, 0
+    try:
+        return reader.read(), reader.table_sequence()
+    finally:
+        reader.close()
+
+
+def _convert_range(path: str, part_path: str, start: int, end: int,
+                   columns: Tuple[int, int, int]) -> Tuple[int, int]:
+    """Convert the rows in [start, end) into part_path. Returns (rows, failed rows)."""
+    amount_col, from_col, to_col = columns
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    pair_rates: Dict[Tuple[str, str], Optional[float]] = {}
+    rows = failed = 0
+    with open(part_path, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out)
+        for row in csv.reader(io.StringIO(data.decode('utf-8'))):
+            if not row:
+                continue
+            rows += 1
+            try:
+                from_code, to_code = row[from_col], row[to_col]
+                pair = (from_code, to_code)
+                if pair not in pair_rates:
+                    # Same lookup as CurrencyController.convert, so results match the GUI
+                    rebased = _table.rebase(from_code)
+                    pair_rates[pair] = rebased.get_rate(to_code) if rebased else None
+                rate = pair_rates[pair]
+                if rate is None:
+                    raise KeyError(pair)
+                # Same amount rule as CurrencyController.convert: finite and positive
+                if _fixed_point is not None:
+                    amount = Decimal(row[amount_col])
+                    if not amount.is_finite() or amount <= 0:
+                        raise ValueError(row[amount_col])
+                    result = str(_fixed_point.convert(from_code, to_code, amount))
+                else:
+                    amount = float(row[amount_col])
+                    if not math.isfinite(amount) or amount <= 0:
+                        raise ValueError(row[amount_col])
+                    result = repr(amount * rate)
+                writer.writerow(row + [result, repr(rate)])
+            except (IndexError, KeyError, ValueError, ArithmeticError):
+                failed += 1
+                writer.writerow(row + ["", ""])
+    return rows, failed
+
+
+class BatchConverter:
+    """
+    Converts CSV files of amounts with a process pool.
+
+    The input needs a header with amount, from_currency and to_currency
+    columns; every row is written back with result and rate columns
+    appended. The file is split into line-aligned byte ranges, each worker
+    process converts whole ranges into part files using one copy of the
+    rate snapshot, and the parts are concatenated in input order. Given a
+    binary snapshot file holding the same rates, workers mmap it instead of
+    receiving a copy; given a shared memory block name, they read the rates
+    published there, unless the block is missing or older than `table`. The
+    block is read once here and workers check they see that same
+    publication, so a publish during the run cannot mix rates in one file.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+
+    def convert(self, table: RateTable, input_path: str, output_path: str, exact: bool = False,
+                progress_callback: Optional[Callable[[int, int], None]] = None,
+                is_cancelled: Optional[Callable[[], bool]] = None,
+                snapshot_path: Optional[str] = None,
+                shared_rates: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Convert `input_path` into `output_path`.
+        Returns (rows, failed rows). Raises on I/O errors or a bad header.
+        """
+        with open(input_path, 'rb') as f:
+            header_line = f.readline()
+            data_start = f.tell()
+        header = next(csv.reader([header_line.decode('utf-8-sig')]), [])
+        missing = [name for name in REQUIRED_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        columns = tuple(header.index(name) for name in REQUIRED_COLUMNS)
+
+        ranges = split_ranges(input_path, self.workers * CHUNKS_PER_WORKER, data_start)
+        total = sum(end - start for start, end in ranges)
+        part_paths = [f"{output_path}.part{i}" for i in range(len(ranges))]
+        if shared_rates:
+            # Only use the shared block if it exists and is not older than our own rates
+            shared, sequence = _read_shared(shared_rates)
+            if shared is None or _older(shared, table):
+                shared_rates = None
+        if shared_rates:
+            initializer = _init_shared_worker
+            initargs = (shared_rates, sequence, exact,
+                        (shared.get_base(), tuple(shared.get_codes()), array('d', shared.get_rates()),
+                         shared.get_timestamp()))
+        elif snapshot_path:
+            initializer, initargs = _init_mapped_worker, (snapshot_path, exact)
+        else:
+            initializer = _init_worker
+            initargs = (table.get_base(), tuple(table.get_codes()), array('d', table.get_rates()),
+                        table.get_timestamp(), exact)
+        rows = failed = done = 0
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.workers, max(len(ranges), 1)),
+                                     initializer=initializer, initargs=initargs) as executor:
+                futures = [executor.submit(_convert_range, input_path, part, start, end, columns)
+                           for part, (start, end) in zip(part_paths, ranges)]
+                for future, (start, end) in zip(futures, ranges):
+                    if is_cancelled and is_cancelled():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    part_rows, part_failed = future.result()
+                    rows += part_rows
+                    failed += part_failed
+                    done += end - start
+                    if progress_callback:
+                        progress_callback(done, total)
+
+            if done == total:
+                with open(output_path, 'w', newline='', encoding='utf-8') as out:
+                    csv.writer(out).writerow(header + ["result", "rate"])
+                with open(output_path, 'ab') as out:
+                    for part in part_paths:
+                        with open(part, 'rb') as f:
+                            shutil.copyfileobj(f, out)
+        finally:
+            for part in part_paths:
+                if os.path.exists(part):
+                    os.remove(part)
+        return rows, failed
+
+
+def _older(table: RateTable, other: RateTable) -> bool:
+    """Whether `table` has an older provider timestamp than `other`"""
+    mine, theirs = table.get_timestamp(), other.get_timestamp()
+    if not isinstance(mine, (int, float)) or not isinstance(theirs, (int, float)):
+        return False
+    return mine < theirs
@@ -0,0 +1,92 @@
+"""
+JSON codec used for API payloads and local persistence
+
+Uses orjson or msgspec when installed and falls back to the stdlib json
+module. Everything is encoded to and decoded from bytes.
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+from models.transaction import Transaction
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif msgspec is not None:
+    BACKEND = "msgspec"
+else:
+    BACKEND = "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        return _decoder.decode(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode an object as JSON bytes, optionally indented for humans"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if msgspec is not None:
+        data = _encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+if msgspec is not None:
+    _decoder = msgspec.json.Decoder()
+    _encoder = msgspec.json.Encoder()
+
+    class _TransactionStruct(msgspec.Struct):
+        from_currency: str
+        to_currency: str
+        amount: float
+        result: float
+        rate: float
+        timestamp: datetime
+        result_minor: Optional[int] = None
+
+    class _LatestStruct(msgspec.Struct):
+        rates: Dict[str, float]
+        base: str = "USD"
+        timestamp: int = 0
+
+    _transaction_decoder = msgspec.json.Decoder(_TransactionStruct)
+    _latest_decoder = msgspec.json.Decoder(_LatestStruct)
+
+
+def decode_transactions(lines: Iterable[bytes]) -> List[Transaction]:
+    """Decode JSON Lines records straight into Transaction objects"""
+    if msgspec is not None:
+        decode = _transaction_decoder.decode
+        result = []
+        for line in lines:
+            if line:
+                s = decode(line)
+                result.append(Transaction(s.from_currency, s.to_currency, s.amount,
+                                          s.result, s.rate, s.timestamp, s.result_minor))
+        return result
+    return [Transaction.from_dict(loads(line)) for line in lines if line]
+
+
+def decode_latest(data: bytes) -> Dict:
+    """Decode a latest/historical rates payload, validating the rates table when possible"""
+    if msgspec is not None:
+        s = _latest_decoder.decode(data)
+        return {"base": s.base, "timestamp": s.timestamp, "rates": s.rates}
+    return loads(data)
@@ -0,0 +1,180 @@
+"""
+Streaming export of transaction history to CSV, JSON Lines, Parquet and Arrow
+"""
+import csv
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+from models.transaction import Transaction
+from . import codec
+
+EXPORT_FORMATS = {
+    "csv": "CSV (*.csv)",
+    "jsonl": "JSON Lines (*.jsonl)",
+    "parquet": "Parquet (*.parquet)",
+    "arrow": "Arrow IPC (*.arrow)",
+}
+
+COLUMNS = ["timestamp", "from_currency", "to_currency", "amount", "result", "rate"]
+
+
+@dataclass
+class ExportFilter:
+    """Date range and currency pair restrictions for an export"""
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    from_currency: Optional[str] = None
+    to_currency: Optional[str] = None
+
+    def matches(self, transaction: Transaction) -> bool:
+        if self.start and transaction.timestamp < self.start:
+            return False
+        if self.end and transaction.timestamp > self.end:
+            return False
+        if self.from_currency and transaction.from_currency != self.from_currency:
+            return False
+        if self.to_currency and transaction.to_currency != self.to_currency:
+            return False
+        return True
+
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, chunk: List[Transaction]):
+        self._writer.writerows(
+            (t.timestamp.isoformat(), t.from_currency, t.to_currency, t.amount, t.exact_result, t.rate)
+            for t in chunk
+        )
+
+    def close(self):
+        self._file.close()
+
+
+class _JsonlWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'wb')
+
+    def write(self, chunk: List[Transaction]):
+        self._file.writelines(codec.dumps(t.to_dict()) + b"\n" for t in chunk)
+
+    def close(self):
+        self._file.close()
+
+
+class _ArrowWriter:
+    """
+    Writes each chunk as one record batch / row group. Exact conversions
+    also fill result_minor, the exact result in minor units of to_currency,
+    which is null for float conversions.
+    """
+
+    def __init__(self, path: str, fmt: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            import pyarrow.ipc as ipc
+        except ImportError:
+            raise RuntimeError(f"{fmt} export requires the 'pyarrow' package")
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ("timestamp", pa.timestamp("us")),
+            ("from_currency", pa.string()),
+            ("to_currency", pa.string()),
+            ("amount", pa.float64()),
+            ("result", pa.float64()),
+            ("result_minor", pa.int64()),
+            ("rate", pa.float64()),
+        ])
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(path, self._schema)
+        else:
+            self._writer = ipc.new_file(path, self._schema)
+
+    def write(self, chunk: List[Transaction]):
+        batch = self._pa.record_batch([
+            [t.timestamp for t in chunk],
+            [t.from_currency for t in chunk],
+            [t.to_currency for t in chunk],
+            [t.amount for t in chunk],
+            [t.result for t in chunk],
+            [t.result_minor for t in chunk],
+            [t.rate for t in chunk],
+        ], schema=self._schema)
+        if hasattr(self._writer, "write_batch"):
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write_table(self._pa.Table.from_batches([batch]))
+
+    def close(self):
+        self._writer.close()
+
+
+class HistoryExporter:
+    """
+    Writes transactions to disk chunk by chunk.
+    Only one chunk is held in memory at a time, whatever the history size.
+    """
+
+    def __init__(self, chunk_size: int = 10000):
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def format_for_path(path: str) -> Optional[str]:
+        """Guess the export format from a file extension"""
+        ext = os.path.splitext(path)[1].lower().lstrip('.')
+        return ext if ext in EXPORT_FORMATS else None
+
+    def export(self, chunks: Iterable[List[Transaction]], path: str, fmt: str,
+               export_filter: Optional[ExportFilter] = None, total: int = 0,
+               progress_callback: Optional[Callable[[int, int], None]] = None,
+               is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[int]:
+        """
+        Stream chunks of transactions into `path`.
+        Rows go to a temporary file that replaces `path` only once the export
+        is complete, so a cancelled or failed export leaves no partial file.
+        Returns the number of rows written, or None if cancelled. Raises on
+        I/O or format errors.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        tmp_path = path + ".tmp"
+        if fmt == "csv":
+            writer = _CsvWriter(tmp_path)
+        elif fmt == "jsonl":
+            writer = _JsonlWriter(tmp_path)
+        else:
+            writer = _ArrowWriter(tmp_path, fmt)
+
+        scanned = 0
+        written = 0
+        completed = False
+        try:
+            try:
+                for chunk in chunks:
+                    if is_cancelled and is_cancelled():
+                        break
+                    scanned += len(chunk)
+                    if export_filter:
+                        chunk = [t for t in chunk if export_filter.matches(t)]
+                    if chunk:
+                        writer.write(chunk)
+                        written += len(chunk)
+                    if progress_callback:
+                        progress_callback(scanned, total)
+                else:
+                    completed = True
+            finally:
+                writer.close()
+            if completed:
+                os.replace(tmp_path, path)
+        finally:
+            if not completed and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return written if completed else None
@@ -0,0 +1,180 @@
+"""
+Memory accounting for repositories and views
+"""
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from types import FunctionType, MappingProxyType, MethodType, ModuleType
+from typing import Callable, Dict, List, Optional
+
+# Top-level packages of the application, used to group traced allocations
+SUBSYSTEMS = ("models", "repositories", "services", "controllers", "views")
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SKIP_TYPES = (type, ModuleType, FunctionType, MethodType)
+
+
+def deep_sizeof(obj) -> int:
+    """
+    Approximate bytes held by an object graph.
+    Follows containers, instance dicts and slots; shared objects count once.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, (dict, MappingProxyType)):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for cls in type(current).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
+
+
+def start_tracing(frames: int = 1):
+    """Start tracemalloc if it is not running yet"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def _subsystem(filename: str) -> str:
+    path = os.path.abspath(filename)
+    if path.startswith(_ROOT + os.sep):
+        top = os.path.relpath(path, _ROOT).split(os.sep)[0]
+        return top if top in SUBSYSTEMS else "app"
+    if "site-packages" in path:
+        return "third-party"
+    return "stdlib"
+
+
+def allocations_by_subsystem() -> Dict[str, int]:
+    """Live traced bytes grouped by the package that allocated them"""
+    totals: Dict[str, int] = {}
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ])
+    for stat in snapshot.statistics("filename"):
+        name = _subsystem(stat.traceback[0].filename)
+        totals[name] = totals.get(name, 0) + stat.size
+    return totals
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+@dataclass
+class MemoryReport:
+    """Snapshot of memory use by subsystem"""
+    # source name -> component -> bytes
+    sources: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # source name -> component -> item count (Qt-side, invisible to tracemalloc)
+    item_counts: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # package -> traced bytes, None when tracemalloc is off
+    traced: Optional[Dict[str, int]] = None
+    warnings: List[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        lines = ["Repositories (estimated live size):"]
+        for name, components in self.sources.items():
+            lines.append(f"  {name:<14} {format_bytes(sum(components.values())):>10}")
+            for component, size in components.items():
+                lines.append(f"    {component:<22} {format_bytes(size):>10}")
+
+        if self.item_counts:
+            lines.append("Widgets (items held by Qt models):")
+            for name, counts in self.item_counts.items():
+                for component, count in counts.items():
+                    lines.append(f"  {name} {component:<20} {count:>10,}")
+
+        if self.traced is None:
+            lines.append("Python allocations: tracing off (start with --memory-report or MEMORY_TRACE=1)")
+        else:
+            lines.append(f"Python allocations (tracemalloc, {format_bytes(sum(self.traced.values()))} total):")
+            for name, size in sorted(self.traced.items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"  {name:<14} {format_bytes(size):>10}")
+            current, peak = tracemalloc.get_traced_memory()
+            lines.append(f"  peak           {format_bytes(peak):>10}")
+
+        for warning in self.warnings:
+            lines.append(f"Warning: {warning}")
+        return "\n".join(lines)
+
+
+class MemoryProfiler:
+    """
+    Collects per-source memory accounting and checks it against budgets.
+
+    Sources are callables returning {component: bytes}, usually a
+    repository's memory_usage method. Budgets are bytes per source name.
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None):
+        self._budgets = dict(budgets or {})
+        self._sources: Dict[str, Callable[[], Dict[str, int]]] = {}
+        self._counters: Dict[str, Callable[[], Dict[str, int]]] = {}
+
+    def register(self, name: str, source: Callable[[], Dict[str, int]]):
+        """Account for a source of {component: bytes}"""
+        self._sources[name] = source
+
+    def register_counts(self, name: str, counter: Callable[[], Dict[str, int]]):
+        """Account for a source of {component: item count}"""
+        self._counters[name] = counter
+
+    def report(self) -> MemoryReport:
+        report = MemoryReport()
+        for name, source in self._sources.items():
+            try:
+                report.sources[name] = source()
+            except Exception as e:
+                print(f"Error measuring {name} memory: {e}")
+        for name, counter in self._counters.items():
+            try:
+                report.item_counts[name] = counter()
+            except Exception as e:
+                print(f"Error counting {name} items: {e}")
+        if tracemalloc.is_tracing():
+            report.traced = allocations_by_subsystem()
+        report.warnings = self._over_budget(report.sources)
+        return report
+
+    def check_budgets(self) -> List[str]:
+        """Measure every budgeted source and print a warning for each one over its limit"""
+        sizes = {}
+        for name in self._budgets:
+            if name in self._sources:
+                try:
+                    sizes[name] = self._sources[name]()
+                except Exception as e:
+                    print(f"Error measuring {name} memory: {e}")
+        warnings = self._over_budget(sizes)
+        for warning in warnings:
+            print(f"Warning: {warning}")
+        return warnings
+
+    def _over_budget(self, sources: Dict[str, Dict[str, int]]) -> List[str]:
+        warnings = []
+        for name, components in sources.items():
+            budget = self._budgets.get(name)
+            used = sum(components.values())
+            if budget and used > budget:
+                warnings.append(f"{name} uses {format_bytes(used)}, over its {format_bytes(budget)} budget")
+        return warnings
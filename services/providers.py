@@ -0,0 +1,156 @@
+"""
+Exchange rate providers used by APIService
+"""
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timezone
+from typing import Dict, Optional
+import requests
+from . import codec
+
+
+class ProviderError(Exception):
+    """Raised when a provider cannot answer a request"""
+
+
+def utc_today() -> date:
+    """Today in the calendar of historical rates, whose days are UTC days"""
+    return datetime.now(timezone.utc).date()
+
+
+class RateProvider(ABC):
+    """
+    Base class for exchange rate sources.
+    Methods return the OpenExchangeRates JSON layout and raise on failure.
+    A provider that cannot answer a method implements it by raising and
+    returns False from supports() for it.
+    """
+
+    name = "provider"
+    # Fallback providers are only used after every regular provider
+    fallback_only = False
+
+    def supports(self, method: str) -> bool:
+        """Whether this provider can answer `method` at all; others are not asked"""
+        return True
+
+    @abstractmethod
+    def fetch_latest(self) -> Dict:
+        """Latest rates"""
+
+    @abstractmethod
+    def fetch_currency_list(self) -> Dict:
+        """Currency codes and names"""
+
+    @abstractmethod
+    def fetch_history(self, date: str) -> Dict:
+        """End-of-day rates of a YYYY-MM-DD date"""
+
+
+class OpenExchangeRatesProvider(RateProvider):
+    """Provider backed by the openexchangerates.org API"""
+
+    name = "openexchangerates"
+
+    def __init__(self, app_id: str, base_url: str = "https://openexchangerates.org/api/",
+                 timeout: float = 10):
+        self.app_id = app_id
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def _get(self, url: str) -> bytes:
+        response = requests.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+    def fetch_latest(self) -> Dict:
+        return codec.decode_latest(self._get(f"{self.base_url}latest.json?app_id={self.app_id}"))
+
+    def fetch_currency_list(self) -> Dict:
+        return codec.loads(self._get(f"{self.base_url}currencies.json"))
+
+    def fetch_history(self, date: str) -> Dict:
+        return codec.decode_latest(self._get(f"{self.base_url}historical/{date}.json?app_id={self.app_id}"))
+
+
+class FileRateProvider(RateProvider):
+    """
+    Stand-in provider reading JSON files from a local directory:
+    latest.json, currencies.json and historical/<date>.json
+    """
+
+    name = "file"
+    fallback_only = True
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _read(self, *parts) -> bytes:
+        path = os.path.join(self.directory, *parts)
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError as e:
+            raise ProviderError(f"{path}: {e}")
+
+    def fetch_latest(self) -> Dict:
+        return codec.decode_latest(self._read("latest.json"))
+
+    def fetch_currency_list(self) -> Dict:
+        return codec.loads(self._read("currencies.json"))
+
+    def fetch_history(self, date: str) -> Dict:
+        return codec.decode_latest(self._read("historical", f"{date}.json"))
+
+
+class ProviderStats:
+    """Latency and error statistics for one provider"""
+
+    SMOOTHING = 0.3
+    COOLDOWN = 60.0           # Seconds a failing provider is deprioritized
+    FAILURES_BEFORE_COOLDOWN = 3
+
+    def __init__(self, initial_latency: float):
+        self._lock = threading.Lock()
+        self.latency = initial_latency
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_failure = 0.0
+
+    def record(self, elapsed: float, success: bool):
+        with self._lock:
+            self.requests += 1
+            if success:
+                self.consecutive_failures = 0
+                self.latency += self.SMOOTHING * (elapsed - self.latency)
+            else:
+                self.failures += 1
+                self.consecutive_failures += 1
+                self.last_failure = time.monotonic()
+
+    @property
+    def error_rate(self) -> float:
+        return self.failures / self.requests if self.requests else 0.0
+
+    def is_cooling_down(self) -> bool:
+        return (self.consecutive_failures >= self.FAILURES_BEFORE_COOLDOWN
+                and time.monotonic() - self.last_failure < self.COOLDOWN)
+
+    def score(self) -> float:
+        """Expected cost of asking this provider; lower is better"""
+        return self.latency * (1 + 4 * self.error_rate)
+
+    def to_dict(self) -> Dict:
+        return {
+            "latency": self.latency,
+            "requests": self.requests,
+            "failures": self.failures,
+            "cooling_down": self.is_cooling_down()
+        }
+
+
+def describe_error(error: Optional[Exception]) -> str:
+    return f"{type(error).__name__}: {error}" if error else "no provider answered"
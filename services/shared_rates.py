@@ -0,0 +1,218 @@
+"""
+Publication of the latest rates through shared memory
+"""
+import struct
+import threading
+import time
+from array import array
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, Optional
+from models import RateTable
+from .providers import RateProvider, ProviderError
+
+# Layout: header, then `capacity` NUL padded codes, then `capacity` float64 rates
+HEADER = struct.Struct("<QIIq8sd")   # sequence, count, capacity, timestamp, base, heartbeat
+SEQUENCE = struct.Struct("<Q")
+# Wall-clock time of the publisher's last sign of life, written outside the seqlock
+HEARTBEAT = struct.Struct("<d")
+HEARTBEAT_OFFSET = HEADER.size - HEARTBEAT.size
+CODE_WIDTH = 8
+NO_TIMESTAMP = -1
+
+# Serializes the process-wide resource_tracker patch in _attach
+_attach_lock = threading.Lock()
+
+
+def _block_size(capacity: int) -> int:
+    return HEADER.size + capacity * CODE_WIDTH + capacity * 8
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without letting this process unlink it on exit"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Before Python 3.13 attaching registers the block with the resource tracker,
+    # which unlinks it when this process exits. Unregistering afterwards is not
+    # an option: child processes share the tracker with the publisher. The patch
+    # is process-wide, so it is held for as short as possible and one at a time.
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedRatePublisher:
+    """
+    Writes rate tables into a named shared memory block.
+
+    Writes follow the seqlock protocol: the sequence number is made odd
+    before the data changes and even again afterwards, so readers can tell
+    a torn read from a consistent one without any lock. Only one publisher
+    per block may be running; it calls heartbeat() regularly, even when the
+    rates did not change, so readers can tell it is still alive.
+    """
+
+    def __init__(self, name: str, capacity: int = 512):
+        try:
+            self._block = shared_memory.SharedMemory(name=name, create=True, size=_block_size(capacity))
+        except FileExistsError:
+            # Left behind by a publisher that did not shut down cleanly: take it over
+            self._block = _attach(name)
+            capacity = HEADER.unpack_from(self._block.buf)[2]
+        self._capacity = capacity
+        self._sequence = HEADER.unpack_from(self._block.buf)[0] & ~1
+
+    def publish(self, table: RateTable):
+        """Make `table` the current rates for every reader"""
+        count = len(table)
+        if count > self._capacity:
+            raise ValueError(f"{count} rates do not fit a block sized for {self._capacity}")
+        timestamp = table.get_timestamp()
+        timestamp = int(timestamp) if isinstance(timestamp, (int, float)) else NO_TIMESTAMP
+        codes = b"".join(code.encode('ascii').ljust(CODE_WIDTH, b"\0")[:CODE_WIDTH]
+                         for code in table.get_codes())
+        rates = array('d', table.get_rates()).tobytes()
+
+        buf = self._block.buf
+        codes_start = HEADER.size
+        rates_start = codes_start + self._capacity * CODE_WIDTH
+
+        # Odd sequence: readers retry until the write below is complete
+        SEQUENCE.pack_into(buf, 0, self._sequence + 1)
+        HEADER.pack_into(buf, 0, self._sequence + 1, count, self._capacity, timestamp,
+                         table.get_base().encode('ascii'), time.time())
+        buf[codes_start:codes_start + len(codes)] = codes
+        buf[rates_start:rates_start + len(rates)] = rates
+        self._sequence += 2
+        SEQUENCE.pack_into(buf, 0, self._sequence)
+
+    def heartbeat(self):
+        """Tell readers the publisher is alive without publishing new rates"""
+        HEARTBEAT.pack_into(self._block.buf, HEARTBEAT_OFFSET, time.time())
+
+    def close(self, unlink: bool = True):
+        # Readers still mapping the block see it as stale at once
+        HEARTBEAT.pack_into(self._block.buf, HEARTBEAT_OFFSET, 0.0)
+        self._block.close()
+        if unlink:
+            self._block.unlink()
+
+
+class SharedRateReader:
+    """
+    Reads the rate table published by a SharedRatePublisher.
+
+    A read copies the block between two loads of the sequence number and
+    retries if a write overlapped. Unchanged sequence numbers return the
+    table from the previous read, so polling costs one 8-byte load.
+    """
+
+    MAX_RETRIES = 100
+
+    def __init__(self, name: str):
+        self._block = _attach(name)
+        self._sequence = 0
+        self._table: Optional[RateTable] = None
+
+    def age(self) -> float:
+        """Seconds since the publisher last published or sent a heartbeat"""
+        return time.time() - HEARTBEAT.unpack_from(self._block.buf, HEARTBEAT_OFFSET)[0]
+
+    def sequence(self) -> int:
+        """Current publication number; 0 until the first publish"""
+        return SEQUENCE.unpack_from(self._block.buf)[0]
+
+    def table_sequence(self) -> int:
+        """Publication number of the table the last read returned"""
+        return self._sequence
+
+    def read(self) -> Optional[RateTable]:
+        """The latest consistent table, or None if nothing was published yet"""
+        buf = self._block.buf
+        for _ in range(self.MAX_RETRIES):
+            before = SEQUENCE.unpack_from(buf)[0]
+            if before == self._sequence:
+                return self._table
+            if before & 1:
+                time.sleep(0)
+                continue
+
+            _, count, capacity, timestamp, base, _ = HEADER.unpack_from(buf)
+            if count > capacity or _block_size(capacity) > len(buf):
+                continue
+            codes_start = HEADER.size
+            rates_start = codes_start + capacity * CODE_WIDTH
+            codes = bytes(buf[codes_start:codes_start + count * CODE_WIDTH])
+            rates = array('d', bytes(buf[rates_start:rates_start + count * 8]))
+
+            if SEQUENCE.unpack_from(buf)[0] != before:
+                continue
+            self._table = RateTable(
+                base.rstrip(b"\0").decode('ascii'),
+                [codes[i:i + CODE_WIDTH].rstrip(b"\0").decode('ascii')
+                 for i in range(0, len(codes), CODE_WIDTH)],
+                rates,
+                None if timestamp == NO_TIMESTAMP else timestamp)
+            self._sequence = before
+            return self._table
+        return self._table
+
+    def close(self):
+        self._block.close()
+
+
+class SharedMemoryRateProvider(RateProvider):
+    """
+    Provider answering fetch_latest from shared memory.
+    Ranked ahead of network providers, it keeps upstream calls to the one
+    publishing process; other requests fall through to the next provider.
+    When the publisher has not shown signs of life for `max_age` seconds,
+    the block is attached again by name (a restarted publisher creates a
+    new one) and, if it is still stale, the request fails over as well.
+    The block is attached when the provider is created, normally on the
+    main thread, so requests only attach again after the publisher changed.
+    """
+
+    name = "shared-memory"
+
+    def __init__(self, block_name: str, max_age: float = 600):
+        self.block_name = block_name
+        self.max_age = max_age
+        self._reader: Optional[SharedRateReader] = None
+        try:
+            self._reader = SharedRateReader(block_name)
+        except FileNotFoundError:
+            pass
+
+    def supports(self, method: str) -> bool:
+        return method == "fetch_latest"
+
+    def fetch_latest(self) -> Dict:
+        if self._reader is not None and self._reader.age() > self.max_age:
+            # The publisher stopped or was replaced: drop the old mapping
+            self._reader.close()
+            self._reader = None
+        if self._reader is None:
+            try:
+                self._reader = SharedRateReader(self.block_name)
+            except FileNotFoundError:
+                raise ProviderError(f"No rates published under '{self.block_name}'")
+            if self._reader.age() > self.max_age:
+                self._reader.close()
+                self._reader = None
+                raise ProviderError(f"Publisher of '{self.block_name}' is not running")
+        table = self._reader.read()
+        if table is None:
+            raise ProviderError(f"No rates published under '{self.block_name}' yet")
+        return {"base": table.get_base(), "timestamp": table.get_timestamp(), "rates": dict(table.items())}
+
+    def fetch_currency_list(self) -> Dict:
+        raise ProviderError("Shared memory only carries rates")
+
+    def fetch_history(self, date: str) -> Dict:
+        raise ProviderError("Shared memory only carries rates")
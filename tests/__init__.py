@@ -0,0 +1,6 @@
+"""
+Tests package
+
+Run from the project root:
+    python -m pytest tests
+"""
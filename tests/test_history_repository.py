@@ -0,0 +1,88 @@
+"""
+History storage: offset index, compaction and recovery after interruptions
+"""
+import os
+from datetime import datetime, timedelta
+import pytest
+
+pytest.importorskip("requests")  # services, imported by the repositories, need it
+
+from models.transaction import Transaction
+from repositories import history_repository
+from repositories.history_repository import HistoryRepository
+
+START = datetime(2024, 1, 1)
+
+
+def _open(tmp_path) -> HistoryRepository:
+    return HistoryRepository(str(tmp_path / "history.jsonl"), None, str(tmp_path / "rollups.json"))
+
+
+def _fill(repo: HistoryRepository, hours):
+    for i, hour in enumerate(hours):
+        repo.add(Transaction("USD", "EUR", float(i), 0.9 * i, 0.9, START + timedelta(hours=hour)))
+
+
+def _amounts(repo: HistoryRepository):
+    return [t.amount for chunk in repo.iter_chunks() for t in chunk]
+
+
+def _rolled_up(repo: HistoryRepository) -> int:
+    return sum(r.count for r in repo.get_rollups())
+
+
+def test_index_survives_reopen(tmp_path):
+    repo = _open(tmp_path)
+    _fill(repo, range(450))
+    reopened = _open(tmp_path)
+    assert reopened.count() == 450
+    assert [t.amount for t in reopened.get_page(0)] == [float(i) for i in range(449, 249, -1)]
+
+
+def test_stale_index_is_extended_and_torn_line_dropped(tmp_path):
+    repo = _open(tmp_path)
+    _fill(repo, range(10))
+    # Lines written by a run whose index updates were lost, then a torn write
+    with open(tmp_path / "history.jsonl", 'ab') as f:
+        line = Transaction("USD", "EUR", 10.0, 9.0, 0.9, START).to_dict()
+        f.write(history_repository.codec.dumps(line) + b"\n" + b'{"from_curr')
+    reopened = _open(tmp_path)
+    assert reopened.count() == 11
+    assert _amounts(reopened)[-1] == 10.0
+
+
+def test_compaction_keeps_rows_with_earlier_timestamps(tmp_path):
+    repo = _open(tmp_path)
+    # The clock goes back five hours half way, as after a DST fall-back
+    _fill(repo, [h if h < 50 else h - 5 for h in range(100)])
+    while repo.compact(START + timedelta(days=30), batch_size=30):
+        pass
+    assert repo.count() == 0
+    assert _rolled_up(repo) == 100
+    assert _rolled_up(_open(tmp_path)) == 100
+
+
+@pytest.mark.parametrize("replaced", [False, True])
+def test_interrupted_reclaim_loses_and_repeats_nothing(tmp_path, monkeypatch, replaced):
+    repo = _open(tmp_path)
+    _fill(repo, range(100))
+    real_replace = os.replace
+
+    def crash(src, dst):
+        if src.endswith("history.jsonl.tmp"):
+            if replaced:
+                real_replace(src, dst)
+            raise KeyboardInterrupt
+        real_replace(src, dst)
+
+    monkeypatch.setattr(history_repository.os, "replace", crash)
+    with pytest.raises(KeyboardInterrupt):
+        repo.compact(START + timedelta(hours=60), batch_size=100)
+    monkeypatch.setattr(history_repository.os, "replace", real_replace)
+
+    reopened = _open(tmp_path)
+    assert _rolled_up(reopened) == 60
+    assert _amounts(reopened) == [float(i) for i in range(60, 100)]
+    # Compaction carries on from there
+    assert reopened.compact(START + timedelta(days=30)) == 40
+    assert _rolled_up(_open(tmp_path)) == 100
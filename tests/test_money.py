@@ -0,0 +1,73 @@
+"""
+Fixed-point money arithmetic: minor units and rounding modes
+"""
+from decimal import Decimal
+import pytest
+from models import RateTable, FixedPointRates
+from models.money import (SUPPORTED_ROUNDING, ROUND_HALF_UP, minor_units, to_minor_units,
+                          from_minor_units, format_amount, _divide)
+
+
+@pytest.fixture
+def rates() -> FixedPointRates:
+    table = RateTable("USD", ["USD", "EUR", "JPY", "KWD", "IDR"], [1.0, 0.92, 151.37, 0.3071, 16250.5])
+    return FixedPointRates(table)
+
+
+def test_minor_units():
+    assert minor_units("USD") == 2
+    assert minor_units("JPY") == 0
+    assert minor_units("KWD") == 3
+    assert minor_units("XYZ") == 2
+
+
+def test_minor_unit_round_trip():
+    assert to_minor_units("12.34", "USD") == 1234
+    assert to_minor_units("1234", "JPY") == 1234
+    assert to_minor_units("1.234", "KWD") == 1234
+    assert from_minor_units(1234, "USD") == Decimal("12.34")
+    assert from_minor_units(1234, "KWD") == Decimal("1.234")
+
+
+def test_to_minor_units_rounds_half_even_by_default():
+    assert to_minor_units("0.125", "USD") == 12
+    assert to_minor_units("0.135", "USD") == 14
+    assert to_minor_units("0.125", "USD", ROUND_HALF_UP) == 13
+
+
+@pytest.mark.parametrize("rounding", SUPPORTED_ROUNDING)
+def test_divide_matches_decimal(rounding):
+    for denominator in (1, 2, 3, 4, 7, 10):
+        for numerator in range(-25, 26):
+            expected = int((Decimal(numerator) / Decimal(denominator)).to_integral_value(rounding))
+            assert _divide(numerator, denominator, rounding) == expected, (numerator, denominator)
+
+
+@pytest.mark.parametrize("rounding", SUPPORTED_ROUNDING)
+def test_batch_matches_single_conversions(rates, rounding):
+    amounts = [-100001, -12345, -1, 0, 1, 5, 50, 12345, 99999999]
+    for from_code, to_code in (("USD", "JPY"), ("JPY", "KWD"), ("EUR", "IDR"), ("KWD", "EUR")):
+        batch = rates.convert_minor_batch(from_code, to_code, amounts, rounding)
+        assert list(batch) == [rates.convert_minor(from_code, to_code, a, rounding) for a in amounts]
+
+
+def test_batch_rejects_unknown_rounding(rates):
+    with pytest.raises(ValueError):
+        rates.convert_minor_batch("USD", "EUR", [100], "ROUND_SIDEWAYS")
+
+
+def test_convert_rounds_to_target_minor_units(rates):
+    assert rates.convert("USD", "JPY", "10.00") == Decimal("1514")
+    assert rates.convert("USD", "KWD", "1") == Decimal("0.307")
+    assert rates.convert("USD", "USD", "19.99") == Decimal("19.99")
+
+
+def test_unknown_currency(rates):
+    with pytest.raises(KeyError):
+        rates.convert_minor("USD", "XYZ", 100)
+
+
+def test_format_amount_uses_minor_units():
+    assert format_amount(1234.5, "USD") == "1,234.50"
+    assert format_amount(1234.5, "JPY") == "1,234"
+    assert format_amount(Decimal("1.2345"), "KWD") == "1.234"
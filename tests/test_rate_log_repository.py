@@ -0,0 +1,56 @@
+"""
+Rate log: timeline index and retention
+"""
+import pytest
+
+pytest.importorskip("requests")  # services, imported by the repositories, need it
+
+from models import RateTable
+from repositories.rate_log_repository import RateLogRepository
+
+DAY = 86400.0
+START = 1700000000.0
+
+
+def _table(timestamp: float) -> RateTable:
+    return RateTable("USD", ["USD", "EUR"], [1.0, 0.9 + (timestamp - START) / DAY / 1000], timestamp)
+
+
+def _open(tmp_path, retention_days: float = 0) -> RateLogRepository:
+    return RateLogRepository(str(tmp_path / "rate_log.jsonl"), retention_days=retention_days)
+
+
+def test_timeline_survives_reopen(tmp_path):
+    log = _open(tmp_path)
+    for day in range(20):
+        assert log.record(_table(START + day * DAY))
+    reopened = _open(tmp_path)
+    assert reopened.count() == 20
+    assert reopened.get_rate_at("USD", "EUR", START + 5.5 * DAY) == pytest.approx(0.905)
+
+
+def test_retention_prunes_old_snapshots(tmp_path):
+    log = _open(tmp_path, retention_days=10)
+    for day in range(40):
+        log.record(_table(START + day * DAY))
+    first, last = log.get_range()
+    assert last - first <= 10 * DAY * (1 + RateLogRepository.PRUNE_SLACK)
+    assert log.get_rate_at("USD", "EUR", last) == pytest.approx(0.939)
+
+    reopened = _open(tmp_path, retention_days=10)
+    assert reopened.get_range() == (last - 10 * DAY, last)
+    assert reopened.get_rate_at("USD", "EUR", last - DAY) == pytest.approx(0.938)
+
+
+def test_index_from_before_a_rewrite_is_rebuilt(tmp_path):
+    log = _open(tmp_path)
+    for day in range(30):
+        log.record(_table(START + day * DAY))
+    stale_index = (tmp_path / "rate_log.jsonl.idx").read_bytes()
+
+    _open(tmp_path, retention_days=5)  # Rewrites the log
+    (tmp_path / "rate_log.jsonl.idx").write_bytes(stale_index)
+
+    reopened = _open(tmp_path)
+    assert reopened.count() == 6
+    assert reopened.get_rate_at("USD", "EUR", START + 29 * DAY) == pytest.approx(0.929)
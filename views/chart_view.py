@@ -0,0 +1,193 @@
+"""
+Chart view showing how a currency pair moved over time
+"""
+from datetime import timedelta
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton
+from controllers import CurrencyController
+from .rate_chart import RateChartWidget
+from .theme import ThemeColors, set_status
+from .workers import TaskWorker
+
+class ChartView(QWidget):
+    """View charting the historical rates of a pair"""
+
+    RANGES = [("1 month", 30), ("3 months", 91), ("1 year", 365),
+              ("5 years", 5 * 365), ("10 years", 10 * 365)]
+
+    def __init__(self, controller: CurrencyController):
+        super().__init__()
+        self._controller = controller
+        self._current_theme = None
+        self._currency_version = None
+        self._load_worker = None
+        self._loaded_series = None
+        self._backfill_worker = None
+        self._loaded_range = None
+        self._missing_days = 0
+        self.setObjectName("chartView")
+        self._setup_ui()
+        self.reload_currencies()
+
+        from_code, to_code = self._controller.get_default_currencies()
+        self._set_combo_value(self.from_combo, from_code)
+        self._set_combo_value(self.to_combo, to_code)
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(20)
+
+        # Header
+        title = QLabel("Rate Chart")
+        title.setObjectName("viewTitle")
+        layout.addWidget(title)
+
+        # Pair and range selection
+        controls_layout = QHBoxLayout()
+        self.from_combo = QComboBox()
+        self.from_combo.setObjectName("settingsCombo")
+        controls_layout.addWidget(self.from_combo)
+        controls_layout.addWidget(QLabel("→"))
+        self.to_combo = QComboBox()
+        self.to_combo.setObjectName("settingsCombo")
+        controls_layout.addWidget(self.to_combo)
+
+        self.range_combo = QComboBox()
+        self.range_combo.setObjectName("settingsCombo")
+        for label, days in self.RANGES:
+            self.range_combo.addItem(label, days)
+        self.range_combo.setCurrentIndex(2)
+        controls_layout.addWidget(self.range_combo)
+        controls_layout.addStretch()
+
+        self.load_btn = QPushButton("Load")
+        self.load_btn.setObjectName("actionButton")
+        self.load_btn.clicked.connect(self._load_series)
+        controls_layout.addWidget(self.load_btn)
+
+        # Shown when the loaded range has days missing from the historical cache
+        self.download_btn = QPushButton("Download missing days")
+        self.download_btn.setObjectName("secondaryButton")
+        self.download_btn.clicked.connect(self._download_missing)
+        self.download_btn.hide()
+        controls_layout.addWidget(self.download_btn)
+        layout.addLayout(controls_layout)
+
+        # Chart
+        self.chart = RateChartWidget()
+        layout.addWidget(self.chart, 1)
+
+        self.status_label = QLabel("Scroll to zoom, drag to pan, double-click to reset")
+        self.status_label.setObjectName("statusLabel")
+        layout.addWidget(self.status_label)
+
+    def reload_currencies(self):
+        """Rebuild the currency combos unless the currency list is the version already shown"""
+        version = self._controller.get_currency_version()
+        if version is not None and version == self._currency_version:
+            return
+        self._currency_version = version
+
+        combos = (self.from_combo, self.to_combo)
+        selected = [combo.currentData() for combo in combos]
+        for combo in combos:
+            combo.blockSignals(True)
+            combo.clear()
+        for code, _ in self._controller.get_available_currencies():
+            for combo in combos:
+                combo.addItem(code, code)
+        for combo, value in zip(combos, selected):
+            if value:
+                self._set_combo_value(combo, value)
+            combo.blockSignals(False)
+
+    def _set_combo_value(self, combo: QComboBox, value: str):
+        """Set combo box selection by data value"""
+        for i in range(combo.count()):
+            if combo.itemData(i) == value:
+                combo.setCurrentIndex(i)
+                break
+
+    def _load_series(self):
+        """Load the selected pair and range in the background"""
+        if self._load_worker and self._load_worker.isRunning():
+            self._load_worker.cancel()
+            return
+
+        from_code, to_code = self.from_combo.currentData(), self.to_combo.currentData()
+        if not from_code or not to_code:
+            return
+        end = self._controller.get_history_today()
+        start = end - timedelta(days=self.range_combo.currentData())
+
+        def task(progress_callback, is_cancelled):
+            success, series, message = self._controller.get_rate_series(
+                from_code, to_code, start, end, progress_callback, is_cancelled)
+            self._loaded_series = series if success else None
+            self._missing_days = self._controller.count_missing_history(start, end)
+            return success, message
+
+        self._loaded_range = (start, end)
+        self.download_btn.hide()
+
+        self._load_worker = TaskWorker(task, self)
+        self._load_worker.progress.connect(self._on_load_progress)
+        self._load_worker.task_finished.connect(self._on_load_finished)
+        self.load_btn.setText("✕ Cancel")
+        self.status_label.setText("⟳ Loading rates...")
+        set_status(self.status_label, "info")
+        self._load_worker.start()
+
+    def _on_load_progress(self, done: int, total: int):
+        percent = done * 100 // total if total else 100
+        self.status_label.setText(f"⟳ Loading rates... {done:,} / {total:,} days ({percent}%)")
+
+    def _on_load_finished(self, success: bool, message: str):
+        self.load_btn.setText("Load")
+        if success and self._loaded_series is not None:
+            self.chart.set_series(self._loaded_series)
+            self.status_label.setText(f"✓ {message}")
+            set_status(self.status_label, "success")
+        else:
+            self.status_label.setText(f"✗ {message}")
+            set_status(self.status_label, "error")
+        self._loaded_series = None
+        self.download_btn.setVisible(self._missing_days > 0)
+
+    def _download_missing(self):
+        """Backfill the days of the loaded range missing from the cache, then reload the chart"""
+        if self._backfill_worker and self._backfill_worker.isRunning():
+            self._backfill_worker.cancel()
+            return
+        if not self._loaded_range:
+            return
+
+        start, end = self._loaded_range
+        self._backfill_worker = TaskWorker(
+            lambda progress_callback, is_cancelled: self._controller.backfill_history(
+                start, end, progress_callback, is_cancelled), self)
+        self._backfill_worker.progress.connect(self._on_download_progress)
+        self._backfill_worker.task_finished.connect(self._on_download_finished)
+        self.download_btn.setText("✕ Cancel download")
+        self.load_btn.setEnabled(False)
+        self.status_label.setText(f"⟳ Downloading {self._missing_days:,} days...")
+        set_status(self.status_label, "info")
+        self._backfill_worker.start()
+
+    def _on_download_progress(self, done: int, total: int):
+        percent = done * 100 // total if total else 100
+        self.status_label.setText(f"⟳ Downloading rates... {done:,} / {total:,} days ({percent}%)")
+
+    def _on_download_finished(self, success: bool, message: str):
+        self.download_btn.setText("Download missing days")
+        self.load_btn.setEnabled(True)
+        if success:
+            self._load_series()
+        else:
+            self.status_label.setText(f"✗ {message}")
+            set_status(self.status_label, "error")
+
+    def update_theme(self, theme: ThemeColors):
+        """Remember the theme; the chart paints itself with its colors"""
+        self._current_theme = theme
+        self.chart.update_theme(theme)
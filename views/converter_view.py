@@ -5,8 +5,11 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QLineEdit, QPushButton, QComboBox, QFrame, 
                               QCompleter)
 from PyQt6.QtCore import Qt, QTimer
+from typing import List, Tuple
 from controllers import CurrencyController
-from .theme import ThemeColors
+from models.money import format_amount
+from .theme import ThemeColors, set_status
+from .target_panel import TargetPanel
 
 class MaterialCard(QFrame):
     """Material Design card widget"""
@@ -24,7 +27,9 @@ class ConverterView(QWidget):
     def __init__(self, controller: CurrencyController):
         super().__init__()
         self._controller = controller
-        self._current_theme = None # Store current theme for status updates
+        self._current_theme = None
+        self._currency_version = None
+        self.setObjectName("converterView")
         self._setup_ui()
         self._connect_signals()
         self._load_data()
@@ -54,6 +59,10 @@ class ConverterView(QWidget):
         result_card = self._create_result_card()
         main_layout.addWidget(result_card)
         
+        # One amount in many currencies, updated as the amount is typed
+        self.target_panel = TargetPanel(self._controller)
+        main_layout.addWidget(self.target_panel)
+        
         # Action buttons
         actions_layout = self._create_action_buttons()
         main_layout.addLayout(actions_layout)
@@ -239,6 +248,10 @@ class ConverterView(QWidget):
         
         # Enter key support
         self.amount_input.returnPressed.connect(self._perform_conversion)
+        
+        # Live one-to-many conversion; never written to history
+        self.amount_input.textChanged.connect(self._update_targets)
+        self.from_combo.currentIndexChanged.connect(self._update_targets)
     
     def _load_data(self):
         """Load initial data"""
@@ -249,13 +262,35 @@ class ConverterView(QWidget):
             self._update_status(f"✗ Initialization failed: {message}", "error")
             return
         
-        # Get available currencies
-        currencies = self._controller.get_available_currencies()
-        
+        currencies = self.reload_currencies()
         if not currencies:
             self._update_status("✗ No currencies loaded", "error")
             return
         
+        # Set defaults
+        default_from, default_to = self._controller.get_default_currencies()
+        self._set_currency_selection(self.from_combo, default_from)
+        self._set_currency_selection(self.to_combo, default_to)
+        self._update_targets()
+        
+        self._update_status(f"✓ Ready • {len(currencies)} currencies loaded", "success")
+    
+    def reload_currencies(self) -> List[Tuple[str, str]]:
+        """
+        Rebuild the currency combos and completers, unless the currency list
+        is the version already shown. Keeps the current selection.
+        """
+        currencies = self._controller.get_available_currencies()
+        version = self._controller.get_currency_version()
+        if not currencies or (version is not None and version == self._currency_version):
+            return currencies
+        self._currency_version = version
+        
+        selected_from = self._get_selected_currency(self.from_combo)
+        selected_to = self._get_selected_currency(self.to_combo)
+        self.from_combo.blockSignals(True)
+        self.to_combo.blockSignals(True)
+        
         # Populate combo boxes
         self.from_combo.clear()
         self.to_combo.clear()
@@ -279,12 +314,12 @@ class ConverterView(QWidget):
         to_completer.setFilterMode(Qt.MatchFlag.MatchContains)
         self.to_combo.setCompleter(to_completer)
         
-        # Set defaults
-        default_from, default_to = self._controller.get_default_currencies()
-        self._set_currency_selection(self.from_combo, default_from)
-        self._set_currency_selection(self.to_combo, default_to)
-        
-        self._update_status(f"✓ Ready • {len(currencies)} currencies loaded", "success")
+        self._set_currency_selection(self.from_combo, selected_from)
+        self._set_currency_selection(self.to_combo, selected_to)
+        self.from_combo.blockSignals(False)
+        self.to_combo.blockSignals(False)
+        self.target_panel.reload_currencies()
+        return currencies
     
     def _set_currency_selection(self, combo: QComboBox, code: str):
         """Set currency selection by code"""
@@ -335,7 +370,12 @@ class ConverterView(QWidget):
         
         self._update_status("⟳ Converting...", "info")
         
-        success, result, message = self._controller.convert(from_code, to_code, amount)
+        if self._controller.is_exact_mode():
+            # Convert the text as typed so no binary float enters the exact path
+            success, result, message = self._controller.convert_exact(
+                from_code, to_code, amount_str, save_history=True)
+        else:
+            success, result, message = self._controller.convert(from_code, to_code, amount)
         
         if not success:
             self._update_status(f"✗ Conversion failed: {message}", "error")
@@ -346,11 +386,11 @@ class ConverterView(QWidget):
         from_flag = self._get_flag(from_code)
         to_flag = self._get_flag(to_code)
         
-        self.from_amount_label.setText(f"{from_flag} {amount:,.2f} {from_code}")
-        self.to_amount_label.setText(f"{to_flag} {result:,.2f} {to_code}")
+        self.from_amount_label.setText(f"{from_flag} {format_amount(amount, from_code)} {from_code}")
+        self.to_amount_label.setText(f"{to_flag} {format_amount(result, to_code)} {to_code}")
         
         # Calculate and display rate
-        rate = result / amount if amount > 0 else 0
+        rate = float(result) / amount if amount > 0 else 0
         self.rate_info_label.setText(
             f"Exchange Rate: 1 {from_code} = {rate:.6f} {to_code}"
         )
@@ -423,123 +463,16 @@ class ConverterView(QWidget):
             except ValueError:
                 pass
     
+    def _update_targets(self):
+        """Recompute the one-to-many panel for the current amount and source currency"""
+        self.target_panel.set_source(self._get_selected_currency(self.from_combo),
+                                     self.amount_input.text().strip())
+    
     def _update_status(self, message: str, status_type: str = "info"):
         """Update status label with styled message"""
         self.status_label.setText(message)
-        
-        # Use theme colors if available, otherwise fallback
-        if self._current_theme:
-            colors = {
-                "info": self._current_theme.info,
-                "success": self._current_theme.success,
-                "error": self._current_theme.error,
-                "warning": self._current_theme.warning
-            }
-            color = colors.get(status_type, self._current_theme.info)
-        else:
-            # Fallback colors
-            colors = {
-                "info": "#2196F3",
-                "success": "#4CAF50",
-                "error": "#F44336",
-                "warning": "#FF9800"
-            }
-            color = colors.get(status_type, "#2196F3")
-            
-        self.status_label.setStyleSheet(f"color: {color}; font-weight: bold;")
+        set_status(self.status_label, status_type)
 
     def update_theme(self, theme: ThemeColors):
-        """Update view styles based on theme"""
+        """Remember the theme; styling comes from the application stylesheet"""
         self._current_theme = theme
-        
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {theme.background};
-                color: {theme.text_primary};
-            }}
-            QLabel#appTitle {{
-                font-size: 24px;
-                font-weight: bold;
-                color: {theme.primary};
-            }}
-            QLabel#appSubtitle {{
-                font-size: 14px;
-                color: {theme.text_secondary};
-            }}
-            QFrame#materialCard {{
-                background-color: {theme.surface};
-                border: 1px solid {theme.border};
-                border-radius: 8px;
-            }}
-            QLabel#fieldLabel {{
-                font-weight: bold;
-                color: {theme.text_secondary};
-            }}
-            QLineEdit {{
-                padding: 10px;
-                border: 1px solid {theme.input_border};
-                border-radius: 4px;
-                background-color: {theme.input_bg};
-                color: {theme.text_primary};
-                font-size: 16px;
-            }}
-            QComboBox {{
-                padding: 10px;
-                border: 1px solid {theme.input_border};
-                border-radius: 4px;
-                background-color: {theme.input_bg};
-                color: {theme.text_primary};
-                font-size: 16px;
-            }}
-            QPushButton#swapButton {{
-                background-color: {theme.surface};
-                border: 1px solid {theme.border};
-                border-radius: 28px;
-                font-size: 24px;
-                color: {theme.primary};
-            }}
-            QPushButton#swapButton:hover {{
-                background-color: {theme.hover};
-            }}
-            QPushButton#primaryButton {{
-                background-color: {theme.primary};
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-weight: bold;
-                font-size: 16px;
-            }}
-            QPushButton#primaryButton:hover {{
-                background-color: {theme.selected_text};
-            }}
-            QPushButton#secondaryButton {{
-                background-color: {theme.secondary_btn_bg};
-                color: {theme.secondary_btn_text};
-                border: none;
-                border-radius: 4px;
-                font-weight: bold;
-            }}
-            QPushButton#secondaryButton:hover {{
-                background-color: {theme.hover};
-            }}
-            QLabel#cardTitle {{
-                font-size: 18px;
-                font-weight: bold;
-                color: {theme.text_primary};
-            }}
-            QLabel#fromAmount, QLabel#toAmount {{
-                font-size: 24px;
-                font-weight: bold;
-                color: {theme.text_primary};
-            }}
-            QLabel#arrowSeparator {{
-                font-size: 24px;
-                color: {theme.text_secondary};
-            }}
-            QLabel#resultInfo, QLabel#rateInfo {{
-                color: {theme.text_secondary};
-            }}
-        """)
-        
-        # Re-apply status style with new theme
-        self._update_status(self.status_label.text(), "info")
@@ -0,0 +1,100 @@
+"""
+Dialog for choosing history export options
+"""
+from datetime import datetime, time
+from PyQt6.QtWidgets import (QDialog, QFormLayout, QComboBox, QDateEdit, QCheckBox,
+                              QDialogButtonBox, QHBoxLayout, QLineEdit, QPushButton,
+                              QFileDialog, QWidget)
+from PyQt6.QtCore import QDate
+from services import EXPORT_FORMATS
+
+
+class ExportDialog(QDialog):
+    """Collects the destination file, format and filters for a history export"""
+
+    def __init__(self, currencies, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Export History")
+        self.setMinimumWidth(460)
+        self._setup_ui(currencies)
+
+    def _setup_ui(self, currencies):
+        layout = QFormLayout(self)
+        layout.setSpacing(12)
+
+        # Destination
+        path_row = QWidget()
+        path_layout = QHBoxLayout(path_row)
+        path_layout.setContentsMargins(0, 0, 0, 0)
+        self.path_input = QLineEdit()
+        self.path_input.setPlaceholderText("Choose a file...")
+        path_layout.addWidget(self.path_input)
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self._browse)
+        path_layout.addWidget(browse_btn)
+        layout.addRow("File:", path_row)
+
+        self.format_combo = QComboBox()
+        for fmt, label in EXPORT_FORMATS.items():
+            self.format_combo.addItem(label, fmt)
+        layout.addRow("Format:", self.format_combo)
+
+        # Date range
+        self.date_filter_check = QCheckBox("Only transactions between")
+        layout.addRow(self.date_filter_check)
+
+        today = QDate.currentDate()
+        self.start_date = QDateEdit(today.addMonths(-1))
+        self.start_date.setCalendarPopup(True)
+        self.end_date = QDateEdit(today)
+        self.end_date.setCalendarPopup(True)
+        layout.addRow("From date:", self.start_date)
+        layout.addRow("To date:", self.end_date)
+
+        # Pair
+        self.from_combo = QComboBox()
+        self.to_combo = QComboBox()
+        for combo in (self.from_combo, self.to_combo):
+            combo.addItem("Any currency", None)
+            for code, name in currencies:
+                combo.addItem(f"{code} - {name}", code)
+        layout.addRow("From currency:", self.from_combo)
+        layout.addRow("To currency:", self.to_combo)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok |
+                                   QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self._accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def _browse(self):
+        """Pick the destination file"""
+        filters = ";;".join(EXPORT_FORMATS.values())
+        selected = EXPORT_FORMATS[self.format_combo.currentData()]
+        path, chosen = QFileDialog.getSaveFileName(self, "Export History", "history", filters, selected)
+        if path:
+            for fmt, label in EXPORT_FORMATS.items():
+                if label == chosen:
+                    self.format_combo.setCurrentIndex(self.format_combo.findData(fmt))
+                    if not path.lower().endswith(f".{fmt}"):
+                        path += f".{fmt}"
+            self.path_input.setText(path)
+
+    def _accept(self):
+        if self.path_input.text().strip():
+            self.accept()
+
+    def get_options(self) -> dict:
+        """Export options as keyword arguments for CurrencyController.export_history"""
+        start = end = None
+        if self.date_filter_check.isChecked():
+            start = datetime.combine(self.start_date.date().toPyDate(), time.min)
+            end = datetime.combine(self.end_date.date().toPyDate(), time.max)
+        return {
+            "path": self.path_input.text().strip(),
+            "fmt": self.format_combo.currentData(),
+            "start": start,
+            "end": end,
+            "from_currency": self.from_combo.currentData(),
+            "to_currency": self.to_combo.currentData(),
+        }
@@ -1,11 +1,15 @@
 """
 History view for displaying transaction logs
 """
+from functools import partial
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTableWidget, 
                               QTableWidgetItem, QHeaderView, QPushButton, QHBoxLayout)
 from PyQt6.QtCore import Qt
 from controllers import CurrencyController
+from models.money import format_amount
 from .theme import ThemeColors
+from .export_dialog import ExportDialog
+from .workers import TaskWorker
 
 class HistoryView(QWidget):
     """View for displaying transaction history"""
@@ -14,6 +18,10 @@ class HistoryView(QWidget):
         super().__init__()
         self._controller = controller
         self._current_theme = None
+        self.setObjectName("historyView")
+        self._export_worker = None
+        self._total = 0
+        self._rollups_loaded = False
         self._setup_ui()
         
     def _setup_ui(self):
@@ -35,6 +43,11 @@ class HistoryView(QWidget):
         self.refresh_btn.clicked.connect(self.refresh_data)
         header_layout.addWidget(self.refresh_btn)
         
+        self.export_btn = QPushButton("⤓ Export")
+        self.export_btn.setObjectName("actionButton")
+        self.export_btn.clicked.connect(self._export_history)
+        header_layout.addWidget(self.export_btn)
+        
         self.clear_btn = QPushButton("🗑️ Clear History")
         self.clear_btn.setObjectName("dangerButton")
         self.clear_btn.clicked.connect(self._clear_history)
@@ -50,102 +63,113 @@ class HistoryView(QWidget):
         self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.table.verticalHeader().setVisible(False)
+        self.table.verticalScrollBar().valueChanged.connect(self._on_scroll)
         layout.addWidget(self.table)
         
+        # Export progress
+        self.status_label = QLabel("")
+        self.status_label.setObjectName("statusLabel")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.status_label)
+        
         # Initial load
         self.refresh_data()
         
     def refresh_data(self):
-        """Reload history data from controller"""
-        transactions = self._controller.get_history()
-        self.table.setRowCount(len(transactions))
-        
-        for i, t in enumerate(transactions):
-            # Date
-            date_item = QTableWidgetItem(t.timestamp.strftime("%Y-%m-%d %H:%M"))
-            date_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 0, date_item)
-            
-            # From
-            from_item = QTableWidgetItem(f"{t.amount:,.2f} {t.from_currency}")
-            from_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 1, from_item)
-            
-            # To
-            to_item = QTableWidgetItem(f"{t.result:,.2f} {t.to_currency}")
-            to_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 2, to_item)
-            
-            # Rate
-            rate_item = QTableWidgetItem(f"{t.rate:.4f}")
-            rate_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 3, rate_item)
-            
-            # Result (Summary)
-            summary = f"{t.from_currency} → {t.to_currency}"
-            summary_item = QTableWidgetItem(summary)
-            summary_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 4, summary_item)
+        """Reload history from the newest page"""
+        self._total = self._controller.get_history_count()
+        self._rollups_loaded = False
+        scroll_bar = self.table.verticalScrollBar()
+        scroll_bar.blockSignals(True)
+        self.table.setRowCount(0)
+        scroll_bar.blockSignals(False)
+        self._load_next_page()
+    
+    def _on_scroll(self, value: int):
+        """Stream in older pages when scrolled to the bottom"""
+        if value >= self.table.verticalScrollBar().maximum():
+            self._load_next_page()
+    
+    def _load_next_page(self):
+        """Append the next page of older transactions, then the daily rollups"""
+        offset = self.table.rowCount()
+        if offset >= self._total:
+            self._load_rollups()
+            return
+        
+        transactions = self._controller.get_history_page(offset // self._controller.get_history_page_size())
+        self.table.setRowCount(offset + len(transactions))
+        
+        for i, t in enumerate(transactions, offset):
+            self._set_row(i, [
+                t.timestamp.strftime("%Y-%m-%d %H:%M"),
+                f"{format_amount(t.amount, t.from_currency)} {t.from_currency}",
+                f"{format_amount(t.exact_result, t.to_currency)} {t.to_currency}",
+                f"{t.rate:.4f}",
+                f"{t.from_currency} → {t.to_currency}",
+            ])
+    
+    def _load_rollups(self):
+        """Append compacted history as one row per day and currency pair"""
+        if self._rollups_loaded:
+            return
+        self._rollups_loaded = True
+        
+        rollups = self._controller.get_history_rollups()
+        offset = self.table.rowCount()
+        self.table.setRowCount(offset + len(rollups))
+        
+        for i, r in enumerate(rollups, offset):
+            self._set_row(i, [
+                f"{r.date.isoformat()} (daily)",
+                f"{format_amount(r.total_amount, r.from_currency)} {r.from_currency}",
+                f"{format_amount(r.total_result, r.to_currency)} {r.to_currency}",
+                f"{r.avg_rate:.4f} ({r.min_rate:.4f}–{r.max_rate:.4f})",
+                f"{r.from_currency} → {r.to_currency} ×{r.count}",
+            ], tooltip=f"{r.count} conversions rolled up")
+    
+    def _set_row(self, row: int, values, tooltip: str = ""):
+        """Fill one table row with centered cells"""
+        for column, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            if tooltip:
+                item.setToolTip(tooltip)
+            self.table.setItem(row, column, item)
             
+    def _export_history(self):
+        """Export history in the background"""
+        if self._export_worker and self._export_worker.isRunning():
+            self._export_worker.cancel()
+            return
+        
+        dialog = ExportDialog(self._controller.get_available_currencies(), self)
+        if not dialog.exec():
+            return
+        
+        task = partial(self._controller.export_history, **dialog.get_options())
+        self._export_worker = TaskWorker(task, self)
+        self._export_worker.progress.connect(self._on_export_progress)
+        self._export_worker.task_finished.connect(self._on_export_finished)
+        self.export_btn.setText("✕ Cancel Export")
+        self.status_label.setText("⟳ Exporting...")
+        self._export_worker.start()
+    
+    def _on_export_progress(self, done: int, total: int):
+        """Show export progress"""
+        percent = done * 100 // total if total else 100
+        self.status_label.setText(f"⟳ Exporting... {done:,} / {total:,} ({percent}%)")
+    
+    def _on_export_finished(self, success: bool, message: str):
+        """Report export result"""
+        self.export_btn.setText("⤓ Export")
+        self.status_label.setText(f"✓ {message}" if success else f"✗ {message}")
+    
     def _clear_history(self):
         """Clear all history"""
         self._controller.clear_history()
         self.refresh_data()
         
     def update_theme(self, theme: ThemeColors):
-        """Update view styles based on theme"""
+        """Remember the theme; styling comes from the application stylesheet"""
         self._current_theme = theme
-        
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {theme.background};
-                color: {theme.text_primary};
-            }}
-            QLabel#viewTitle {{
-                font-size: 24px;
-                font-weight: bold;
-                color: {theme.text_primary};
-            }}
-            QPushButton#actionButton {{
-                background-color: {theme.surface};
-                color: {theme.text_primary};
-                border: 1px solid {theme.border};
-                padding: 8px 16px;
-                border-radius: 4px;
-            }}
-            QPushButton#actionButton:hover {{
-                background-color: {theme.hover};
-            }}
-            QPushButton#dangerButton {{
-                background-color: {theme.surface};
-                color: {theme.error};
-                border: 1px solid {theme.error};
-                padding: 8px 16px;
-                border-radius: 4px;
-            }}
-            QPushButton#dangerButton:hover {{
-                background-color: {theme.error};
-                color: white;
-            }}
-            QTableWidget {{
-                background-color: {theme.surface};
-                gridline-color: {theme.border};
-                border: 1px solid {theme.border};
-                border-radius: 8px;
-            }}
-            QHeaderView::section {{
-                background-color: {theme.background};
-                color: {theme.text_secondary};
-                padding: 8px;
-                border: none;
-                font-weight: bold;
-            }}
-            QTableWidget::item {{
-                padding: 5px;
-                border-bottom: 1px solid {theme.border};
-            }}
-            QTableWidget::item:selected {{
-                background-color: {theme.selected_bg};
-                color: {theme.selected_text};
-            }}
-        """)
@@ -2,25 +2,45 @@
 Main view for the Currency Converter application  
 Material Design inspired UI with enhanced UX and Navigation
 """
-from PyQt6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QStackedWidget, QLabel, QApplication)
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QStackedWidget, QLabel, QApplication,
+                             QComboBox, QTableWidget, QListWidget)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from typing import Dict
 from config import Config
 from controllers import CurrencyController
 from .sidebar import Sidebar
 from .converter_view import ConverterView
 from .history_view import HistoryView
 from .settings_view import SettingsView
-from .theme import LIGHT_THEME, DARK_THEME
+from .statistics_view import StatisticsView
+from .chart_view import ChartView
+from .matrix_view import MatrixView
+from .theme import LIGHT_THEME, DARK_THEME, build_stylesheet
+from .workers import TaskWorker
 
 class MainWindow(QMainWindow):
     """Main application window with Sidebar Navigation"""
     
+    # Carries alert messages to the GUI thread, whichever thread refreshed the rates
+    alerts_triggered = pyqtSignal(str)
+    
     def __init__(self, controller: CurrencyController, settings_repo):
         super().__init__()
         self._controller = controller
         self.settings_repo = settings_repo
+        self._compaction_worker = None
+        self._currency_worker = None
+        self._current_theme = None
+        self._prewarm_started = False
         self._setup_ui()
         self._init_theme()
+        self._schedule_compaction()
+        self._schedule_memory_checks()
+        self._schedule_currency_refresh()
+        
+        self.alerts_triggered.connect(self._show_alerts)
+        self._controller.subscribe_alerts(
+            lambda events: self.alerts_triggered.emit("  •  ".join(e.describe() for e in events)))
     
     def _setup_ui(self):
         """Setup the main window layout with sidebar and content area"""
@@ -44,27 +64,137 @@ class MainWindow(QMainWindow):
         self.content_stack = QStackedWidget()
         main_layout.addWidget(self.content_stack)
         
-        # -- Page 1: Converter View --
-        self.converter_view = ConverterView(self._controller)
-        self.content_stack.addWidget(self.converter_view)
-        
-        # -- Page 2: History View --
-        self.history_view = HistoryView(self._controller)
-        self.content_stack.addWidget(self.history_view)
+        # Pages are built on first navigation (or when idle after first paint);
+        # until then the stack holds a lightweight placeholder in their slot.
+        # Index order matches the sidebar signals: converter, history, settings, statistics, chart, matrix.
+        self._page_factories = [
+            ("converter_view", ConverterView),
+            ("history_view", HistoryView),
+            ("settings_view", SettingsView),
+            ("statistics_view", StatisticsView),
+            ("chart_view", ChartView),
+            ("matrix_view", MatrixView),
+        ]
+        self._pages: Dict[int, QWidget] = {}
+        for attr, _ in self._page_factories:
+            setattr(self, attr, None)
+            self.content_stack.addWidget(self._create_placeholder_view("Loading...", "Preparing this page"))
         
-        # -- Page 3: Settings View --
-        self.settings_view = SettingsView(self._controller)
-        self.content_stack.addWidget(self.settings_view)
+        # Only the page the user sees first is built up front
+        self._ensure_page(0)
+        self.content_stack.setCurrentIndex(0)
         
         # Connect Sidebar to Stack
         self.sidebar.page_changed.connect(self._on_page_changed)
 
+    def _ensure_page(self, index: int) -> QWidget:
+        """Build the page at `index` if needed, swapping out its placeholder"""
+        page = self._pages.get(index)
+        if page is not None:
+            return page
+        
+        attr, factory = self._page_factories[index]
+        page = factory(self._controller)
+        if self._current_theme:
+            page.update_theme(self._current_theme)
+        
+        placeholder = self.content_stack.widget(index)
+        is_current = self.content_stack.currentIndex() == index
+        self.content_stack.insertWidget(index, page)
+        self.content_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        if is_current:
+            self.content_stack.setCurrentIndex(index)
+        
+        self._pages[index] = page
+        setattr(self, attr, page)
+        return page
+
+    def showEvent(self, event):
+        """Start pre-warming the remaining pages once the window is first shown"""
+        super().showEvent(event)
+        if not self._prewarm_started:
+            self._prewarm_started = True
+            # A zero timeout fires after pending paint events, i.e. after first paint
+            QTimer.singleShot(0, self._prewarm_next_page)
+
+    def _prewarm_next_page(self):
+        """Build one unbuilt page per event loop turn so the UI stays responsive"""
+        for index in range(len(self._page_factories)):
+            if index not in self._pages:
+                self._ensure_page(index)
+                QTimer.singleShot(0, self._prewarm_next_page)
+                return
+
     def _on_page_changed(self, index: int):
         """Handle page change"""
+        self._ensure_page(index)
         self.content_stack.setCurrentIndex(index)
         # Refresh history when switching to it
         if index == 1:
             self.history_view.refresh_data()
+        elif index == 3:
+            self.statistics_view.refresh_data()
+
+    def _show_alerts(self, message: str):
+        """Show fired rate alerts in the status bar"""
+        self.statusBar().showMessage(f"🔔 {message}", 30000)
+
+    def _schedule_compaction(self):
+        """Compact old history shortly after startup and then every hour"""
+        QTimer.singleShot(5000, self._compact_history)
+        self._compaction_timer = QTimer(self)
+        self._compaction_timer.timeout.connect(self._compact_history)
+        self._compaction_timer.start(60 * 60 * 1000)
+
+    def _compact_history(self):
+        """Roll up history past the retention period in the background"""
+        if self._compaction_worker and self._compaction_worker.isRunning():
+            return
+        if self._controller.get_retention_days() <= 0:
+            return
+        self._compaction_worker = TaskWorker(self._controller.compact_history, self)
+        self._compaction_worker.start()
+
+    def _schedule_currency_refresh(self):
+        """Check the currency list in the background; the repository limits fetches to one a day"""
+        QTimer.singleShot(10000, self._refresh_currencies)
+        self._currency_timer = QTimer(self)
+        self._currency_timer.timeout.connect(self._refresh_currencies)
+        self._currency_timer.start(60 * 60 * 1000)
+
+    def _refresh_currencies(self):
+        """Refetch the currency list off the GUI thread"""
+        if self._currency_worker and self._currency_worker.isRunning():
+            return
+        self._currency_worker = TaskWorker(self._controller.refresh_currency_catalogue, self)
+        self._currency_worker.task_finished.connect(self._on_currencies_refreshed)
+        self._currency_worker.start()
+
+    def _on_currencies_refreshed(self, success: bool, message: str):
+        """Rebuild currency combos on built pages; unchanged lists are skipped by version"""
+        if not success:
+            return
+        for page in self._pages.values():
+            if hasattr(page, "reload_currencies"):
+                page.reload_currencies()
+
+    def _schedule_memory_checks(self):
+        """Periodically warn about repositories over their memory budget"""
+        self._controller.register_memory_counts("views", self.get_widget_counts)
+        self._memory_timer = QTimer(self)
+        self._memory_timer.timeout.connect(self._controller.check_memory_budgets)
+        self._memory_timer.start(Config.MEMORY_CHECK_INTERVAL * 1000)
+
+    def get_widget_counts(self) -> Dict[str, int]:
+        """Items held in combo, table and list models of each built page"""
+        counts = {}
+        for index, page in self._pages.items():
+            items = sum(combo.count() for combo in page.findChildren(QComboBox))
+            items += sum(table.rowCount() * table.columnCount() for table in page.findChildren(QTableWidget))
+            items += sum(widget.count() for widget in page.findChildren(QListWidget))
+            counts[self._page_factories[index][0]] = items
+        return counts
 
     def _create_placeholder_view(self, title: str, subtitle: str) -> QWidget:
         """Create a simple placeholder view for unimplemented pages"""
@@ -72,8 +202,8 @@ class MainWindow(QMainWindow):
         layout = QHBoxLayout(widget)
         
         label = QLabel(f"{title}\n\n{subtitle}")
+        label.setObjectName("placeholderLabel")
         label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        # Style will be set by theme
         
         layout.addWidget(label)
         return widget
@@ -110,22 +240,11 @@ class MainWindow(QMainWindow):
 
     def _apply_theme(self, theme):
         """Apply theme to all components"""
-        self.setStyleSheet(f"background-color: {theme.background};")
-        self.content_stack.setStyleSheet(f"background-color: {theme.background};")
+        self._current_theme = theme
+        # One cached application-wide stylesheet: a single style recalculation per switch
+        QApplication.instance().setStyleSheet(build_stylesheet(theme))
         
         self.sidebar.update_theme(theme)
-        self.converter_view.update_theme(theme)
-        self.history_view.update_theme(theme)
-        self.settings_view.update_theme(theme)
-        
-        # Update placeholders
-        for i in range(self.content_stack.count()):
-            widget = self.content_stack.widget(i)
-            if widget not in [self.converter_view, self.history_view, self.settings_view]:
-                # It's a placeholder
-                widget.setStyleSheet(f"background-color: {theme.background};")
-                # Find label
-                label = widget.findChild(QLabel)
-                if label:
-                    label.setStyleSheet(f"font-size: 18px; color: {theme.text_secondary};")
-
+        # Pages not built yet pick the theme up when they are created
+        for page in self._pages.values():
+            page.update_theme(theme)
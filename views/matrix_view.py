@@ -0,0 +1,170 @@
+"""
+Cross-rate matrix view of every currency against every other
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTableView,
+                             QHeaderView)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from controllers import CurrencyController
+from models import RateTable
+from .theme import ThemeColors
+from .workers import RateChangeRelay
+
+
+class CrossRateModel(QAbstractTableModel):
+    """
+    Virtual table of cross rates: cell (row, column) is how many units of
+    the column currency one unit of the row currency buys.
+
+    Nothing is stored per cell. A cell is computed from the rate vector
+    when the view asks for it, i.e. only for the cells on screen, and the
+    formatted text of recently shown cells is kept in a small LRU so
+    scrolling back and forth does not format them again.
+    """
+
+    CACHE_SIZE = 4096
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._codes: Tuple[str, ...] = ()
+        self._rates = None
+        self._cache: "OrderedDict[Tuple[int, int], str]" = OrderedDict()
+
+    def set_table(self, table: Optional[RateTable]):
+        """Show new rates; same currencies only repaint, a new currency list resets the model"""
+        codes = tuple(table.get_codes()) if table is not None else ()
+        rates = table.get_rates() if table is not None else None
+        self._cache.clear()
+        if codes == self._codes:
+            self._rates = rates
+            if codes:
+                self.dataChanged.emit(self.index(0, 0), self.index(len(codes) - 1, len(codes) - 1),
+                                      [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole])
+            return
+
+        self.beginResetModel()
+        self._codes = codes
+        self._rates = rates
+        self.endResetModel()
+
+    def codes(self) -> Tuple[str, ...]:
+        return self._codes
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._codes)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._codes)
+
+    def rate(self, row: int, column: int) -> Optional[float]:
+        base = self._rates[row]
+        return self._rates[column] / base if base else None
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            key = (row, column)
+            text = self._cache.get(key)
+            if text is None:
+                rate = self.rate(row, column)
+                text = _format_rate(rate) if rate is not None else "—"
+                self._cache[key] = text
+                if len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+            return text
+        if role == Qt.ItemDataRole.ToolTipRole:
+            rate = self.rate(row, column)
+            if rate is None:
+                return None
+            return f"1 {self._codes[row]} = {_format_rate(rate)} {self._codes[column]}"
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and 0 <= section < len(self._codes):
+            return self._codes[section]
+        return None
+
+
+class MatrixView(QWidget):
+    """View showing the cross rate of every currency pair"""
+
+    def __init__(self, controller: CurrencyController):
+        super().__init__()
+        self._controller = controller
+        self._current_theme = None
+        self.setObjectName("matrixView")
+        self._setup_ui()
+
+        self._rate_relay = RateChangeRelay(controller, self)
+        self._rate_relay.rates_changed.connect(self.refresh_data)
+        self.refresh_data()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(20)
+
+        # Header
+        header_layout = QHBoxLayout()
+        title = QLabel("Cross Rates")
+        title.setObjectName("viewTitle")
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+
+        self.find_input = QLineEdit()
+        self.find_input.setObjectName("findInput")
+        self.find_input.setPlaceholderText("Go to currency...")
+        self.find_input.setMaximumWidth(200)
+        self.find_input.textChanged.connect(self._go_to_currency)
+        header_layout.addWidget(self.find_input)
+        layout.addLayout(header_layout)
+
+        caption = QLabel("Units of the column currency per one unit of the row currency")
+        caption.setObjectName("appSubtitle")
+        layout.addWidget(caption)
+
+        # Matrix
+        self.model = CrossRateModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setWordWrap(False)
+        # Fixed section sizes: the view never measures cells it does not show
+        for header, size in ((self.table.horizontalHeader(), 96), (self.table.verticalHeader(), 28)):
+            header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+            header.setDefaultSectionSize(size)
+        layout.addWidget(self.table)
+
+    def refresh_data(self):
+        """Show the current rates"""
+        self.model.set_table(self._controller.get_rate_table())
+
+    def _go_to_currency(self, text: str):
+        """Scroll the row and column of the first code starting with `text` into view"""
+        text = text.strip().upper()
+        if not text:
+            return
+        for i, code in enumerate(self.model.codes()):
+            if code.startswith(text):
+                self.table.scrollTo(self.model.index(i, i), QTableView.ScrollHint.PositionAtCenter)
+                self.table.setCurrentIndex(self.model.index(i, i))
+                return
+
+    def update_theme(self, theme: ThemeColors):
+        """Remember the theme; styling comes from the application stylesheet"""
+        self._current_theme = theme
+
+
+def _format_rate(rate: float) -> str:
+    if rate >= 1000:
+        return f"{rate:,.2f}"
+    if rate >= 1:
+        return f"{rate:.4f}"
+    return f"{rate:.6g}"
@@ -0,0 +1,166 @@
+"""
+Line chart widget for rate series, with pan and zoom
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QPainter, QPen, QColor, QPolygonF
+from models import RateSeries
+from .theme import ThemeColors, LIGHT_THEME
+
+
+class RateChartWidget(QWidget):
+    """
+    Draws a RateSeries with QPainter.
+
+    Each repaint asks the series for the points of the visible range at
+    the plot's pixel width, so the cost of a frame depends on the widget
+    size, not on the length of the series. The last set of points is kept
+    for repaints that do not move the view. Wheel zooms around the cursor,
+    dragging pans, double click shows the whole series.
+    """
+
+    MARGINS = (64, 12, 16, 28)  # left, top, right, bottom
+    GRID_LINES = 5
+    MIN_SPAN = 60 * 60.0        # Seconds; zooming in stops at one hour
+    ZOOM_STEP = 0.8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(240)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self._series: Optional[RateSeries] = None
+        self._view: Optional[Tuple[float, float]] = None
+        self._theme = LIGHT_THEME
+        self._drag_x: Optional[float] = None
+        self._drag_view: Optional[Tuple[float, float]] = None
+        self._points_key = None
+        self._points: List[Tuple[float, float]] = []
+
+    def set_series(self, series: Optional[RateSeries]):
+        """Show a new series in full"""
+        self._series = series
+        self._points_key = None
+        self.reset_view()
+
+    def reset_view(self):
+        self._view = self._series.get_range() if self._series is not None else None
+        self.update()
+
+    def update_theme(self, theme: ThemeColors):
+        self._theme = theme
+        self.update()
+
+    def _plot_rect(self) -> QRectF:
+        left, top, right, bottom = self.MARGINS
+        return QRectF(left, top, max(self.width() - left - right, 1), max(self.height() - top - bottom, 1))
+
+    def _visible_points(self, width: int) -> List[Tuple[float, float]]:
+        key = (self._view, width)
+        if key != self._points_key:
+            self._points = self._series.visible_points(self._view[0], self._view[1], width)
+            self._points_key = key
+        return self._points
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(self._theme.surface))
+        plot = self._plot_rect()
+
+        if self._series is None or self._view is None or not len(self._series):
+            painter.setPen(QColor(self._theme.text_secondary))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "No data")
+            return
+
+        points = self._visible_points(int(plot.width()))
+        start, end = self._view
+        span = max(end - start, 1e-9)
+        low = min(v for _, v in points)
+        high = max(v for _, v in points)
+        padding = (high - low) * 0.05 or abs(high) * 0.01 or 1.0
+        low, high = low - padding, high + padding
+
+        def x_at(t: float) -> float:
+            return plot.left() + (t - start) / span * plot.width()
+
+        def y_at(v: float) -> float:
+            return plot.bottom() - (v - low) / (high - low) * plot.height()
+
+        # Grid and labels
+        grid_pen = QPen(QColor(self._theme.border))
+        text_color = QColor(self._theme.text_secondary)
+        date_format = "%Y-%m-%d" if span > 2 * 86400 else "%m-%d %H:%M"
+        for i in range(self.GRID_LINES + 1):
+            value = low + (high - low) * i / self.GRID_LINES
+            y = y_at(value)
+            painter.setPen(grid_pen)
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.setPen(text_color)
+            painter.drawText(QRectF(0, y - 8, plot.left() - 6, 16),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, _format_value(value))
+        for i in range(self.GRID_LINES + 1):
+            t = start + span * i / self.GRID_LINES
+            x = x_at(t)
+            painter.setPen(grid_pen)
+            painter.drawLine(QPointF(x, plot.top()), QPointF(x, plot.bottom()))
+            painter.setPen(text_color)
+            painter.drawText(QRectF(x - 50, plot.bottom() + 4, 100, 18), Qt.AlignmentFlag.AlignHCenter,
+                             datetime.fromtimestamp(t).strftime(date_format))
+
+        # Series
+        painter.setClipRect(plot)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        pen = QPen(QColor(self._theme.primary))
+        pen.setWidthF(1.5)
+        painter.setPen(pen)
+        painter.drawPolyline(QPolygonF([QPointF(x_at(t), y_at(v)) for t, v in points]))
+
+    def wheelEvent(self, event):
+        if self._view is None:
+            return
+        steps = event.angleDelta().y() / 120
+        if not steps:
+            return
+        plot = self._plot_rect()
+        start, end = self._view
+        fraction = min(max((event.position().x() - plot.left()) / plot.width(), 0.0), 1.0)
+        anchor = start + (end - start) * fraction
+        span = max((end - start) * self.ZOOM_STEP ** steps, self.MIN_SPAN)
+        self._set_view(anchor - span * fraction, anchor + span * (1 - fraction))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton and self._view is not None:
+            self._drag_x = event.position().x()
+            self._drag_view = self._view
+            self.setCursor(Qt.CursorShape.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_x is None:
+            return
+        start, end = self._drag_view
+        shift = (self._drag_x - event.position().x()) / self._plot_rect().width() * (end - start)
+        self._set_view(start + shift, end + shift)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_x = None
+        self.unsetCursor()
+
+    def mouseDoubleClickEvent(self, event):
+        self.reset_view()
+
+    def _set_view(self, start: float, end: float):
+        """Move the view, keeping it within the series"""
+        first, last = self._series.get_range()
+        span = min(end - start, last - first)
+        start = min(max(start, first), last - span)
+        self._view = (start, start + span)
+        self.update()
+
+
+def _format_value(value: float) -> str:
+    if abs(value) >= 1000:
+        return f"{value:,.0f}"
+    if abs(value) >= 1:
+        return f"{value:,.4f}"
+    return f"{value:.6f}"
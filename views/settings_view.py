@@ -1,11 +1,14 @@
 """
 Settings view for application configuration
 """
+import html
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QComboBox, 
-                              QGroupBox, QFormLayout, QPushButton)
+                              QGroupBox, QFormLayout, QPushButton, QCheckBox,
+                              QSpinBox, QDoubleSpinBox, QListWidget, QListWidgetItem,
+                              QHBoxLayout, QMessageBox)
 from PyQt6.QtCore import Qt
 from controllers import CurrencyController
-from .theme import ThemeColors
+from .theme import ThemeColors, set_status
 
 class SettingsView(QWidget):
     """View for configuring application settings"""
@@ -14,6 +17,8 @@ class SettingsView(QWidget):
         super().__init__()
         self._controller = controller
         self._current_theme = None
+        self._currency_version = None
+        self.setObjectName("settingsView")
         self._setup_ui()
         self._load_settings()
         
@@ -43,6 +48,47 @@ class SettingsView(QWidget):
         
         layout.addWidget(self.defaults_group)
         
+        # Conversion Group
+        self.conversion_group = QGroupBox("Conversion")
+        self.conversion_group.setObjectName("settingsGroup")
+        conversion_layout = QVBoxLayout(self.conversion_group)
+        
+        self.exact_mode_check = QCheckBox("Exact fixed-point conversion (rounded to minor units)")
+        conversion_layout.addWidget(self.exact_mode_check)
+        
+        layout.addWidget(self.conversion_group)
+        
+        # History Group
+        self.history_group = QGroupBox("History")
+        self.history_group.setObjectName("settingsGroup")
+        history_layout = QFormLayout(self.history_group)
+        
+        self.retention_spin = QSpinBox()
+        self.retention_spin.setObjectName("settingsSpin")
+        self.retention_spin.setRange(0, 3650)
+        self.retention_spin.setSuffix(" days")
+        self.retention_spin.setSpecialValueText("Forever")
+        self.retention_spin.setToolTip("Older transactions are rolled up into daily totals per currency pair")
+        history_layout.addRow("Keep detailed history:", self.retention_spin)
+        
+        layout.addWidget(self.history_group)
+        
+        # Alerts Group
+        layout.addWidget(self._create_alerts_group())
+        
+        # Diagnostics Group
+        self.diagnostics_group = QGroupBox("Diagnostics")
+        self.diagnostics_group.setObjectName("settingsGroup")
+        diagnostics_layout = QHBoxLayout(self.diagnostics_group)
+        
+        memory_btn = QPushButton("Memory Report")
+        memory_btn.setObjectName("actionButton")
+        memory_btn.clicked.connect(self._show_memory_report)
+        diagnostics_layout.addWidget(memory_btn)
+        diagnostics_layout.addStretch()
+        
+        layout.addWidget(self.diagnostics_group)
+        
         # Save Button
         self.save_btn = QPushButton("Save Settings")
         self.save_btn.setObjectName("primaryButton")
@@ -52,28 +98,136 @@ class SettingsView(QWidget):
         
         # Status Label
         self.status_label = QLabel("")
+        self.status_label.setObjectName("statusLabel")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.status_label)
         
         layout.addStretch()
         
+    def _create_alerts_group(self) -> QGroupBox:
+        """Create the rate alerts editor"""
+        self.alerts_group = QGroupBox("Rate Alerts")
+        self.alerts_group.setObjectName("settingsGroup")
+        alerts_layout = QVBoxLayout(self.alerts_group)
+        
+        self.alerts_list = QListWidget()
+        self.alerts_list.setObjectName("alertsList")
+        self.alerts_list.setMaximumHeight(120)
+        alerts_layout.addWidget(self.alerts_list)
+        
+        form_layout = QHBoxLayout()
+        self.alert_from = QComboBox()
+        self.alert_from.setObjectName("settingsCombo")
+        form_layout.addWidget(self.alert_from)
+        
+        self.alert_to = QComboBox()
+        self.alert_to.setObjectName("settingsCombo")
+        form_layout.addWidget(self.alert_to)
+        
+        self.alert_kind = QComboBox()
+        self.alert_kind.setObjectName("settingsCombo")
+        self.alert_kind.addItem("rises above", "above")
+        self.alert_kind.addItem("falls below", "below")
+        self.alert_kind.addItem("moves % in a day", "move")
+        form_layout.addWidget(self.alert_kind)
+        
+        self.alert_threshold = QDoubleSpinBox()
+        self.alert_threshold.setObjectName("settingsSpin")
+        self.alert_threshold.setRange(0, 1e12)
+        self.alert_threshold.setDecimals(6)
+        form_layout.addWidget(self.alert_threshold)
+        
+        add_btn = QPushButton("Add")
+        add_btn.setObjectName("actionButton")
+        add_btn.clicked.connect(self._add_alert)
+        form_layout.addWidget(add_btn)
+        
+        remove_btn = QPushButton("Remove")
+        remove_btn.setObjectName("actionButton")
+        remove_btn.clicked.connect(self._remove_alert)
+        form_layout.addWidget(remove_btn)
+        
+        alerts_layout.addLayout(form_layout)
+        return self.alerts_group
+    
+    def _refresh_alerts(self):
+        """Reload the alerts list"""
+        self.alerts_list.clear()
+        for alert in self._controller.get_alerts():
+            item = QListWidgetItem(alert.describe())
+            item.setData(Qt.ItemDataRole.UserRole, alert.alert_id)
+            self.alerts_list.addItem(item)
+    
+    def _add_alert(self):
+        """Register a new alert from the form"""
+        success, message = self._controller.add_alert(
+            self.alert_from.currentData(), self.alert_to.currentData(),
+            self.alert_kind.currentData(), self.alert_threshold.value())
+        self._show_status(success, message)
+        if success:
+            self._refresh_alerts()
+    
+    def _remove_alert(self):
+        """Delete the selected alert"""
+        item = self.alerts_list.currentItem()
+        if item and self._controller.remove_alert(item.data(Qt.ItemDataRole.UserRole)):
+            self._refresh_alerts()
+    
+    def _show_memory_report(self):
+        """Show the memory breakdown by subsystem"""
+        report = self._controller.get_memory_report()
+        box = QMessageBox(self)
+        box.setWindowTitle("Memory Report")
+        box.setText(f"<pre>{html.escape(report)}</pre>")
+        box.exec()
+    
+    def _show_status(self, success: bool, message: str):
+        if success:
+            self.status_label.setText(f"✓ {message}")
+            set_status(self.status_label, "success")
+        else:
+            self.status_label.setText(f"✗ {message}")
+            set_status(self.status_label, "error")
+    
     def _load_settings(self):
         """Load current settings into UI"""
-        # Populate currency combos
-        currencies = self._controller.get_available_currencies()
-        self.default_from.clear()
-        self.default_to.clear()
-        
-        for code, name in currencies:
-            display = f"{code} - {name}"
-            self.default_from.addItem(display, code)
-            self.default_to.addItem(display, code)
+        self.reload_currencies()
             
         # Set current defaults
         from_code, to_code = self._controller.get_default_currencies()
         self._set_combo_value(self.default_from, from_code)
         self._set_combo_value(self.default_to, to_code)
         
+        self.exact_mode_check.setChecked(self._controller.is_exact_mode())
+        self.retention_spin.setValue(self._controller.get_retention_days())
+        
+        self._set_combo_value(self.alert_from, from_code)
+        self._set_combo_value(self.alert_to, to_code)
+        self._refresh_alerts()
+        
+    def reload_currencies(self):
+        """Rebuild the currency combos unless the currency list is the version already shown"""
+        version = self._controller.get_currency_version()
+        if version is not None and version == self._currency_version:
+            return
+        self._currency_version = version
+        
+        combos = (self.default_from, self.default_to, self.alert_from, self.alert_to)
+        selected = [combo.currentData() for combo in combos]
+        for combo in combos:
+            combo.clear()
+        
+        for code, name in self._controller.get_available_currencies():
+            display = f"{code} - {name}"
+            self.default_from.addItem(display, code)
+            self.default_to.addItem(display, code)
+            self.alert_from.addItem(code, code)
+            self.alert_to.addItem(code, code)
+        
+        for combo, value in zip(combos, selected):
+            if value:
+                self._set_combo_value(combo, value)
+    
     def _set_combo_value(self, combo: QComboBox, value: str):
         """Set combo box selection by data value"""
         for i in range(combo.count()):
@@ -88,55 +242,12 @@ class SettingsView(QWidget):
         
         if from_code and to_code:
             self._controller.set_default_currencies(from_code, to_code)
-            self.status_label.setText("✓ Settings saved successfully")
-            self.status_label.setStyleSheet("color: #4CAF50; font-weight: bold;")
+            self._controller.set_exact_mode(self.exact_mode_check.isChecked())
+            self._controller.set_retention_days(self.retention_spin.value())
+            self._show_status(True, "Settings saved successfully")
         else:
-            self.status_label.setText("✗ Error saving settings")
-            self.status_label.setStyleSheet("color: #F44336; font-weight: bold;")
+            self._show_status(False, "Error saving settings")
             
     def update_theme(self, theme: ThemeColors):
-        """Update view styles based on theme"""
+        """Remember the theme; styling comes from the application stylesheet"""
         self._current_theme = theme
-        
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {theme.background};
-                color: {theme.text_primary};
-            }}
-            QLabel#viewTitle {{
-                font-size: 24px;
-                font-weight: bold;
-                color: {theme.text_primary};
-            }}
-            QGroupBox#settingsGroup {{
-                border: 1px solid {theme.border};
-                border-radius: 8px;
-                margin-top: 1em;
-                padding-top: 10px;
-                font-weight: bold;
-                color: {theme.text_primary};
-            }}
-            QGroupBox#settingsGroup::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px 0 3px;
-            }}
-            QComboBox#settingsCombo {{
-                padding: 8px;
-                border: 1px solid {theme.input_border};
-                border-radius: 4px;
-                background-color: {theme.input_bg};
-                color: {theme.text_primary};
-            }}
-            QPushButton#primaryButton {{
-                background-color: {theme.primary};
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-weight: bold;
-                font-size: 16px;
-            }}
-            QPushButton#primaryButton:hover {{
-                background-color: {theme.selected_text};
-            }}
-        """)
@@ -14,29 +14,7 @@ class SidebarButton(QPushButton):
         self.setAutoExclusive(True)
         self.setMinimumHeight(50)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
-        # Initial style will be set by update_theme
-
-    def update_theme(self, theme: ThemeColors):
-        """Update button styles based on theme"""
-        self.setStyleSheet(f"""
-            QPushButton {{
-                text-align: left;
-                padding-left: 20px;
-                border: none;
-                border-radius: 5px;
-                font-size: 14px;
-                color: {theme.text_secondary};
-            }}
-            QPushButton:hover {{
-                background-color: {theme.hover};
-                color: {theme.text_primary};
-            }}
-            QPushButton:checked {{
-                background-color: {theme.selected_bg};
-                color: {theme.selected_text};
-                font-weight: bold;
-            }}
-        """)
+        self.setObjectName("sidebarButton")
 
 class Sidebar(QFrame):
     """Sidebar navigation panel"""
@@ -48,6 +26,7 @@ class Sidebar(QFrame):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.setObjectName("sidebar")
         self.setFrameShape(QFrame.Shape.NoFrame)
         self.setFixedWidth(250)
         
@@ -60,7 +39,7 @@ class Sidebar(QFrame):
         
         # App Logo/Title Area
         self.title_label = QLabel("Currency\nConverter")
-        # Style will be set in update_theme
+        self.title_label.setObjectName("sidebarTitle")
         layout.addWidget(self.title_label)
         
         layout.addSpacing(20)
@@ -68,15 +47,24 @@ class Sidebar(QFrame):
         # Navigation Buttons
         self.btn_converter = SidebarButton("Converter", "💱")
         self.btn_history = SidebarButton("History", "🕒")
+        self.btn_statistics = SidebarButton("Statistics", "📊")
+        self.btn_chart = SidebarButton("Charts", "📈")
+        self.btn_matrix = SidebarButton("Cross Rates", "🔢")
         self.btn_settings = SidebarButton("Settings", "⚙️")
         
         # Connect buttons
         self.btn_converter.clicked.connect(lambda: self.page_changed.emit(0))
         self.btn_history.clicked.connect(lambda: self.page_changed.emit(1))
         self.btn_settings.clicked.connect(lambda: self.page_changed.emit(2))
+        self.btn_statistics.clicked.connect(lambda: self.page_changed.emit(3))
+        self.btn_chart.clicked.connect(lambda: self.page_changed.emit(4))
+        self.btn_matrix.clicked.connect(lambda: self.page_changed.emit(5))
         
         layout.addWidget(self.btn_converter)
         layout.addWidget(self.btn_history)
+        layout.addWidget(self.btn_statistics)
+        layout.addWidget(self.btn_chart)
+        layout.addWidget(self.btn_matrix)
         layout.addWidget(self.btn_settings)
         
         layout.addStretch()
@@ -86,11 +74,12 @@ class Sidebar(QFrame):
         self.theme_btn.setCheckable(True)
         self.theme_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.theme_btn.clicked.connect(self.theme_toggled.emit)
-        self.theme_btn.setStyleSheet("border: none; text-align: left; padding: 10px;")
+        self.theme_btn.setObjectName("themeToggle")
         layout.addWidget(self.theme_btn)
         
         # Version info
         self.version_label = QLabel("v1.0.0")
+        self.version_label.setObjectName("sidebarVersion")
         self.version_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.version_label)
         
@@ -98,20 +87,8 @@ class Sidebar(QFrame):
         self.btn_converter.setChecked(True)
 
     def update_theme(self, theme: ThemeColors):
-        """Update sidebar styles based on theme"""
-        self.setStyleSheet(f"background-color: {theme.surface}; border-right: 1px solid {theme.border};")
-        
-        self.title_label.setStyleSheet(f"font-size: 20px; font-weight: bold; color: {theme.text_primary}; padding: 10px;")
-        
-        self.btn_converter.update_theme(theme)
-        self.btn_history.update_theme(theme)
-        self.btn_settings.update_theme(theme)
-        
-        # Update theme button
-        self.theme_btn.setStyleSheet(f"color: {theme.text_secondary}; border: none; text-align: left; padding: 10px;")
+        """Update the theme toggle label; styling comes from the application stylesheet"""
         if self.theme_btn.isChecked():
             self.theme_btn.setText("☀️ Light Mode")
         else:
             self.theme_btn.setText("🌙 Dark Mode")
-
-        self.version_label.setStyleSheet(f"color: {theme.text_secondary}; font-size: 12px;")
@@ -0,0 +1,110 @@
+"""
+Statistics view for conversion usage per currency pair
+"""
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget,
+                              QTableWidgetItem, QHeaderView, QComboBox, QFrame)
+from PyQt6.QtCore import Qt
+from controllers import CurrencyController
+from .theme import ThemeColors
+
+class StatisticsView(QWidget):
+    """View showing which pairs and currencies are converted most"""
+
+    TOP_ROWS = 20
+    WINDOWS = [("All time", None), ("Last 24 hours", "24h"),
+               ("Last 7 days", "7d"), ("Last 30 days", "30d")]
+
+    def __init__(self, controller: CurrencyController):
+        super().__init__()
+        self._controller = controller
+        self._current_theme = None
+        self.setObjectName("statisticsView")
+        self._setup_ui()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(30, 30, 30, 30)
+        layout.setSpacing(20)
+
+        # Header
+        header_layout = QHBoxLayout()
+        title = QLabel("Statistics")
+        title.setObjectName("viewTitle")
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+
+        self.window_combo = QComboBox()
+        self.window_combo.setObjectName("settingsCombo")
+        for label, window in self.WINDOWS:
+            self.window_combo.addItem(label, window)
+        self.window_combo.currentIndexChanged.connect(self.refresh_data)
+        header_layout.addWidget(self.window_combo)
+        layout.addLayout(header_layout)
+
+        # Summary cards
+        cards_layout = QHBoxLayout()
+        cards_layout.setSpacing(15)
+        self._count_labels = {}
+        for key, label in [("all", "All time"), ("24h", "24 hours"), ("7d", "7 days"), ("30d", "30 days")]:
+            card = QFrame()
+            card.setObjectName("statCard")
+            card_layout = QVBoxLayout(card)
+            value_label = QLabel("0")
+            value_label.setObjectName("statValue")
+            value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            caption = QLabel(label)
+            caption.setObjectName("statCaption")
+            caption.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            card_layout.addWidget(value_label)
+            card_layout.addWidget(caption)
+            cards_layout.addWidget(card)
+            self._count_labels[key] = value_label
+        layout.addLayout(cards_layout)
+
+        # Tables
+        tables_layout = QHBoxLayout()
+        tables_layout.setSpacing(15)
+        self.pairs_table = self._create_table(["Pair", "Conversions", "Amount", "Result"])
+        tables_layout.addWidget(self.pairs_table, 3)
+        self.currencies_table = self._create_table(["Currency", "Conversions", "Volume"])
+        tables_layout.addWidget(self.currencies_table, 2)
+        layout.addLayout(tables_layout)
+
+    def _create_table(self, headers) -> QTableWidget:
+        table = QTableWidget()
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        table.verticalHeader().setVisible(False)
+        return table
+
+    def refresh_data(self):
+        """Reload statistics from the controller (no history scan)"""
+        counts = self._controller.get_conversion_counts()
+        for key, label in self._count_labels.items():
+            label.setText(f"{counts.get(key, 0):,}")
+
+        pairs = self._controller.get_pair_statistics(self.window_combo.currentData())[:self.TOP_ROWS]
+        self._fill_table(self.pairs_table, [
+            (pair.replace("/", " → "), f"{count:,}", f"{amount:,.2f}", f"{result:,.2f}")
+            for pair, count, amount, result in pairs
+        ])
+
+        currencies = self._controller.get_currency_statistics()[:self.TOP_ROWS]
+        self._fill_table(self.currencies_table, [
+            (code, f"{count:,}", f"{volume:,.2f}") for code, count, volume in currencies
+        ])
+
+    def _fill_table(self, table: QTableWidget, rows):
+        table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            for column, value in enumerate(row):
+                item = QTableWidgetItem(value)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                table.setItem(i, column, item)
+
+    def update_theme(self, theme: ThemeColors):
+        """Remember the theme; styling comes from the application stylesheet"""
+        self._current_theme = theme
@@ -0,0 +1,150 @@
+"""
+One-to-many conversion panel for the converter page
+"""
+from typing import List
+from PyQt6.QtWidgets import (QFrame, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel,
+                             QComboBox, QPushButton, QScrollArea, QSizePolicy)
+from PyQt6.QtCore import Qt
+from controllers import CurrencyController
+from models.money import format_amount
+from .workers import RateChangeRelay
+
+class TargetPanel(QFrame):
+    """
+    Shows one amount converted into a list of currencies, live.
+
+    A row of labels is created per target only when the target list
+    changes. An update is one convert_to_many call, and then setText only
+    on the labels whose text changed, so a keystroke costs a few
+    microseconds of arithmetic and repaints only the figures that moved,
+    well within one frame.
+    """
+
+    VALUE_WIDTH = 170
+
+    def __init__(self, controller: CurrencyController, parent=None):
+        super().__init__(parent)
+        self._controller = controller
+        self._targets: List[str] = controller.get_target_currencies()
+        self._value_labels: List[QLabel] = []
+        self._texts: List[str] = []
+        self._from_code = ""
+        self._amount = None
+        self.setFrameShape(QFrame.Shape.Box)
+        self.setObjectName("materialCard")
+        self._setup_ui()
+        self._rebuild_rows()
+
+        self._rate_relay = RateChangeRelay(controller, self)
+        self._rate_relay.rates_changed.connect(self.refresh)
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        header_layout = QHBoxLayout()
+        title = QLabel("Convert to Many")
+        title.setObjectName("cardTitle")
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+
+        self.add_combo = QComboBox()
+        self.add_combo.setObjectName("settingsCombo")
+        self.add_combo.setPlaceholderText("Add currency...")
+        self.add_combo.activated.connect(self._add_target)
+        header_layout.addWidget(self.add_combo)
+        layout.addLayout(header_layout)
+
+        self._rows_widget = QWidget()
+        self._rows_layout = QGridLayout(self._rows_widget)
+        self._rows_layout.setContentsMargins(0, 0, 0, 0)
+        self._rows_layout.setHorizontalSpacing(15)
+        self._rows_layout.setColumnStretch(1, 1)
+
+        scroll = QScrollArea()
+        scroll.setWidget(self._rows_widget)
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.Shape.NoFrame)
+        scroll.setMinimumHeight(160)
+        layout.addWidget(scroll)
+
+    def reload_currencies(self):
+        """Refill the list of currencies that can be added"""
+        self.add_combo.blockSignals(True)
+        self.add_combo.clear()
+        for code, name in self._controller.get_available_currencies():
+            self.add_combo.addItem(f"{code} - {name}", code)
+        self.add_combo.setCurrentIndex(-1)
+        self.add_combo.blockSignals(False)
+
+    def set_source(self, from_code: str, amount_text: str):
+        """Convert `amount_text` of `from_code` into every target"""
+        try:
+            amount = float(amount_text)
+        except ValueError:
+            amount = None
+        self._from_code = from_code
+        self._amount = amount
+        self.refresh()
+
+    def refresh(self):
+        """Recompute every target, e.g. after the rates changed"""
+        results = None
+        if self._from_code and self._amount is not None:
+            success, results, _ = self._controller.convert_to_many(self._from_code, self._targets, self._amount)
+            if not success:
+                results = None
+
+        for i, code in enumerate(self._targets):
+            value = results[i] if results is not None else float('nan')
+            text = format_amount(value, code) if value == value else "—"
+            # Untouched labels are neither re-laid out nor repainted
+            if text != self._texts[i]:
+                self._texts[i] = text
+                self._value_labels[i].setText(text)
+
+    def _rebuild_rows(self):
+        """Create one row per target; only called when the target list changes"""
+        while self._rows_layout.count():
+            item = self._rows_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        self._value_labels = []
+        self._texts = []
+
+        for row, code in enumerate(self._targets):
+            code_label = QLabel(code)
+            code_label.setObjectName("fieldLabel")
+            code_label.setToolTip(self._controller.get_currency_name(code))
+            value_label = QLabel("—")
+            value_label.setObjectName("resultInfo")
+            value_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            # A fixed width keeps text changes from triggering a relayout
+            value_label.setFixedWidth(self.VALUE_WIDTH)
+            value_label.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Preferred)
+            remove_btn = QPushButton("✕")
+            remove_btn.setObjectName("secondaryButton")
+            remove_btn.setFixedSize(28, 28)
+            remove_btn.setToolTip(f"Remove {code}")
+            remove_btn.clicked.connect(lambda checked=False, c=code: self._remove_target(c))
+
+            self._rows_layout.addWidget(code_label, row, 0)
+            self._rows_layout.addWidget(value_label, row, 2)
+            self._rows_layout.addWidget(remove_btn, row, 3)
+            self._value_labels.append(value_label)
+            self._texts.append("—")
+        self.refresh()
+
+    def _add_target(self, index: int):
+        code = self.add_combo.itemData(index)
+        self.add_combo.setCurrentIndex(-1)
+        if code and code not in self._targets:
+            self._targets.append(code)
+            self._controller.set_target_currencies(self._targets)
+            self._rebuild_rows()
+
+    def _remove_target(self, code: str):
+        if code in self._targets:
+            self._targets.remove(code)
+            self._controller.set_target_currencies(self._targets)
+            self._rebuild_rows()
@@ -2,9 +2,13 @@
 Theme management for the application
 """
 from dataclasses import dataclass
+from functools import lru_cache
+from PyQt6.QtWidgets import QWidget
 from PyQt6.QtGui import QColor
 
-@dataclass
+STATUS_TYPES = ("info", "success", "error", "warning")
+
+@dataclass(frozen=True)
 class ThemeColors:
     background: str
     surface: str
@@ -63,3 +67,254 @@ DARK_THEME = ThemeColors(
     warning="#fdd663",
     info="#8ab4f8"
 )
+
+
+@lru_cache(maxsize=None)
+def build_stylesheet(theme: ThemeColors) -> str:
+    """
+    Application-wide stylesheet for a theme.
+    Built once per theme and applied with QApplication.setStyleSheet, so a
+    theme switch is a single style recalculation instead of one per view.
+    Rules that differ between pages are scoped by the page's object name.
+    """
+    status_rules = "".join(f"""
+        QLabel#statusLabel[status="{status}"] {{
+            color: {getattr(theme, status)};
+        }}""" for status in STATUS_TYPES)
+
+    return f"""
+        QWidget {{
+            background-color: {theme.background};
+            color: {theme.text_primary};
+        }}
+        QLabel#placeholderLabel {{
+            font-size: 18px;
+            color: {theme.text_secondary};
+        }}
+
+        /* Sidebar */
+        QFrame#sidebar, QFrame#sidebar QWidget {{
+            background-color: {theme.surface};
+        }}
+        QFrame#sidebar {{
+            border-right: 1px solid {theme.border};
+        }}
+        QLabel#sidebarTitle {{
+            font-size: 20px;
+            font-weight: bold;
+            color: {theme.text_primary};
+            padding: 10px;
+        }}
+        QLabel#sidebarVersion {{
+            color: {theme.text_secondary};
+            font-size: 12px;
+        }}
+        QPushButton#themeToggle {{
+            color: {theme.text_secondary};
+            border: none;
+            text-align: left;
+            padding: 10px;
+        }}
+        QPushButton#sidebarButton {{
+            text-align: left;
+            padding-left: 20px;
+            border: none;
+            border-radius: 5px;
+            font-size: 14px;
+            color: {theme.text_secondary};
+        }}
+        QPushButton#sidebarButton:hover {{
+            background-color: {theme.hover};
+            color: {theme.text_primary};
+        }}
+        QPushButton#sidebarButton:checked {{
+            background-color: {theme.selected_bg};
+            color: {theme.selected_text};
+            font-weight: bold;
+        }}
+
+        /* Shared */
+        QLabel#viewTitle {{
+            font-size: 24px;
+            font-weight: bold;
+            color: {theme.text_primary};
+        }}
+        QLabel#statusLabel {{
+            color: {theme.text_secondary};
+            font-weight: bold;
+        }}{status_rules}
+        QPushButton#primaryButton {{
+            background-color: {theme.primary};
+            color: white;
+            border: none;
+            border-radius: 4px;
+            font-weight: bold;
+            font-size: 16px;
+        }}
+        QPushButton#primaryButton:hover {{
+            background-color: {theme.selected_text};
+        }}
+        QPushButton#actionButton {{
+            background-color: {theme.surface};
+            color: {theme.text_primary};
+            border: 1px solid {theme.border};
+            padding: 8px 16px;
+            border-radius: 4px;
+        }}
+        QPushButton#actionButton:hover {{
+            background-color: {theme.hover};
+        }}
+        QPushButton#dangerButton {{
+            background-color: {theme.surface};
+            color: {theme.error};
+            border: 1px solid {theme.error};
+            padding: 8px 16px;
+            border-radius: 4px;
+        }}
+        QPushButton#dangerButton:hover {{
+            background-color: {theme.error};
+            color: white;
+        }}
+        QComboBox#settingsCombo, QSpinBox#settingsSpin, QDoubleSpinBox#settingsSpin, QLineEdit#findInput {{
+            padding: 8px;
+            border: 1px solid {theme.input_border};
+            border-radius: 4px;
+            background-color: {theme.input_bg};
+            color: {theme.text_primary};
+        }}
+        QTableView {{
+            background-color: {theme.surface};
+            gridline-color: {theme.border};
+            border: 1px solid {theme.border};
+            border-radius: 8px;
+        }}
+        QHeaderView::section {{
+            background-color: {theme.background};
+            color: {theme.text_secondary};
+            padding: 8px;
+            border: none;
+            font-weight: bold;
+        }}
+        QTableView::item:selected {{
+            background-color: {theme.selected_bg};
+            color: {theme.selected_text};
+        }}
+
+        /* Converter */
+        QLabel#appTitle {{
+            font-size: 24px;
+            font-weight: bold;
+            color: {theme.primary};
+        }}
+        QLabel#appSubtitle {{
+            font-size: 14px;
+            color: {theme.text_secondary};
+        }}
+        QFrame#materialCard {{
+            background-color: {theme.surface};
+            border: 1px solid {theme.border};
+            border-radius: 8px;
+        }}
+        QLabel#fieldLabel {{
+            font-weight: bold;
+            color: {theme.text_secondary};
+        }}
+        #converterView QLineEdit, #converterView QComboBox {{
+            padding: 10px;
+            border: 1px solid {theme.input_border};
+            border-radius: 4px;
+            background-color: {theme.input_bg};
+            color: {theme.text_primary};
+            font-size: 16px;
+        }}
+        QPushButton#swapButton {{
+            background-color: {theme.surface};
+            border: 1px solid {theme.border};
+            border-radius: 28px;
+            font-size: 24px;
+            color: {theme.primary};
+        }}
+        QPushButton#swapButton:hover {{
+            background-color: {theme.hover};
+        }}
+        QPushButton#secondaryButton {{
+            background-color: {theme.secondary_btn_bg};
+            color: {theme.secondary_btn_text};
+            border: none;
+            border-radius: 4px;
+            font-weight: bold;
+        }}
+        QPushButton#secondaryButton:hover {{
+            background-color: {theme.hover};
+        }}
+        QLabel#cardTitle {{
+            font-size: 18px;
+            font-weight: bold;
+            color: {theme.text_primary};
+        }}
+        QLabel#fromAmount, QLabel#toAmount {{
+            font-size: 24px;
+            font-weight: bold;
+            color: {theme.text_primary};
+        }}
+        QLabel#arrowSeparator {{
+            font-size: 24px;
+            color: {theme.text_secondary};
+        }}
+        QLabel#resultInfo, QLabel#rateInfo {{
+            color: {theme.text_secondary};
+        }}
+
+        /* History */
+        #historyView QTableWidget::item {{
+            padding: 5px;
+            border-bottom: 1px solid {theme.border};
+        }}
+
+        /* Settings */
+        QGroupBox#settingsGroup {{
+            border: 1px solid {theme.border};
+            border-radius: 8px;
+            margin-top: 1em;
+            padding-top: 10px;
+            font-weight: bold;
+            color: {theme.text_primary};
+        }}
+        QGroupBox#settingsGroup::title {{
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 3px 0 3px;
+        }}
+        QListWidget#alertsList {{
+            background-color: {theme.surface};
+            border: 1px solid {theme.border};
+            border-radius: 4px;
+        }}
+
+        /* Statistics */
+        QFrame#statCard {{
+            background-color: {theme.surface};
+            border: 1px solid {theme.border};
+            border-radius: 8px;
+        }}
+        QLabel#statValue {{
+            background-color: {theme.surface};
+            font-size: 24px;
+            font-weight: bold;
+            color: {theme.primary};
+        }}
+        QLabel#statCaption {{
+            background-color: {theme.surface};
+            color: {theme.text_secondary};
+        }}
+    """
+
+
+def set_status(label: QWidget, status: str):
+    """Switch a status label's color through its dynamic `status` property"""
+    if label.property("status") == status:
+        return
+    label.setProperty("status", status)
+    # Dynamic properties are only re-evaluated on polish
+    label.style().unpolish(label)
+    label.style().polish(label)
@@ -0,0 +1,50 @@
+"""
+Background workers for long-running controller calls, and thread bridges
+"""
+from typing import Callable
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+
+class TaskWorker(QThread):
+    """
+    Runs a controller call on a worker thread.
+
+    The task is called with `progress_callback` and `is_cancelled` keyword
+    arguments and must return a (success, message) tuple.
+    """
+
+    progress = pyqtSignal(int, int)
+    task_finished = pyqtSignal(bool, str)
+
+    def __init__(self, task: Callable, parent=None):
+        super().__init__(parent)
+        self._task = task
+        self._cancelled = False
+
+    def cancel(self):
+        """Ask the task to stop at the next chunk boundary"""
+        self._cancelled = True
+
+    def run(self):
+        try:
+            success, message = self._task(progress_callback=self.progress.emit,
+                                          is_cancelled=lambda: self._cancelled)
+        except Exception as e:
+            success, message = False, str(e)
+        self.task_finished.emit(success, message)
+
+
+class RateChangeRelay(QObject):
+    """
+    Re-emits the controller's rate change notifications as a Qt signal.
+
+    Refreshes can run on any thread (a worker, the publisher loop, the
+    alert timer); connecting to rates_changed from a widget makes the slot
+    run queued on the GUI thread instead.
+    """
+
+    rates_changed = pyqtSignal()
+
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        controller.subscribe_rate_changes(lambda changes: self.rates_changed.emit())